@@ -0,0 +1,178 @@
+"""
+Dossier scan benchmark
+
+Builds a synthetic tree of dossiers (nested folders, empty files, ignored files such as Thumbs.db,
+duplicate names, empty folders and a symlinked folder) and measures the wall time of scanning all
+of them:
+- previous: os.walk with isfile/getsize/getctime/stat/getmtime per file, a dossier at a time
+  (the implementation before file_scanner)
+- current: scan_dossiers, one stat per entry, several dossiers at a time
+
+The scans are compared with the previous one, so a faster but different result shows up.
+The gain is largest on network shares, pass --path to scan the subfolders of an existing folder
+(e.g. a share) as dossiers instead of generating a tree.
+
+Run it from the project folder, like profile_startup.py:
+`python -m benchmarks.dossier_scan --dossiers 20 --files 50000 --runs 5 --json dossier_scan.json`
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import suppress
+
+IGNORED_NAMES = ("Thumbs.db", "~$brief.docx", "kladblok.tmp", ".DS_Store")
+
+
+def build_tree(folder: str, dossiers: int, files: int) -> list[str]:
+    """Spread files over dossiers of 3 x 3 nested folders, returns the dossier paths."""
+    dossier_paths = [os.path.join(folder, f"dossier_{d}") for d in range(dossiers)]
+    files_per_folder = max(files // (dossiers * 12), 1)
+
+    for d, dossier_path in enumerate(dossier_paths):
+        folders = [dossier_path]
+
+        for i in range(3):
+            folders.append(os.path.join(dossier_path, f"map_{i}"))
+            folders.extend(os.path.join(dossier_path, f"map_{i}", f"submap_{j}") for j in range(3))
+
+        for f, folder_path in enumerate(folders):
+            os.makedirs(folder_path, exist_ok=True)
+
+            for i in range(files_per_folder):
+                # NOTE: every folder has a "bijlage_0.pdf", names are not unique within a dossier
+                name = f"bijlage_{i}.pdf" if i % 10 == 0 else f"stuk_{f}_{i}.pdf"
+
+                with open(os.path.join(folder_path, name), "wb") as fp:
+                    fp.write(b"" if i % 25 == 0 else b"%PDF-1.4\n" * (i % 7 + 1))
+
+            with open(os.path.join(folder_path, IGNORED_NAMES[f % len(IGNORED_NAMES)]), "wb") as fp:
+                fp.write(b"ignored")
+
+        os.makedirs(os.path.join(dossier_path, "lege map"), exist_ok=True)
+
+        if d == 0:
+            # NOTE: symlinked folders are not followed, not every Windows account may create one
+            with suppress(OSError, NotImplementedError):
+                os.symlink(os.path.join(dossier_path, "map_0"), os.path.join(dossier_path, "snelkoppeling"))
+
+    return dossier_paths
+
+
+def scan_previous(dossier_path: str) -> dict[str, tuple]:
+    from src.utils.constants import FILE_REGEXES_TO_IGNORE, RowType
+
+    structure = {}
+
+    for dirpath, dirnames, filenames in os.walk(dossier_path):
+        if not filenames and not dirnames:
+            rel_path = os.path.relpath(dirpath, dossier_path).replace("\\", "/")
+
+            if rel_path in (".", ".."):
+                continue
+
+            structure[os.path.basename(dirpath)] = rel_path
+
+        for filename in filenames:
+            file_path = os.path.join(dirpath, filename)
+            structure[filename] = os.path.relpath(file_path, dossier_path).replace("\\", "/")
+
+    result = {}
+
+    for file_name, relative_location in structure.items():
+        real_path = os.path.join(dossier_path, relative_location)
+
+        row_type = (
+            RowType.GEEN
+            if not os.path.isfile(real_path)
+            or os.path.getsize(real_path) == 0
+            or any(re.match(p, file_name) is not None for p in FILE_REGEXES_TO_IGNORE)
+            else RowType.STUK
+        )
+        # NOTE: this used st_birthtime outside Windows, which Linux does not have, file_scanner falls back to st_ctime
+        created = os.path.getctime(real_path) if os.name == "nt" else os.stat(real_path).st_ctime
+        modified = os.path.getmtime(real_path)
+
+        result[file_name] = (relative_location, row_type, created, modified)
+
+    return result
+
+
+def _by_name(entries) -> dict[str, tuple]:
+    # NOTE: keyed on the name like the digital SIP does, a later file with the same name replaces an earlier one
+    return {e.name: (e.relative_path, e.row_type, e.created, e.modified) for e in entries}
+
+
+def main() -> None:
+    from src.utils.file_scanner import scan_dossiers
+
+    parser = argparse.ArgumentParser(description="Benchmark scanning dossiers")
+    parser.add_argument("--dossiers", type=int, default=20, help="number of generated dossiers")
+    parser.add_argument("--files", type=int, default=50_000, help="total number of generated files")
+    parser.add_argument("--path", help="scan the subfolders of this folder instead of a generated tree")
+    parser.add_argument("--runs", type=int, default=5, help="number of measured runs per variant")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this JSON file")
+
+    args = parser.parse_args()
+
+    folder = None
+
+    if args.path:
+        dossier_paths = sorted(entry.path for entry in os.scandir(args.path) if entry.is_dir())
+    else:
+        folder = tempfile.mkdtemp(prefix="dossier_scan_benchmark_")
+        dossier_paths = build_tree(folder, args.dossiers, args.files)
+
+    try:
+        variants = {
+            "previous": lambda: [scan_previous(path) for path in dossier_paths],
+            "current": lambda: [_by_name(entries) for entries in scan_dossiers(dossier_paths)],
+        }
+
+        wall_s: dict[str, list[float]] = {name: [] for name in variants}
+        results = {}
+
+        # NOTE: the first round warms the disk cache, it is not counted. The variants take turns
+        for i in range(args.runs + 1):
+            for name, scan in variants.items():
+                start = time.perf_counter()
+                results[name] = scan()
+
+                if i > 0:
+                    wall_s[name].append(time.perf_counter() - start)
+    finally:
+        if folder is not None:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    file_count = sum(len(result) for result in results["previous"])
+    print(f"Dossiers: {len(dossier_paths)}, entries (by name): {file_count}, runs: {args.runs}")
+
+    for name, times in wall_s.items():
+        same = "" if results[name] == results["previous"] else "  (result differs from previous!)"
+        print(f"  {name:12}{statistics.median(times):8.3f} s{same}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "dossiers": len(dossier_paths),
+                    "entries": file_count,
+                    "runs": args.runs,
+                    "wall_s": wall_s,
+                    "median_wall_s": {name: statistics.median(times) for name, times in wall_s.items()},
+                },
+                f,
+                indent=2,
+            )
+
+    sys.exit(0 if all(result == results["previous"] for result in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
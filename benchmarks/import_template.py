@@ -0,0 +1,164 @@
+"""
+Import template benchmark
+
+Fills a synthetic import template with a grid of BusinessRules.MAX_ROWS_PER_SERIES rows (the most a
+series can hold) and measures the wall time of:
+- previous: openpyxl, a cell at a time with df.iat lookups (the implementation before streaming)
+- openpyxl: the current openpyxl fallback, for templates whose sheet XML is not recognised
+- current: fill_import_template, which streams the Details sheet into a copy of the template
+
+The Details sheets of the outputs are read back and compared, so a faster but wrong fill shows up.
+Run it from the project folder, like profile_startup.py:
+`python -m benchmarks.import_template --columns 45 --runs 1 --json import_template.json`
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+
+def build_template(template_path: str, columns: int) -> None:
+    from openpyxl import Workbook
+    from openpyxl.styles import Font
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Details"
+
+    for col in range(1, columns + 1):
+        cell = ws.cell(row=1, column=col, value=f"Kolom {col}")
+        cell.font = Font(bold=True)
+
+    lists = wb.create_sheet("Lijsten")
+
+    for row, value in enumerate(("dossier", "stuk"), start=1):
+        lists.cell(row=row, column=1, value=value)
+
+    wb.save(template_path)
+
+
+def build_grid(rows: int, columns: int):
+    import pandas as pd
+
+    return pd.DataFrame(
+        {f"Kolom {col}": [f"waarde {row}-{col}" for row in range(rows)] for col in range(1, columns + 1)}
+    )
+
+
+def fill_previous(df, template_path: str, output_path: str) -> None:
+    from openpyxl import load_workbook
+
+    from src.controller.sip_creation_controller import COLUMN_NAME_CLEANUP_REGEX
+
+    wb = load_workbook(template_path)
+
+    try:
+        ws = wb["Details"]
+
+        for col_index, col_name in enumerate(df.columns):
+            clean_name = col_name.strip()
+            match = COLUMN_NAME_CLEANUP_REGEX.match(clean_name)
+
+            if match:
+                clean_name = match.group(1)
+
+            ws.cell(row=1, column=col_index + 1, value=clean_name)
+
+        for row_index in range(len(df)):
+            for col_index in range(len(df.columns)):
+                ws.cell(row=row_index + 2, column=col_index + 1, value=str(df.iat[row_index, col_index]))
+
+        wb.save(output_path)
+    finally:
+        wb.close()
+
+
+def fill_openpyxl(df, template_path: str, output_path: str) -> None:
+    from src.controller.sip_creation_controller import _fill_details_sheet_openpyxl
+
+    _fill_details_sheet_openpyxl(template_path, [str(c) for c in df.columns], df, output_path)
+
+
+def fill_current(df, template_path: str, output_path: str) -> None:
+    from src.controller.sip_creation_controller import fill_import_template
+
+    fill_import_template(df, template_path, output_path)
+
+
+VARIANTS = {"previous": fill_previous, "openpyxl": fill_openpyxl, "current": fill_current}
+
+
+def read_details(output_path: str) -> list[tuple]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(output_path, read_only=True)
+
+    try:
+        return [tuple(row) for row in wb["Details"].iter_rows(values_only=True)]
+    finally:
+        wb.close()
+
+
+def main() -> None:
+    from src.utils.constants import BusinessRules
+
+    parser = argparse.ArgumentParser(description="Benchmark filling an import template")
+    parser.add_argument("--rows", type=int, default=BusinessRules.MAX_ROWS_PER_SERIES, help="number of grid rows")
+    parser.add_argument("--columns", type=int, default=45, help="number of grid columns")
+    parser.add_argument("--runs", type=int, default=1, help="number of measured runs per variant")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this JSON file")
+
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="import_template_benchmark_")
+
+    try:
+        template_path = os.path.join(folder, "template.xlsx")
+        build_template(template_path, args.columns)
+        df = build_grid(args.rows, args.columns)
+
+        wall_s: dict[str, list[float]] = {name: [] for name in VARIANTS}
+        details: dict[str, list[tuple]] = {}
+
+        for name, fill in VARIANTS.items():
+            for _ in range(args.runs):
+                output_path = os.path.join(folder, f"{name}.xlsx")
+
+                start = time.perf_counter()
+                fill(df, template_path, output_path)
+                wall_s[name].append(time.perf_counter() - start)
+
+            details[name] = read_details(output_path)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print(f"Grid: {args.rows} rows x {args.columns} columns, runs: {args.runs}")
+
+    for name, times in wall_s.items():
+        same = "" if details[name] == details["previous"] else "  (Details sheet differs from previous!)"
+        print(f"  {name:10}{statistics.median(times):8.2f} s{same}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "rows": args.rows,
+                    "columns": args.columns,
+                    "runs": args.runs,
+                    "wall_s": wall_s,
+                    "median_wall_s": {name: statistics.median(times) for name, times in wall_s.items()},
+                },
+                f,
+                indent=2,
+            )
+
+    sys.exit(0 if all(d == details["previous"] for d in details.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Grid markings benchmark
+
+Fills the markings of a synthetic grid (disabled columns marked grey, a few red cells per row) and
+times the operations the grid performs on them, with the previous {(row, col, source): (color,
+tooltip)} dict next to the current MarkingStore:
+- filling the markings
+- has_bad_rows (checked after every validation run)
+- the bad rows filter of the proxy model (a lookup per row)
+- clearing the validator markings of single rows (what a cell edit does)
+
+Both end up with the same markings, which is checked at the end.
+Run it from the project folder, like profile_startup.py:
+`python -m benchmarks.marking_store --rows 10000 --columns 40 --runs 5 --json marking_store.json`
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from functools import partial
+
+from src.utils.grid.table.common.marking_store import CellColor, MarkingSource, MarkingStore
+
+DISABLED_COLUMNS = 3
+RED_CELLS_PER_ROW = 2
+# The dict filter looks the bad rows up again for every row, only this many rows are timed
+DICT_FILTER_ROWS = 1_000
+
+
+def red_cells(rows: int, columns: int) -> list[tuple[int, int, MarkingSource]]:
+    rng = random.Random(0)
+
+    return [
+        (row, col, MarkingSource.CELL)
+        for row in range(rows)
+        for col in rng.sample(range(DISABLED_COLUMNS, columns), RED_CELLS_PER_ROW)
+    ]
+
+
+# The previous implementation, on a plain dict
+
+
+def dict_fill(rows: int, red: list) -> dict:
+    markings = {}
+
+    for col in range(DISABLED_COLUMNS):
+        markings.update({(row, col, MarkingSource.CELL): (CellColor.GREY, "") for row in range(rows)})
+
+    for key in red:
+        markings[key] = (CellColor.RED, "Verplicht")
+
+    return markings
+
+
+def dict_has_bad_rows(markings: dict) -> bool:
+    return any(marking[0] == CellColor.RED for marking in markings.values())
+
+
+def dict_bad_rows(markings: dict) -> list[int]:
+    return list(set(row for (row, _, __), marking in markings.items() if marking[0] == CellColor.RED))
+
+
+def dict_clear_row(markings: dict, row: int) -> None:
+    non_empty_indices = {row}
+    empty_indices = set()
+
+    keys_to_remove = [
+        key
+        for key in markings
+        if (
+            key[0] in non_empty_indices
+            and (
+                (key[2] == MarkingSource.WIDE)
+                or (key[2] == MarkingSource.CELL and markings[key][0] != CellColor.GREY)
+            )
+        )
+        or (key[0] in empty_indices and markings[key][0] == CellColor.RED)
+    ]
+
+    for key in keys_to_remove:
+        del markings[key]
+
+
+# The current implementation
+
+
+def store_fill(rows: int, columns: int, red: list) -> MarkingStore:
+    markings = MarkingStore(rows, columns)
+
+    for col in range(DISABLED_COLUMNS):
+        markings.mark_rows(range(rows), col, MarkingSource.CELL, CellColor.GREY, "")
+
+    for key in red:
+        markings[key] = (CellColor.RED, "Verplicht")
+
+    return markings
+
+
+def store_clear_row(markings: MarkingStore, row: int) -> None:
+    markings.clear([row], MarkingSource.WIDE, CellColor)
+    markings.clear([row], MarkingSource.CELL, (CellColor.RED, CellColor.YELLOW))
+
+
+def _format(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.1f} ms"
+
+    return f"{seconds * 1e6:.1f} us"
+
+
+def _median_time(call: Callable, runs: int, setup: Callable[[], object] | None = None) -> float:
+    """Median wall time of call(), or of call(setup()) when there is a setup."""
+    times = []
+    function = call
+
+    for _ in range(runs):
+        if setup is not None:
+            # NOTE: the setup (e.g. a fresh copy of the markings to clear) is not timed
+            function = partial(call, setup())
+
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the grid markings")
+    parser.add_argument("--rows", type=int, default=10_000, help="number of grid rows")
+    parser.add_argument("--columns", type=int, default=40, help="number of grid columns")
+    parser.add_argument("--cleared-rows", type=int, default=200, help="number of single rows to clear")
+    parser.add_argument("--runs", type=int, default=5, help="number of measured runs per operation")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this JSON file")
+
+    args = parser.parse_args()
+
+    red = red_cells(args.rows, args.columns)
+    cleared = random.Random(1).sample(range(args.rows), args.cleared_rows)
+    filter_rows = min(DICT_FILTER_ROWS, args.rows)
+
+    def dict_clear(markings: dict) -> None:
+        for row in cleared:
+            dict_clear_row(markings, row)
+
+    def store_clear(markings: MarkingStore) -> None:
+        for row in cleared:
+            store_clear_row(markings, row)
+
+    dict_markings = dict_fill(args.rows, red)
+    store_markings = store_fill(args.rows, args.columns, red)
+
+    results = {
+        "fill": (
+            _median_time(lambda: dict_fill(args.rows, red), args.runs),
+            _median_time(lambda: store_fill(args.rows, args.columns, red), args.runs),
+        ),
+        "has_bad_rows": (
+            _median_time(lambda: dict_has_bad_rows(dict_markings), args.runs),
+            _median_time(lambda: store_markings.has_red, args.runs),
+        ),
+        f"bad rows filter ({args.rows} rows)": (
+            _median_time(
+                lambda: [row for row in range(filter_rows) if row not in dict_bad_rows(dict_markings)], 1
+            )
+            * args.rows
+            / filter_rows,
+            _median_time(lambda: [row for row in range(args.rows) if not store_markings.is_red_row(row)], args.runs),
+        ),
+        f"clear {args.cleared_rows} single rows": (
+            _median_time(dict_clear, args.runs, setup=lambda: dict(dict_markings)),
+            _median_time(store_clear, args.runs, setup=lambda: store_fill(args.rows, args.columns, red)),
+        ),
+    }
+
+    dict_clear(dict_markings)
+    store_clear(store_markings)
+    same = dict(store_markings.items()) == dict_markings and sorted(store_markings.red_rows) == sorted(
+        dict_bad_rows(dict_markings)
+    )
+
+    print(f"Grid: {args.rows} rows x {args.columns} columns, {len(red)} red cells, runs: {args.runs}")
+    print(f"{'':32}{'dict':>12}{'store':>12}")
+
+    for name, (dict_s, store_s) in results.items():
+        print(f"  {name:30}{_format(dict_s):>12}{_format(store_s):>12}")
+
+    if args.rows > filter_rows:
+        print(f"  (the dict filter is timed on {filter_rows} rows and scaled up)")
+
+    if not same:
+        print("The markings differ between the dict and the store!")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "rows": args.rows,
+                    "columns": args.columns,
+                    "red_cells": len(red),
+                    "runs": args.runs,
+                    "seconds": {name: {"dict": d, "store": s} for name, (d, s) in results.items()},
+                },
+                f,
+                indent=2,
+            )
+
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
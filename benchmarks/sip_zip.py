@@ -0,0 +1,238 @@
+"""
+SIP ZIP benchmark
+
+Builds a synthetic dossier (compressible text files and incompressible PDFs) and measures the wall
+time and peak memory (RSS) of creating a SIP ZIP with its sidecar, and of replacing the
+Metadata.xlsx in it afterwards. Both are compared with the previous implementation, which read the
+whole archive back into memory to hash it and read every member whole when copying it.
+
+Every measurement runs in its own process, so the peak RSS of one does not hide the other.
+Run it from the project folder, like profile_startup.py:
+`python -m benchmarks.sip_zip --files 40 --file-size-mb 8 --runs 3 --json sip_zip.json`
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+RESULT_PREFIX = "sip_zip: result "
+VARIANTS = ("create_previous", "create_current", "update_previous", "update_current")
+
+
+def _peak_rss_mb() -> float:
+    if os.name == "nt":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+        )
+
+        return counters.PeakWorkingSetSize / 2**20
+
+    import resource
+
+    # NOTE: kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def build_dossier(folder: str, files: int, file_size: int) -> dict[str, str]:
+    """Half text files (deflated), half random PDFs (stored), returns {archive_name: disk_path}."""
+    additional_files = {}
+    line = b"Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.\n"
+
+    for i in range(files):
+        extension = "txt" if i % 2 == 0 else "pdf"
+        archive_name = f"dossier_{i // 10}/stuk_{i}.{extension}"
+        disk_path = os.path.join(folder, archive_name)
+        os.makedirs(os.path.dirname(disk_path), exist_ok=True)
+
+        with open(disk_path, "wb") as f:
+            f.write((line * (file_size // len(line) + 1))[:file_size] if extension == "txt" else os.urandom(file_size))
+
+        additional_files[archive_name] = disk_path
+
+    metadata_path = os.path.join(folder, "Metadata.xlsx")
+
+    with open(metadata_path, "wb") as f:
+        f.write(os.urandom(64 * 1024))
+
+    return additional_files
+
+
+def create_previous(metadata_path: str, sip_location: str, sidecar_location: str, additional_files: dict) -> None:
+    from src.controller.sip_creation_controller import SIDECAR_TEMPLATE
+
+    with zipfile.ZipFile(sip_location, "w", compression=zipfile.ZIP_DEFLATED) as zfile:
+        zfile.write(metadata_path, "Metadata.xlsx")
+
+        for archive_name, disk_path in additional_files.items():
+            zfile.write(disk_path, archive_name)
+
+    with open(sip_location, "rb") as f:
+        md5 = hashlib.md5(f.read()).hexdigest()
+
+    with open(sidecar_location, "w", encoding="utf-8") as f:
+        f.write(SIDECAR_TEMPLATE.format(md5=md5))
+
+
+def update_previous(metadata_path: str, sip_location: str, sidecar_location: str) -> None:
+    from src.controller.sip_creation_controller import SIDECAR_TEMPLATE
+
+    temp_zip = sip_location + ".tmp"
+
+    with (
+        zipfile.ZipFile(sip_location, "r") as zin,
+        zipfile.ZipFile(temp_zip, "w", compression=zipfile.ZIP_DEFLATED) as zout,
+    ):
+        for item in zin.infolist():
+            if item.filename == "Metadata.xlsx":
+                continue
+            zout.writestr(item, zin.read(item.filename))
+
+        zout.write(metadata_path, "Metadata.xlsx")
+
+    os.replace(temp_zip, sip_location)
+
+    with open(sip_location, "rb") as f:
+        md5 = hashlib.md5(f.read()).hexdigest()
+
+    with open(sidecar_location, "w", encoding="utf-8") as f:
+        f.write(SIDECAR_TEMPLATE.format(md5=md5))
+
+
+def run_child(variant: str, folder: str) -> None:
+    from src.controller.sip_creation_controller import create_sip_zip, update_metadata_in_zip
+
+    with open(os.path.join(folder, "files.json"), encoding="utf-8") as f:
+        additional_files = json.load(f)
+
+    metadata_path = os.path.join(folder, "Metadata.xlsx")
+    sip_location = os.path.join(folder, f"{variant.split('_')[1]}.zip")
+    sidecar_location = sip_location + ".xml"
+    baseline_mb = _peak_rss_mb()
+
+    start = time.perf_counter()
+
+    if variant == "create_previous":
+        create_previous(metadata_path, sip_location, sidecar_location, additional_files)
+    elif variant == "create_current":
+        create_sip_zip(metadata_path, sip_location, sidecar_location, additional_files)
+    elif variant == "update_previous":
+        update_previous(metadata_path, sip_location, sidecar_location)
+    else:
+        update_metadata_in_zip(metadata_path, sip_location, sidecar_location)
+
+    wall_s = time.perf_counter() - start
+
+    result = {
+        "wall_s": wall_s,
+        "peak_rss_mb": _peak_rss_mb(),
+        "baseline_rss_mb": baseline_mb,
+        "zip_mb": os.path.getsize(sip_location) / 2**20,
+    }
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+def run_parent(files: int, file_size_mb: float, runs: int, json_path: str | None) -> int:
+    folder = tempfile.mkdtemp(prefix="sip_zip_benchmark_")
+
+    try:
+        additional_files = build_dossier(folder, files, int(file_size_mb * 2**20))
+
+        with open(os.path.join(folder, "files.json"), "w", encoding="utf-8") as f:
+            json.dump(additional_files, f)
+
+        command = [sys.executable, "-m", "benchmarks.sip_zip", "--child"]
+        results: dict[str, list[dict]] = {variant: [] for variant in VARIANTS}
+
+        # NOTE: the first round warms the disk cache, it is not counted. The variants take turns, an
+        # update needs the ZIP of the create before it
+        for i in range(runs + 1):
+            for variant in VARIANTS:
+                completed = subprocess.run(
+                    [*command, variant, folder], capture_output=True, text=True, encoding="utf-8"
+                )
+                lines = [line for line in completed.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+
+                if completed.returncode != 0 or not lines:
+                    print(completed.stderr, file=sys.stderr)
+                    print(f"{variant} failed (exit code {completed.returncode})", file=sys.stderr)
+                    return 2
+
+                if i > 0:
+                    results[variant].append(json.loads(lines[-1][len(RESULT_PREFIX) :]))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    summary = {
+        variant: {
+            "median_wall_s": statistics.median(r["wall_s"] for r in variant_results),
+            "max_peak_rss_mb": max(r["peak_rss_mb"] for r in variant_results),
+            "baseline_rss_mb": min(r["baseline_rss_mb"] for r in variant_results),
+            "zip_mb": variant_results[-1]["zip_mb"],
+        }
+        for variant, variant_results in results.items()
+    }
+
+    print(f"Dossier: {files} files of {file_size_mb} MB, runs: {runs}")
+    print(f"{'':18}{'wall (median)':>15}{'peak RSS':>12}{'after imports':>15}{'ZIP':>10}")
+
+    for variant, s in summary.items():
+        print(
+            f"{variant:18}{s['median_wall_s']:>13.2f} s{s['max_peak_rss_mb']:>9.0f} MB"
+            f"{s['baseline_rss_mb']:>12.0f} MB{s['zip_mb']:>7.0f} MB"
+        )
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"files": files, "file_size_mb": file_size_mb, "runs": runs, **summary}, f, indent=2)
+
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark creating and updating SIP ZIPs")
+    parser.add_argument("--files", type=int, default=40, help="number of dossier files")
+    parser.add_argument("--file-size-mb", type=float, default=8, help="size of every dossier file")
+    parser.add_argument("--runs", type=int, default=3, help="number of measured runs")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this JSON file")
+    parser.add_argument("--child", nargs=2, metavar=("VARIANT", "FOLDER"), help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    sys.exit(run_parent(args.files, args.file_size_mb, args.runs, args.json_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Startup profiler
+
+Starts the application a number of times on Qt's offscreen platform, with `-X importtime`, and
+reports the time to the first paint of the main window and the slowest imports before it.
+Heavy modules (see WARM_UP_MODULES) that are imported before the first paint are reported as
+a regression, and make the script exit with code 1.
+
+Run it from the project folder, like new_main.py:
+`python profile_startup.py --runs 5 --json startup_profile.json`
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+FIRST_PAINT_MARKER = "profile_startup: first paint"
+RESULT_PREFIX = "profile_startup: result "
+
+
+def run_child() -> None:
+    """Start the application, and quit as soon as the main window is painted."""
+    start = time.perf_counter()
+
+    from PySide6 import QtCore
+
+    from src.utils.application import Application
+
+    imported = time.perf_counter()
+
+    class FirstPaintFilter(QtCore.QObject):
+        def eventFilter(self, watched: QtCore.QObject, event: QtCore.QEvent) -> bool:
+            if event.type() == QtCore.QEvent.Type.Paint and not hasattr(self, "painted"):
+                self.painted = time.perf_counter()
+
+                # NOTE: -X importtime writes to stderr, the marker splits the imports before/after the paint
+                print(FIRST_PAINT_MARKER, file=sys.stderr, flush=True)
+
+                QtCore.QTimer.singleShot(0, app.quit)
+
+            return False
+
+    app = Application()
+    window = app.window_controller.sip_creator_window
+
+    paint_filter = FirstPaintFilter()
+    window.installEventFilter(paint_filter)
+    window.show()
+
+    app.exec()
+
+    result = {
+        "import_s": imported - start,
+        "first_paint_s": paint_filter.painted - start,
+    }
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+    # NOTE: shutting down (waiting for the background workers) is not measured, skip it
+    os._exit(0)
+
+
+def parse_importtime(stderr: str) -> tuple[dict[str, int], list[str]]:
+    """The cumulative import time (µs) per module imported before the first paint, in import order."""
+    cumulative: dict[str, int] = {}
+    order: list[str] = []
+
+    for line in stderr.splitlines():
+        if line.startswith(FIRST_PAINT_MARKER):
+            break
+
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative_us, module_name = line[len("import time:") :].split("|", 2)
+
+        if not cumulative_us.strip().isdigit():
+            continue
+
+        module_name = module_name.strip()
+        cumulative[module_name] = int(cumulative_us)
+        order.append(module_name)
+
+    return cumulative, order
+
+
+def run_parent(runs: int, top: int, json_path: str | None) -> int:
+    from src.utils.constants import WARM_UP_MODULES
+
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPATH=os.getcwd())
+    command = [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child"]
+
+    first_paint: list[float] = []
+    import_times: list[float] = []
+    cumulative_runs: list[dict[str, int]] = []
+    heavy_before_paint: set[str] = set()
+
+    # NOTE: the first run compiles the bytecode, it is not counted
+    for i in range(runs + 1):
+        completed = subprocess.run(command, env=env, capture_output=True, text=True, encoding="utf-8")
+
+        results = [line for line in completed.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+
+        if completed.returncode != 0 or not results:
+            print(completed.stderr, file=sys.stderr)
+            print(f"Run {i} failed (exit code {completed.returncode})", file=sys.stderr)
+            return 2
+
+        if i == 0:
+            continue
+
+        result = json.loads(results[-1][len(RESULT_PREFIX) :])
+        first_paint.append(result["first_paint_s"])
+        import_times.append(result["import_s"])
+
+        cumulative, order = parse_importtime(completed.stderr)
+        cumulative_runs.append(cumulative)
+        heavy_before_paint.update(m for m in order if m.split(".")[0] in WARM_UP_MODULES)
+
+    modules = set().union(*cumulative_runs)
+    median_cumulative = {
+        module_name: statistics.median(run.get(module_name, 0) for run in cumulative_runs) for module_name in modules
+    }
+    slowest = sorted(median_cumulative.items(), key=lambda item: item[1], reverse=True)[:top]
+    heavy = sorted(m for m in heavy_before_paint if "." not in m)
+
+    print(f"Runs: {runs}")
+    print(f"Import of the application (median): {statistics.median(import_times) * 1000:.0f} ms")
+    print(f"Time to first paint (median): {statistics.median(first_paint) * 1000:.0f} ms")
+    print(f"Slowest imports before the first paint (median cumulative, top {top}):")
+
+    for module_name, cumulative_us in slowest:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {module_name}")
+
+    if heavy:
+        print(f"Heavy modules imported before the first paint: {', '.join(heavy)}")
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "runs": runs,
+                    "import_s": import_times,
+                    "first_paint_s": first_paint,
+                    "median_import_s": statistics.median(import_times),
+                    "median_first_paint_s": statistics.median(first_paint),
+                    "median_cumulative_import_us": dict(slowest),
+                    "heavy_before_first_paint": heavy,
+                },
+                f,
+                indent=2,
+            )
+
+    return 1 if heavy else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile the startup of the application")
+    parser.add_argument("--runs", type=int, default=5, help="number of measured runs")
+    parser.add_argument("--top", type=int, default=20, help="number of slowest imports to report")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this JSON file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+
+    sys.exit(run_parent(args.runs, args.top, args.json_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,6 @@ import json
 import sqlite3 as sql
 from collections.abc import Callable
 
-import pandas as pd
-
 from src.controller.db_versioning_common import run_db_migrations as _run_db_migrations
 
 from src.utils.constants import (
@@ -54,6 +52,8 @@ def migrate_analog_to_3_0(
         SeriesNotFoundError: If an environment_resolver is provided but cannot
             find the series in any environment.
     """
+    import pandas as pd
+
     # 1. Read extra table
     extra = conn.execute("SELECT * FROM extra").fetchone()
 
@@ -1,7 +1,8 @@
+from __future__ import annotations
+
 import os
 import sqlite3 as sql
-
-import pandas as pd
+from typing import TYPE_CHECKING
 
 from src.controller.analog.db_versioning import SeriesNotFoundError, run_db_migrations
 from src.controller.base_sip_db_controller import BaseSIPDBController
@@ -12,13 +13,18 @@ from src.utils.constants import (
     UI_TEXT_ELEMENTS,
     DBColumnName,
     DBTableName,
+    SIPType,
 )
 from src.utils.data_objects.analog.sip import AnalogSIP
 from src.utils.data_objects.sip_status import SIPStatus
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class AnalogSIPDBController(BaseSIPDBController):
     SIP_TYPE = AnalogSIP
+    CATALOG_TYPE = SIPType.ANALOOG
 
     @property
     def db_location(self) -> str:
@@ -34,6 +40,8 @@ class AnalogSIPDBController(BaseSIPDBController):
             return False
 
         def _create(conn: sql.Connection) -> None:
+            import pandas as pd
+
             conn.execute(f"""
                 CREATE TABLE {DBTableName.SIP} (
                     {DBColumnName.NAME} text,
@@ -76,48 +84,49 @@ class AnalogSIPDBController(BaseSIPDBController):
 
         return True
 
-    def read_sip_db(self, db_file_name: str) -> tuple[AnalogSIP, str, str]:
-        def _read(conn: sql.Connection) -> tuple[AnalogSIP, str, str]:
-            columns = [col_name for _, col_name, *_ in conn.execute(f"PRAGMA table_info({DBTableName.SIP});").fetchall()]
-            has_grid_valid = DBColumnName.GRID_VALID in columns
+    def _read_sip_record(self, conn: sql.Connection, db_file_name: str) -> dict:
+        columns = self.pool(db_file_name).table_columns(conn, DBTableName.SIP)
+        record_columns = [
+            DBColumnName.NAME,
+            DBColumnName.STATUS,
+            DBColumnName.ENVIRONMENT_NAME,
+            DBColumnName.SERIES_ID,
+            DBColumnName.SERIES_NAME,
+            DBColumnName.EDEPOT_SIP_ID,
+            DBColumnName.UPLOADED,
+        ]
 
-            result = conn.execute(
-                f"SELECT {DBColumnName.NAME}, {DBColumnName.STATUS}, {DBColumnName.ENVIRONMENT_NAME}, "
-                f"{DBColumnName.SERIES_ID}, {DBColumnName.SERIES_NAME}, "
-                f"{DBColumnName.EDEPOT_SIP_ID}, {DBColumnName.UPLOADED}"
-                + (f", {DBColumnName.GRID_VALID}" if has_grid_valid else "")
-                + f" FROM {DBTableName.SIP};"
-            ).fetchone()
+        if DBColumnName.GRID_VALID in columns:
+            record_columns.append(DBColumnName.GRID_VALID)
 
-            name, status, environment_name, series_id, series_name, edepot_sip_id, uploaded = result[:7]
-            grid_valid = bool(result[7]) if has_grid_valid else False
+        result = conn.execute(f"SELECT {', '.join(record_columns)} FROM {DBTableName.SIP};").fetchone()
 
-            sip = AnalogSIP()
-            sip.force_set_name(name)
-            sip.set_status(SIPStatus[status])
-            sip.environment = self.application.configuration.get_environment(environment_name)
-            sip.saved_series_name = series_name
-            sip.uploaded = bool(uploaded)
-            sip.set_grid_valid(grid_valid)
+        return dict(zip(record_columns, result))
 
-            if edepot_sip_id:
-                sip.edepot_sip_id = edepot_sip_id
+    def _sip_from_record(self, record: dict) -> tuple[AnalogSIP, str, str]:
+        sip = AnalogSIP()
+        sip.force_set_name(record[DBColumnName.NAME])
+        sip.set_status(SIPStatus[record[DBColumnName.STATUS]])
+        sip.environment = self.application.configuration.get_environment(record[DBColumnName.ENVIRONMENT_NAME])
+        sip.saved_series_name = record[DBColumnName.SERIES_NAME]
+        sip.uploaded = bool(record[DBColumnName.UPLOADED])
+        sip.set_grid_valid(bool(record.get(DBColumnName.GRID_VALID)))
 
-            return sip, series_id, series_name
+        if record[DBColumnName.EDEPOT_SIP_ID]:
+            sip.edepot_sip_id = record[DBColumnName.EDEPOT_SIP_ID]
 
-        return self._execute_with_conn(db_file_name, _read)
+        return sip, record[DBColumnName.SERIES_ID], record[DBColumnName.SERIES_NAME]
 
     def read_data(self, db_file_name: str) -> pd.DataFrame:
+        import pandas as pd
+
         return self._execute_with_conn(
             db_file_name,
             lambda conn: pd.read_sql(f"SELECT * FROM {DBTableName.DATA}", conn).fillna("").astype(str),
         )
 
-    def save_data(self, sip: AnalogSIP, df: pd.DataFrame) -> None:
-        self._execute_with_conn(
-            sip.db_name,
-            lambda conn: df.to_sql(DBTableName.DATA, conn, if_exists="replace", index=False, dtype="text"),
-        )
+    def save_data(self, sip: AnalogSIP, df: pd.DataFrame, rows: list[int] | None = None) -> None:
+        self._execute_with_conn(sip.db_name, lambda conn: self._save_grid_data(conn, DBTableName.DATA, df, rows))
 
     def persist_sip(self, sip: AnalogSIP) -> None:
         if not self.db_exists(sip.db_name):
@@ -125,7 +134,7 @@ class AnalogSIPDBController(BaseSIPDBController):
 
         def _persist(conn: sql.Connection) -> None:
             series_name = sip.series.get_full_name() if sip.series else (sip.saved_series_name or "")
-            columns = [col_name for _, col_name, *_ in conn.execute(f"PRAGMA table_info({DBTableName.SIP});").fetchall()]
+            columns = self.pool(sip.db_name).table_columns(conn, DBTableName.SIP)
 
             if DBColumnName.GRID_VALID in columns:
                 conn.execute(
@@ -145,6 +154,7 @@ class AnalogSIPDBController(BaseSIPDBController):
             self._update_sip_creator_version(conn)
 
         self._execute_with_conn(sip.db_name, _persist)
+        self.catalog_sip(sip.db_name)
 
     def is_valid_db(self, db_file_name: str) -> bool:
         if not self._can_connect(db_file_name):
@@ -1,12 +1,28 @@
+import hashlib
 import json
 import os
+import threading
+import time
 import uuid
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 
 import requests
-
-from src.utils.constants import APIResponseKey
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.utils.constants import (
+    ACCESS_TOKEN_DEFAULT_LIFETIME_SECONDS,
+    ACCESS_TOKEN_REFRESH_MARGIN_SECONDS,
+    API_CONNECTION_POOL_SIZE,
+    API_RETRY_BACKOFF_FACTOR,
+    API_RETRY_STATUS_CODES,
+    API_RETRY_TOTAL,
+    IMPORT_TEMPLATE_CACHE_TTL_SECONDS,
+    IMPORT_TEMPLATE_WARM_WORKERS,
+    APIResponseKey,
+)
 from src.utils.data_objects.configuration import Configuration, Environment
 from src.utils.data_objects.series import Series, SeriesStatus
 from src.utils.data_objects.sip import SIP
@@ -21,6 +37,100 @@ SIP_STATUS_MAPPING = {
 }
 
 
+class _EnvironmentClient:
+    """Pooled HTTP session and cached access token for one environment.
+
+    The token is shared by all threads; the lock makes sure only one of them
+    requests a new one when it is about to expire.
+    """
+
+    def __init__(self) -> None:
+        retry = Retry(
+            total=API_RETRY_TOTAL,
+            backoff_factor=API_RETRY_BACKOFF_FACTOR,
+            status_forcelist=API_RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=API_CONNECTION_POOL_SIZE, pool_maxsize=API_CONNECTION_POOL_SIZE, max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.token_lock = threading.Lock()
+        self.access_token: str | None = None
+        self.expires_at = 0.0
+
+
+_environment_clients: dict[tuple, _EnvironmentClient] = {}
+_environment_clients_guard = threading.Lock()
+
+
+def _client_for(environment: Environment) -> _EnvironmentClient:
+    # NOTE: keyed on the credentials too, so editing an environment in the settings starts a fresh session
+    key = (
+        environment.name,
+        environment.api_url,
+        environment.api_username,
+        environment.api_password,
+        environment.api_client_id,
+        environment.api_client_secret,
+    )
+
+    with _environment_clients_guard:
+        client = _environment_clients.get(key)
+
+        if client is None:
+            client = _environment_clients[key] = _EnvironmentClient()
+
+        return client
+
+
+# One lock per (environment, series id), so concurrent callers download a template only once
+_import_template_locks: dict[tuple[str, str], threading.Lock] = {}
+_import_template_locks_guard = threading.Lock()
+
+
+def _import_template_lock(environment_name: str, series_id: str) -> threading.Lock:
+    with _import_template_locks_guard:
+        return _import_template_locks.setdefault((environment_name, series_id), threading.Lock())
+
+
+def _sha256_of(path: str) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _read_template_metadata(metadata_location: str) -> dict:
+    try:
+        with open(metadata_location, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _atomic_write(location: str, content: bytes) -> None:
+    # Write to a unique temp file, then rename — avoids corruption
+    # if multiple threads download the same template concurrently
+    temp_location = location + f".{uuid.uuid4().hex}.tmp"
+    with open(temp_location, "wb") as f:
+        f.write(content)
+
+    try:
+        os.replace(temp_location, location)
+    except PermissionError:
+        # Another thread may have the target file open — clean up temp
+        with suppress(OSError):
+            os.remove(temp_location)
+
+
 def _truncate(value, limit: int = 120) -> str:
     text = repr(value)
     if len(text) > limit:
@@ -54,27 +164,50 @@ class SIPNotFoundError(Exception):
 class APIController:
     @staticmethod
     def _perform_request(
-        request_type,
+        environment: Environment,
+        method: str,
         url: str,
         headers: dict = None,
         data: dict = None,
         params: dict = None,
         timeout=10,
     ) -> requests.Response:
-        method = getattr(request_type, "__name__", str(request_type)).upper()
+        """Send a request over the environment's pooled session.
+
+        429 and 5xx answers are retried with backoff by the session itself. A 401 on an
+        authorized request means the cached token was revoked early: it is dropped and
+        the request is sent once more with a fresh token.
+
+        The bearer token of an authorized request is always taken from the environment's
+        cache, so callers that reuse their headers (e.g. while paging) pick up a token
+        that was refreshed in the meantime.
+        """
+        session = _client_for(environment).session
+        authorized = headers is not None and "Authorization" in headers
         temp_log(f"[api] HTTP {method} {url} params={params}")
 
-        response = request_type(url, headers=headers, data=data, params=params, timeout=timeout)
+        if authorized:
+            access_token = APIController._get_access_token(environment)
+            headers = {**headers, "Authorization": f"Bearer {access_token}"}
+
+        response = session.request(method, url, headers=headers, data=data, params=params, timeout=timeout)
 
         temp_log(f"[api] HTTP {method} {url} -> {response.status_code} {response.reason}")
 
+        if response.status_code == 401 and authorized:
+            APIController._invalidate_access_token(environment, access_token)
+            headers = {**headers, "Authorization": f"Bearer {APIController._get_access_token(environment)}"}
+
+            response = session.request(method, url, headers=headers, data=data, params=params, timeout=timeout)
+
+            temp_log(f"[api] HTTP {method} {url} (new token) -> {response.status_code} {response.reason}")
+
         response.raise_for_status()
 
         return response
 
     @staticmethod
-    def _get_access_token(environment: Environment) -> str:
-        temp_log(f"[api] _get_access_token: env={environment.name}, user={environment.api_username}")
+    def _request_access_token(environment: Environment) -> tuple[str, float]:
         base_url = environment.api_url
         endpoint = "auth/ropc.php"
 
@@ -90,20 +223,50 @@ class APIController:
 
         try:
             response = APIController._perform_request(
-                request_type=requests.post,
+                environment=environment,
+                method="POST",
                 url=f"{base_url}/{endpoint}",
                 headers=headers,
                 data=data,
-            )
+            ).json()
         except requests.exceptions.HTTPError as e:
             if e.response is not None and e.response.status_code == 401:
                 raise APIAuthenticationError(environment.name) from e
             raise
 
-        token = response.json()["access_token"]
-        temp_log(f"[api] _get_access_token: returning token (len={len(token)})")
+        try:
+            lifetime = float(response.get("expires_in", ACCESS_TOKEN_DEFAULT_LIFETIME_SECONDS))
+        except (TypeError, ValueError):
+            lifetime = ACCESS_TOKEN_DEFAULT_LIFETIME_SECONDS
+
+        return response["access_token"], lifetime
+
+    @staticmethod
+    def _get_access_token(environment: Environment) -> str:
+        client = _client_for(environment)
+
+        with client.token_lock:
+            if client.access_token is not None and time.monotonic() < client.expires_at:
+                return client.access_token
+
+            temp_log(f"[api] _get_access_token: env={environment.name}, user={environment.api_username}")
+            token, lifetime = APIController._request_access_token(environment)
+
+            client.access_token = token
+            client.expires_at = time.monotonic() + max(lifetime - ACCESS_TOKEN_REFRESH_MARGIN_SECONDS, 0)
+
+        temp_log(f"[api] _get_access_token: returning new token (len={len(token)}, expires_in={lifetime:.0f}s)")
         return token
 
+    @staticmethod
+    def _invalidate_access_token(environment: Environment, access_token: str) -> None:
+        client = _client_for(environment)
+
+        with client.token_lock:
+            # Another thread may already have replaced it
+            if client.access_token == access_token:
+                client.access_token = None
+
     @staticmethod
     def _get_user_group_id(access_token: str, environment: Environment) -> str:
         temp_log(f"[api] _get_user_group_id: env={environment.name}")
@@ -116,7 +279,8 @@ class APIController:
         }
 
         response = APIController._perform_request(
-            request_type=requests.get,
+            environment=environment,
+            method="GET",
             url=f"{base_url}/{endpoint}",
             headers=headers,
         ).json()
@@ -142,7 +306,8 @@ class APIController:
         }
 
         response = APIController._perform_request(
-            request_type=requests.get,
+            environment=environment,
+            method="GET",
             url=f"{base_url}/{endpoint}",
             headers=headers,
         ).json()
@@ -179,7 +344,8 @@ class APIController:
         total_yielded = 0
         while True:
             response = APIController._perform_request(
-                request_type=requests.get,
+                environment=environment,
+                method="GET",
                 url=f"{base_url}/{endpoint}",
                 headers=headers,
                 params=params,
@@ -201,8 +367,7 @@ class APIController:
         temp_log(f"[api] get_series: done, total series yielded={total_yielded}")
 
     @staticmethod
-    def get_import_template(configuration: Configuration, environment: Environment, series_id: str) -> str:
-        temp_log(f"[api] get_import_template: env={environment.name}, series_id={series_id}")
+    def _download_import_template(environment: Environment, series_id: str, etag: str | None) -> requests.Response:
         access_token = APIController._get_access_token(environment)
 
         base_url = environment.api_url
@@ -213,89 +378,115 @@ class APIController:
             "Content-Type": "application/json",
         }
 
+        if etag is not None:
+            headers["If-None-Match"] = etag
+
         data = {
             "SeriesId": series_id,
         }
 
-        response = APIController._perform_request(
-            request_type=requests.post,
+        return APIController._perform_request(
+            environment=environment,
+            method="POST",
             url=f"{base_url}/{endpoint}",
             headers=headers,
             data=json.dumps(data),
         )
 
-        storage_location = configuration.misc.save_location
-        folder_location = os.path.join(storage_location, "import_templates")
+    @staticmethod
+    def get_import_template(
+        configuration: Configuration, environment: Environment, series_id: str, force_refresh: bool = False
+    ) -> str:
+        """Return the location of the import template for series_id, downloading it only when needed.
+
+        Templates are cached per environment under import_templates/, next to a small JSON file
+        holding their content hash, ETag and fetch time. A cached template younger than the TTL is
+        returned without any request. An older one is revalidated: the e-depot may answer
+        304 Not Modified to the ETag, and otherwise an identical download (same hash) only
+        refreshes the fetch time. If revalidation fails, the cached template is used as is.
+        """
+        temp_log(f"[api] get_import_template: env={environment.name}, series_id={series_id}")
+
+        folder_location = os.path.join(configuration.import_templates_location, environment.name)
         file_location = os.path.join(folder_location, f"{series_id}.xlsx")
+        metadata_location = os.path.join(folder_location, f"{series_id}.json")
 
         os.makedirs(folder_location, exist_ok=True)
 
-        # Write to a unique temp file, then rename — avoids corruption
-        # if multiple threads download the same template concurrently
-        temp_location = file_location + f".{uuid.uuid4().hex}.tmp"
-        with open(temp_location, "wb") as f:
-            f.write(response.content)
+        with _import_template_lock(environment.name, series_id):
+            metadata = _read_template_metadata(metadata_location)
+            cached_hash = metadata.get("sha256")
 
-        try:
-            os.replace(temp_location, file_location)
-        except PermissionError:
-            # Another thread may have the target file open — clean up temp
-            with suppress(OSError):
-                os.remove(temp_location)
+            # A template that was removed or altered on disk is never served from the cache
+            if cached_hash is None or _sha256_of(file_location) != cached_hash:
+                metadata = {}
+                cached_hash = None
 
-        temp_log(f"[api] get_import_template: returning {file_location} ({len(response.content)} bytes)")
-        return file_location
+            age = time.time() - metadata.get("fetched_at", 0)
 
-    @staticmethod
-    def get_sip_id(sip: SIP) -> str | None:
-        environment = sip.environment
-        temp_log(
-            f"[api] get_sip_id: env={environment.name}, sip_name={sip.name}, "
-            f"sip_type={type(sip).__name__}, file_name={getattr(sip, 'file_name', '?')}"
-        )
-        access_token = APIController._get_access_token(environment)
+            if cached_hash is not None and not force_refresh and age < IMPORT_TEMPLATE_CACHE_TTL_SECONDS:
+                temp_log(f"[api] get_import_template: cache hit {file_location} (age={int(age)}s)")
+                return file_location
 
-        base_url = environment.api_url
-        endpoint = "edepot/api/v1/sips"
+            try:
+                response = APIController._download_import_template(
+                    environment, series_id, etag=metadata.get("etag") if cached_hash is not None else None
+                )
+            except requests.exceptions.RequestException as e:
+                if cached_hash is None:
+                    raise
 
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        }
+                temp_log(f"[api] get_import_template: revalidation failed ({e!r}), using cached {file_location}")
+                return file_location
 
-        params = {
-            "size": 100,
-            "page": 0,
-            "sort": "ArchiveDate,desc",
-        }
+            if response.status_code == 304 and cached_hash is not None:
+                temp_log(f"[api] get_import_template: not modified, keeping {file_location}")
+            else:
+                content_hash = hashlib.sha256(response.content).hexdigest()
 
-        while True:
-            response = APIController._perform_request(
-                request_type=requests.get,
-                url=f"{base_url}/{endpoint}",
-                headers=headers,
-                params=params,
-            ).json()
+                if content_hash != cached_hash:
+                    _atomic_write(file_location, response.content)
 
-            sip_objects = response[APIResponseKey.CONTENT]
+                metadata = {"sha256": content_hash, "etag": response.headers.get("ETag")}
 
-            for sip_object in sip_objects:
-                if sip_object["OriginalFilename"] == sip.file_name:
-                    found = sip_object["Id"]
-                    temp_log(f"[api] get_sip_id: returning {found} (matched on page {response.get('Page')})")
-                    return found
+                temp_log(
+                    f"[api] get_import_template: {'updated' if content_hash != cached_hash else 'unchanged'} "
+                    f"{file_location} ({len(response.content)} bytes)"
+                )
 
-            if (response["Page"] + 1) * 100 > response["Total"]:
-                break
+            metadata["fetched_at"] = time.time()
+            _atomic_write(metadata_location, json.dumps(metadata).encode("utf-8"))
 
-            params["page"] = params["page"] + 1
+        return file_location
 
-        temp_log(f"[api] get_sip_id: returning None (no match across {response.get('Total')} SIPs)")
-        return None
+    @staticmethod
+    def warm_import_templates(
+        configuration: Configuration, environment: Environment, series_ids: Iterable[str]
+    ) -> dict[str, str]:
+        """Make sure the import templates for all series_ids are cached, fetching them concurrently.
+
+        Returns {series_id: template location}.
+        """
+        series_ids = list(dict.fromkeys(series_ids))
+        temp_log(f"[api] warm_import_templates: env={environment.name}, series={len(series_ids)}")
+
+        with ThreadPoolExecutor(max_workers=IMPORT_TEMPLATE_WARM_WORKERS) as executor:
+            locations = executor.map(
+                lambda series_id: APIController.get_import_template(configuration, environment, series_id),
+                series_ids,
+            )
+
+            return dict(zip(series_ids, locations))
 
     @staticmethod
-    def get_sip_id_for_name(environment: Environment, zip_name: str) -> str | None:
-        temp_log(f"[api] get_sip_id_for_name: env={environment.name}, zip_name={zip_name}")
+    def iter_sip_pages(environment: Environment, from_last_page: bool = False) -> Iterator[list[dict]]:
+        """Yield the e-depot's SIP records page by page, newest ArchiveDate first.
+
+        With from_last_page the pages come in reverse, starting with the SIPs that have no
+        ArchiveDate yet (those sort last). The caller decides how far to go by simply stopping
+        the iteration.
+        """
+        temp_log(f"[api] iter_sip_pages: env={environment.name}, from_last_page={from_last_page}")
         access_token = APIController._get_access_token(environment)
 
         base_url = environment.api_url
@@ -306,41 +497,33 @@ class APIController:
             "Content-Type": "application/json",
         }
 
-        params = {
-            "size": 100,
-            "page": 0,
-            "sort": "ArchiveDate,desc",
-        }
+        page_size = 100
 
-        while True:
-            response = APIController._perform_request(
-                request_type=requests.get,
+        def _fetch(page: int) -> dict:
+            return APIController._perform_request(
+                environment=environment,
+                method="GET",
                 url=f"{base_url}/{endpoint}",
                 headers=headers,
-                params=params,
+                params={"size": page_size, "page": page, "sort": "ArchiveDate,desc"},
             ).json()
 
-            sip_objects = response[APIResponseKey.CONTENT]
+        response = _fetch(0)
+        page_count = max(-(-response["Total"] // page_size), 1)
 
-            # NOTE: we just have to assume the sip name will be unique, since the API is not supporting searching by name/time
-            for sip_object in sip_objects:
-                if sip_object["OriginalFilename"] == zip_name:
-                    found = sip_object["Id"]
-                    temp_log(
-                        f"[api] get_sip_id_for_name: returning {found} "
-                        f"(matched on page {response.get('Page')})"
-                    )
-                    return found
+        if not from_last_page:
+            yield response[APIResponseKey.CONTENT]
 
-            if (response["Page"] + 1) * 100 > response["Total"]:
-                break
+            for page in range(1, page_count):
+                yield _fetch(page)[APIResponseKey.CONTENT]
 
-            params["page"] = params["page"] + 1
+            return
 
-        temp_log(
-            f"[api] get_sip_id_for_name: returning None (no match across {response.get('Total')} SIPs)"
-        )
-        return None
+        # NOTE: the first page is only fetched for the total, it is yielded last
+        for page in range(page_count - 1, 0, -1):
+            yield _fetch(page)[APIResponseKey.CONTENT]
+
+        yield response[APIResponseKey.CONTENT]
 
     @staticmethod
     def _is_sip_not_found(error: requests.exceptions.HTTPError) -> bool:
@@ -387,7 +570,8 @@ class APIController:
 
         try:
             response = APIController._perform_request(
-                request_type=requests.get,
+                environment=environment,
+                method="GET",
                 url=f"{base_url}/{endpoint}",
                 headers=headers,
             ).json()
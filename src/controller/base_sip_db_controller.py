@@ -1,20 +1,37 @@
+from __future__ import annotations
+
 import os
 import sqlite3 as sql
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
+from src.controller.db_connections import ConnectionPool, get_connection_manager
+from src.controller.main_db_controller import SIPCatalogEntry
 
 from src.utils.base_object import BaseObject
-from src.utils.constants import DB_FILE_EXTENSION, SIP_CREATOR_VERSION, UI_TEXT_ELEMENTS, DBColumnName, DBTableName
+from src.utils.constants import (
+    DB_FILE_EXTENSION,
+    SIP_CREATOR_VERSION,
+    UI_TEXT_ELEMENTS,
+    DBColumnName,
+    DBTableName,
+    SIPType,
+)
 from src.utils.data_objects.sip import SIP
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class BaseSIPDBController(BaseObject):
     """
     Base class for SIP database controllers.
 
-    Subclasses must set SIP_TYPE and implement db_location.
+    Subclasses must set SIP_TYPE and CATALOG_TYPE, and implement db_location.
     """
 
     SIP_TYPE: type[SIP]
+    CATALOG_TYPE: SIPType
 
     def __init__(self) -> None:
         super().__init__()
@@ -23,11 +40,19 @@ class BaseSIPDBController(BaseObject):
     def db_location(self) -> str:
         raise NotImplementedError
 
-    def conn(self, db_file_name: str) -> sql.Connection:
-        return sql.connect(os.path.join(self.db_location, db_file_name))
+    def db_path(self, db_file_name: str) -> str:
+        return os.path.join(self.db_location, db_file_name)
+
+    def pool(self, db_file_name: str) -> ConnectionPool:
+        return get_connection_manager().pool(self.db_path(db_file_name))
+
+    def close_db(self, db_file_name: str) -> None:
+        """Close the pooled connections to a DB, needed before it can be deleted."""
+        get_connection_manager().close(self.db_path(db_file_name))
 
     def _execute_with_conn(self, db_file_name: str, func):
-        conn = self.conn(db_file_name)
+        pool = self.pool(db_file_name)
+        conn = pool.acquire()
 
         try:
             result = func(conn)
@@ -39,10 +64,47 @@ class BaseSIPDBController(BaseObject):
 
             raise
         finally:
-            conn.close()
+            pool.release(conn)
+
+    def _save_grid_data(
+        self, conn: sql.Connection, table_name: str, df: pd.DataFrame, rows: Iterable[int] | None = None
+    ) -> None:
+        """Save df to table_name, only writing the given rows (positions in df) if possible.
+
+        Row n of the table is keyed on rowid n + 1, which holds as long as the table was written
+        in order (to_sql does). The table is replaced as a whole when rows is None (changes not
+        known), or when it has other columns or rowids than that.
+        """
+        columns = list(df.columns)
+        table_columns = [name for _, name, *_ in conn.execute(f"PRAGMA table_info([{table_name}])").fetchall()]
+
+        if rows is not None and table_columns == columns:
+            row_count, max_rowid = conn.execute(
+                f"SELECT count(*), coalesce(max(rowid), 0) FROM [{table_name}]"
+            ).fetchone()
+
+        if rows is None or table_columns != columns or row_count != max_rowid:
+            df.to_sql(table_name, conn, if_exists="replace", index=False, dtype="text")
+            return
+
+        # Rows the table does not have yet have to be written as well
+        rows = sorted({row for row in rows if row < len(df)}.union(range(row_count, len(df))))
+        changed = df.iloc[rows]
+
+        # NOTE: written as text like to_sql does, missing values become NULL
+        values = changed.astype(str).where(changed.notna(), None).itertuples(index=False, name=None)
+
+        quoted_columns = ", ".join(['"rowid"'] + ['"{}"'.format(column.replace('"', '""')) for column in columns])
+        placeholders = ", ".join("?" * (len(columns) + 1))
+
+        conn.executemany(
+            f"INSERT OR REPLACE INTO [{table_name}] ({quoted_columns}) VALUES ({placeholders})",
+            ((row + 1, *row_values) for row, row_values in zip(rows, values)),
+        )
+        conn.execute(f"DELETE FROM [{table_name}] WHERE rowid > ?", (len(df),))
 
     def db_exists(self, db_file_name: str) -> bool:
-        return os.path.exists(os.path.join(self.db_location, db_file_name))
+        return os.path.exists(self.db_path(db_file_name))
 
     def _can_connect(self, db_file_name: str) -> bool:
         if not self.db_exists(db_file_name):
@@ -52,8 +114,7 @@ class BaseSIPDBController(BaseObject):
             return False
 
         try:
-            conn = self.conn(db_file_name)
-            conn.close()
+            self._execute_with_conn(db_file_name, lambda conn: None)
         except Exception:
             return False
 
@@ -140,20 +201,97 @@ class BaseSIPDBController(BaseObject):
         raise NotImplementedError
 
     def read_sip_db(self, db_file_name: str):
+        return self._sip_from_record(
+            self._execute_with_conn(db_file_name, lambda conn: self._read_sip_record(conn, db_file_name))
+        )
+
+    def _read_sip_record(self, conn: sql.Connection, db_file_name: str) -> dict:
+        """Read what is needed to build the SIP of a DB, as {column name: value}."""
+        raise NotImplementedError
+
+    def _sip_from_record(self, record: dict):
         raise NotImplementedError
 
     def g_read_all_sip_dbs(self) -> Iterator:
+        """Read the SIPs of all DBs in db_location.
+
+        A DB that did not change since it was cataloged (same mtime, size and SIP Creator version,
+        and no writes left in its WAL) is read from the SIP catalog in the main DB, the others are
+        validated (and migrated) first.
+        """
         if not os.path.exists(self.db_location):
             return
 
+        main_db_controller = self.application.main_db_controller
+        catalog = main_db_controller.read_sip_catalog(self.CATALOG_TYPE)
+        db_paths = set()
+
         for file in os.listdir(self.db_location):
             if file.startswith("old_") or ".original" in file:
                 continue
 
-            if not self.is_valid_db(file):
+            db_path = self.db_path(file)
+            db_paths.add(db_path)
+
+            entry = catalog.get(db_path)
+
+            if entry is not None and self._is_cataloged(entry, db_path):
+                yield self._sip_from_record(entry.record)
                 continue
 
-            yield self.read_sip_db(file)
+            valid = self.is_valid_db(file)
+            record = self.catalog_sip(file) if valid else None
+
+            # Most DBs are not opened again this session, no need to keep their connections around
+            self.close_db(file)
+
+            if record is not None:
+                yield self._sip_from_record(record)
+
+        main_db_controller.delete_sip_catalog_entries(
+            self.CATALOG_TYPE, [db_path for db_path in catalog if db_path not in db_paths]
+        )
+
+    def catalog_sip(self, db_file_name: str) -> dict:
+        """Store the SIP record of a DB in the SIP catalog, together with the mtime and size of the DB file."""
+
+        def _read(conn: sql.Connection) -> dict:
+            record = self._read_sip_record(conn, db_file_name)
+
+            # Copy the WAL into the DB file and empty it, so the DB file's mtime and size, and the WAL
+            # being empty, only change again on a later write
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+
+            return record
+
+        record = self._execute_with_conn(db_file_name, _read)
+        db_path = self.db_path(db_file_name)
+        stat = os.stat(db_path)
+
+        self.application.main_db_controller.write_sip_catalog_entry(
+            self.CATALOG_TYPE,
+            db_path,
+            SIPCatalogEntry(mtime_ns=stat.st_mtime_ns, size=stat.st_size, version=SIP_CREATOR_VERSION, record=record),
+        )
+
+        return record
+
+    @staticmethod
+    def _is_cataloged(entry: SIPCatalogEntry, db_path: str) -> bool:
+        """Whether the DB did not change since entry was stored."""
+        try:
+            stat = os.stat(db_path)
+        except OSError:
+            return False
+
+        # NOTE: writes that were not checkpointed yet (e.g. the app was killed) only show up in the WAL
+        try:
+            if os.path.getsize(f"{db_path}-wal") > 0:
+                return False
+        except OSError:
+            pass
+
+        return entry.version == SIP_CREATOR_VERSION and (stat.st_mtime_ns, stat.st_size) == (entry.mtime_ns, entry.size)
 
     def _warn_db_already_exists(self, db_path: str) -> None:
         self.application.notify_user_signal.emit(
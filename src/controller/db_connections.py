@@ -0,0 +1,164 @@
+"""
+Pooled connections to the SQLite databases
+
+Every DB file gets a small pool of connections that stay open between operations, instead of
+a connection being opened (and closed) for every read or write. A reused connection keeps its
+cache of prepared statements and its page cache. Connections use WAL journaling, so readers
+no longer wait for a writer, and frequent small writes (SIP status updates) don't hold up the
+grid saves.
+
+The pool of a file also caches the columns of its tables, see ConnectionPool.table_columns.
+"""
+
+import os
+import sqlite3 as sql
+import threading
+
+from src.utils.constants import DB_BUSY_TIMEOUT_SECONDS, DB_CACHE_SIZE_KIB, DB_CACHED_STATEMENTS, DB_POOL_SIZE
+
+
+class ConnectionPool:
+    """Connections to a single DB file.
+
+    A connection is used by one thread at a time, between acquire and release, but can be
+    handed to another thread afterwards.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+        self._idle: list[sql.Connection] = []
+        self._columns: dict[str, list[str]] = {}
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def acquire(self) -> sql.Connection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+
+        return self._connect()
+
+    def release(self, conn: sql.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._lock:
+            if not self._closed and len(self._idle) < DB_POOL_SIZE:
+                self._idle.append(conn)
+                return
+
+        conn.close()
+
+    def close(self) -> None:
+        """Close the idle connections, the ones in use are closed when they are released."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+
+        for conn in idle:
+            conn.close()
+
+    def table_columns(self, conn: sql.Connection, table_name: str) -> list[str]:
+        """The columns of table_name, read once per pool.
+
+        Only use this for tables whose schema is changed by the migrations alone (see
+        invalidate_schema), not for tables that are rewritten while the DB is in use.
+        """
+        with self._lock:
+            columns = self._columns.get(table_name)
+
+        if columns is None:
+            columns = [name for _, name, *_ in conn.execute(f"PRAGMA table_info([{table_name}]);").fetchall()]
+
+            with self._lock:
+                self._columns[table_name] = columns
+
+        return columns
+
+    def invalidate_schema(self) -> None:
+        with self._lock:
+            self._columns.clear()
+
+    def _connect(self) -> sql.Connection:
+        conn = sql.connect(
+            self.path,
+            timeout=DB_BUSY_TIMEOUT_SECONDS,
+            check_same_thread=False,
+            cached_statements=DB_CACHED_STATEMENTS,
+        )
+
+        try:
+            # NOTE: WAL is stored in the file, the other settings hold for this connection only
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            conn.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KIB};")
+        except Exception:
+            conn.close()
+
+            raise
+
+        return conn
+
+
+class ConnectionManager:
+    def __init__(self) -> None:
+        self._pools: dict[str, ConnectionPool] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, path: str) -> ConnectionPool:
+        key = self._key(path)
+
+        with self._lock:
+            pool = self._pools.get(key)
+
+            # A file that was deleted (and maybe created again) gets a fresh pool, the old
+            # connections still point to the deleted file
+            if pool is not None and not os.path.exists(path):
+                pool.close()
+                pool = None
+
+            if pool is None:
+                pool = self._pools[key] = ConnectionPool(path)
+
+            return pool
+
+    def invalidate_schema(self, path: str) -> None:
+        with self._lock:
+            pool = self._pools.get(self._key(path))
+
+        if pool is not None:
+            pool.invalidate_schema()
+
+    def close(self, path: str) -> None:
+        """Close the connections to path, e.g. before deleting the file."""
+        with self._lock:
+            pool = self._pools.pop(self._key(path), None)
+
+        if pool is not None:
+            pool.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+
+        for pool in pools:
+            pool.close()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+
+_manager: ConnectionManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_connection_manager() -> ConnectionManager:
+    global _manager
+
+    with _manager_lock:
+        if _manager is None:
+            _manager = ConnectionManager()
+
+        return _manager
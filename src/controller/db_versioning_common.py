@@ -14,6 +14,8 @@ from collections.abc import Callable
 
 from natsort import natsorted
 
+from src.controller.db_connections import get_connection_manager
+
 from src.utils.constants import (
     DB_SCHEMA_CHANGE_VERSIONS,
     SIP_CREATOR_VERSION,
@@ -83,7 +85,8 @@ def run_db_migrations(
     """Detect the DB schema version and apply all needed migrations.
 
     *schema_migrations* maps target schema versions to migration functions.
-    A one-time ``.original`` backup is created before the first migration.
+    A one-time ``.original`` backup is created before the first migration, and
+    the table columns cached for the DB are invalidated after the migrations.
     """
     db_version = detect_schema_version(conn)
 
@@ -120,6 +123,9 @@ def run_db_migrations(
                     os.remove(bak)
 
         raise
+    finally:
+        # Table columns cached for this DB are out of date now
+        get_connection_manager().invalidate_schema(db_path)
 
     # Update version to current
     conn.execute(
@@ -1,8 +1,9 @@
+from __future__ import annotations
+
 import json
 import os
 import sqlite3 as sql
-
-import pandas as pd
+from typing import TYPE_CHECKING
 
 from src.controller.base_sip_db_controller import BaseSIPDBController
 from src.controller.digital.db_versioning import run_db_migrations
@@ -11,6 +12,7 @@ from src.utils.constants import (
     UI_TEXT_ELEMENTS,
     DBColumnName,
     DBTableName,
+    SIPType,
 )
 from src.utils.data_objects.digital.sip import SIP as DigitalSIP
 from src.utils.data_objects.sip import SIP
@@ -19,6 +21,9 @@ from src.utils.pyside_helper import Helper
 
 from src.widget.components.digital.dossier_widget import DossierWidget
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def _parse_tag_mapping(raw: str) -> list[tuple[str, str]]:
     parsed = json.loads(raw)
@@ -31,6 +36,7 @@ def _parse_tag_mapping(raw: str) -> list[tuple[str, str]]:
 
 class DigitalSIPDBController(BaseSIPDBController):
     SIP_TYPE = DigitalSIP
+    CATALOG_TYPE = SIPType.DIGITAAL
 
     def __init__(self) -> None:
         super().__init__()
@@ -110,52 +116,45 @@ class DigitalSIPDBController(BaseSIPDBController):
 
         self._execute_with_conn(sip.db_name, _create)
 
-    def read_sip_db(self, sip_db_file_name: str) -> tuple[SIP, str, str]:
+    def _read_sip_record(self, conn: sql.Connection, db_file_name: str) -> dict:
         """
-        Reads a sip from its db.
+        Reads the sip fields from its db.
         Note however that this does not read the data, since we only get that on demand.
         """
-
-        def _read(conn: sql.Connection) -> tuple[SIP, str, str]:
-            columns = [col_name for _, col_name, *_ in conn.execute(f"PRAGMA table_info({DBTableName.SIP});").fetchall()]
-            has_grid_valid = DBColumnName.GRID_VALID in columns
-
-            result = conn.execute(
-                f"SELECT {DBColumnName.NAME}, {DBColumnName.STATUS}, {DBColumnName.ENVIRONMENT_NAME}, "
-                f"{DBColumnName.SERIES_ID}, {DBColumnName.SERIES_NAME}, {DBColumnName.EDEPOT_SIP_ID}, "
-                f"{DBColumnName.DOSSIERS_LIST}, {DBColumnName.TAG_MAPPING}, {DBColumnName.FOLDER_MAPPING}"
-                + (f", {DBColumnName.GRID_VALID}" if has_grid_valid else "")
-                + f" FROM {DBTableName.SIP};"
-            ).fetchone()
-
-            (
-                name,
-                status,
-                environment_name,
-                series_id,
-                series_name,
-                edepot_sip_id,
-                dossiers_list,
-                tag_mapping,
-                folder_mapping,
-            ) = result[:9]
-            grid_valid = bool(result[9]) if has_grid_valid else False
-
-            sip = DigitalSIP()
-            sip.force_set_name(name)
-            sip.set_status(SIPStatus[status])
-            sip.environment = self.application.configuration.get_environment(environment_name)
-
-            sip.edepot_sip_id = edepot_sip_id
-            sip.saved_series_name = series_name
-            sip.set_dossiers([DossierWidget(path=d) for d in json.loads(dossiers_list)])
-            sip.tag_mapping = _parse_tag_mapping(tag_mapping)
-            sip.folder_mapping = json.loads(folder_mapping)
-            sip.set_grid_valid(grid_valid)
-
-            return sip, series_id, series_name
-
-        return self._execute_with_conn(sip_db_file_name, _read)
+        columns = self.pool(db_file_name).table_columns(conn, DBTableName.SIP)
+        record_columns = [
+            DBColumnName.NAME,
+            DBColumnName.STATUS,
+            DBColumnName.ENVIRONMENT_NAME,
+            DBColumnName.SERIES_ID,
+            DBColumnName.SERIES_NAME,
+            DBColumnName.EDEPOT_SIP_ID,
+            DBColumnName.DOSSIERS_LIST,
+            DBColumnName.TAG_MAPPING,
+            DBColumnName.FOLDER_MAPPING,
+        ]
+
+        if DBColumnName.GRID_VALID in columns:
+            record_columns.append(DBColumnName.GRID_VALID)
+
+        result = conn.execute(f"SELECT {', '.join(record_columns)} FROM {DBTableName.SIP};").fetchone()
+
+        return dict(zip(record_columns, result))
+
+    def _sip_from_record(self, record: dict) -> tuple[SIP, str, str]:
+        sip = DigitalSIP()
+        sip.force_set_name(record[DBColumnName.NAME])
+        sip.set_status(SIPStatus[record[DBColumnName.STATUS]])
+        sip.environment = self.application.configuration.get_environment(record[DBColumnName.ENVIRONMENT_NAME])
+
+        sip.edepot_sip_id = record[DBColumnName.EDEPOT_SIP_ID]
+        sip.saved_series_name = record[DBColumnName.SERIES_NAME]
+        sip.set_dossiers([DossierWidget(path=d) for d in json.loads(record[DBColumnName.DOSSIERS_LIST])])
+        sip.tag_mapping = _parse_tag_mapping(record[DBColumnName.TAG_MAPPING])
+        sip.folder_mapping = json.loads(record[DBColumnName.FOLDER_MAPPING])
+        sip.set_grid_valid(bool(record.get(DBColumnName.GRID_VALID)))
+
+        return sip, record[DBColumnName.SERIES_ID], record[DBColumnName.SERIES_NAME]
 
     def persist_sip(self, sip: SIP) -> None:
         if not self.db_exists(sip.db_name):
@@ -165,7 +164,7 @@ class DigitalSIPDBController(BaseSIPDBController):
             return
 
         def _persist(conn: sql.Connection) -> None:
-            columns = [col_name for _, col_name, *_ in conn.execute(f"PRAGMA table_info({DBTableName.SIP});").fetchall()]
+            columns = self.pool(sip.db_name).table_columns(conn, DBTableName.SIP)
 
             if DBColumnName.GRID_VALID in columns:
                 conn.execute(
@@ -184,16 +183,17 @@ class DigitalSIPDBController(BaseSIPDBController):
             self._update_sip_creator_version(conn)
 
         self._execute_with_conn(sip.db_name, _persist)
+        self.catalog_sip(sip.db_name)
 
-    def save_data(self, sip: SIP) -> None:
+    def save_data(self, sip: SIP, rows: list[int] | None = None) -> None:
         self._execute_with_conn(
             sip.db_name,
-            lambda conn: sip.grid_data.data_as_df.to_sql(
-                DBTableName.DATA, conn, if_exists="replace", index=False, dtype="text"
-            ),
+            lambda conn: self._save_grid_data(conn, DBTableName.DATA, sip.grid_data.data_as_df, rows),
         )
 
     def read_sip_data(self, sip_db_file_name: str) -> pd.DataFrame:
+        import pandas as pd
+
         return self._execute_with_conn(
             sip_db_file_name,
             lambda conn: pd.read_sql(f"SELECT * FROM {DBTableName.DATA}", conn).fillna("").astype(str),
@@ -1,5 +1,6 @@
 import os
 import shutil
+from collections import Counter
 from contextlib import suppress
 
 import pandas as pd
@@ -8,46 +9,82 @@ from src.controller.api_controller import APIController
 from src.controller.sip_creation_controller import create_sip_zip, fill_import_template
 
 from src.utils.base_object import BaseObject
-from src.utils.constants import UI_TEXT_ELEMENTS, ColumnName, RowType
+from src.utils.constants import FOLDER_STRUCTURE_REPORT_MAX_PATHS, UI_TEXT_ELEMENTS, ColumnName, RowType
 from src.utils.data_objects.digital.sip import SIP
+from src.utils.file_scanner import find_missing_files
 
 UI_TEXT = UI_TEXT_ELEMENTS["errors"]["sip"]
 
 
 class FileController(BaseObject):
-    def _is_sip_folder_structure_valid(self, sip_folder_structure: dict, df: pd.DataFrame) -> bool:
-        folder_paths = set()
+    @staticmethod
+    def _check_sip_folder_structure(sip_folder_structure: dict, df: pd.DataFrame) -> dict[str, list[str]]:
+        """Compare the grid against the folder structure on disk.
+
+        Returns the new paths (on disk, not in the grid), the duplicate paths in the grid and the
+        missing paths (in the grid or the structure, but no longer on disk).
+        """
+        grid_counts = Counter(df[ColumnName.PATH_IN_SIP])
+        structure_paths = set()
+
+        new_paths = []
+        duplicate_paths = []
 
         for row in sip_folder_structure.values():
-            path_in_sip, path = row[ColumnName.PATH_IN_SIP], row["path"]
+            path_in_sip = row[ColumnName.PATH_IN_SIP]
+            structure_paths.add(path_in_sip)
 
-            if sum(df[ColumnName.PATH_IN_SIP] == path_in_sip) == 0:
-                self.application.notify_user_signal.emit(
-                    UI_TEXT["folder_structure_new_path_error"]["title"],
-                    UI_TEXT["folder_structure_new_path_error"]["text"].format(path=path),
-                )
-                return False
+            count = grid_counts.get(path_in_sip, 0)
 
-            elif sum(df[ColumnName.PATH_IN_SIP] == path_in_sip) > 1:
-                self.application.notify_user_signal.emit(
-                    UI_TEXT["folder_structure_duplicate_path_error"]["title"],
-                    UI_TEXT["folder_structure_duplicate_path_error"]["text"].format(path_in_sip=path_in_sip),
-                )
-                return False
+            if count == 0:
+                new_paths.append(row["path"])
+            elif count > 1:
+                duplicate_paths.append(path_in_sip)
+
+        missing_paths = [path_in_sip for path_in_sip in grid_counts if path_in_sip not in structure_paths]
+        missing_paths.extend(find_missing_files(row["path"] for row in sip_folder_structure.values()))
+
+        return {
+            "new_paths": new_paths,
+            "missing_paths": missing_paths,
+            "duplicate_paths": duplicate_paths,
+        }
+
+    @staticmethod
+    def _format_folder_structure_report(report: dict[str, list[str]]) -> str:
+        sections = []
+
+        for kind, paths in report.items():
+            if not paths:
+                continue
 
-            folder_paths.add(path_in_sip)
+            lines = [UI_TEXT["folder_structure_error"][kind]]
+            lines.extend(f"'{path}'" for path in paths[:FOLDER_STRUCTURE_REPORT_MAX_PATHS])
 
-        for _, row in df.iterrows():
-            if row[ColumnName.PATH_IN_SIP] not in folder_paths:
-                self.application.notify_user_signal.emit(
-                    UI_TEXT["folder_structure_missing_path_error"]["title"],
-                    UI_TEXT["folder_structure_missing_path_error"]["text"].format(
-                        path_in_sip=row[ColumnName.PATH_IN_SIP]
-                    ),
+            if len(paths) > FOLDER_STRUCTURE_REPORT_MAX_PATHS:
+                lines.append(
+                    UI_TEXT["folder_structure_error"]["more_paths"].format(
+                        count=len(paths) - FOLDER_STRUCTURE_REPORT_MAX_PATHS
+                    )
                 )
-                return False
 
-        return True
+            sections.append("\n".join(lines))
+
+        return "\n\n".join(sections)
+
+    def _is_sip_folder_structure_valid(self, sip_folder_structure: dict, df: pd.DataFrame) -> bool:
+        report = self._check_sip_folder_structure(sip_folder_structure, df)
+
+        if not any(report.values()):
+            return True
+
+        # NOTE: everything that is wrong is reported at once, not just the first problem
+        self.application.notify_user_signal.emit(
+            UI_TEXT["folder_structure_error"]["title"],
+            UI_TEXT["folder_structure_error"]["text"].format(details=self._format_folder_structure_report(report)),
+        )
+
+        return False
 
     @staticmethod
     def _filter_df(df: pd.DataFrame, strip_name_extensions: bool = False) -> pd.DataFrame:
@@ -83,17 +120,6 @@ class FileController(BaseObject):
         if not self._is_sip_folder_structure_valid(sip_folder_structure=filtered_folder_structure, df=df):
             return False
 
-        # Validate all files still exist before zipping
-        for location in filtered_folder_structure.values():
-            file_path = location["path"]
-
-            if not os.path.exists(file_path):
-                self.application.notify_user_signal.emit(
-                    UI_TEXT["folder_structure_missing_path_error"]["title"],
-                    UI_TEXT["folder_structure_missing_path_error"]["text"].format(path_in_sip=file_path),
-                )
-                return False
-
         temp_excel_location = os.path.join(configuration.import_templates_location, "temp.xlsx")
         shutil.copy(src=import_template_location, dst=temp_excel_location)
 
@@ -107,7 +133,9 @@ class FileController(BaseObject):
         }
 
         try:
-            create_sip_zip(temp_excel_location, sip_location, sidecar_location, additional_files)
+            create_sip_zip(
+                temp_excel_location, sip_location, sidecar_location, additional_files, reuse_existing=True
+            )
         except OSError as e:
             self.application.notify_user_signal.emit(
                 UI_TEXT_ELEMENTS["errors"]["file_system"]["disk_error"]["title"],
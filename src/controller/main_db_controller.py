@@ -1,8 +1,12 @@
+import json
 import os
 import sqlite3 as sql
+from dataclasses import dataclass
 
 from natsort import natsorted
 
+from src.controller.db_connections import get_connection_manager
+
 from src.utils.base_object import BaseObject
 from src.utils.constants import (
     MAIN_DB_NAME,
@@ -11,7 +15,29 @@ from src.utils.constants import (
     UNKNOWN_TRANSFORMED,
     DBColumnName,
     DBTableName,
+    SIPType,
 )
+from src.utils.data_objects.series import Series, SeriesStatus
+
+
+# SIP fields that get a column of their own in the catalog, the others are kept as JSON
+SIP_CATALOG_COLUMNS = {
+    DBColumnName.NAME: "text",
+    DBColumnName.STATUS: "text",
+    DBColumnName.ENVIRONMENT_NAME: "text",
+    DBColumnName.SERIES_ID: "text",
+    DBColumnName.SERIES_NAME: "text",
+    DBColumnName.EDEPOT_SIP_ID: "text",
+    DBColumnName.GRID_VALID: "integer",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class SIPCatalogEntry:
+    mtime_ns: int
+    size: int
+    version: str
+    record: dict
 
 
 class MainDBController(BaseObject):
@@ -23,6 +49,9 @@ class MainDBController(BaseObject):
         self._migrate_old_db_name()
         self.create_dossier_table()
         self.create_sip_creator_table()
+        self.create_edepot_sip_index_tables()
+        self.create_sip_catalog_table()
+        self.create_series_catalog_table()
         self.initialize_version_info()
 
     def _migrate_old_db_name(self) -> None:
@@ -34,13 +63,12 @@ class MainDBController(BaseObject):
             os.rename(old_path, new_path)
 
     @property
-    def conn(self) -> sql.Connection:
-        root_path = self.application.configuration.root_path
-
-        return sql.connect(os.path.join(root_path, MAIN_DB_NAME))
+    def db_path(self) -> str:
+        return os.path.join(self.application.configuration.root_path, MAIN_DB_NAME)
 
     def _execute_with_conn(self, func):
-        conn = self.conn
+        pool = get_connection_manager().pool(self.db_path)
+        conn = pool.acquire()
 
         try:
             result = func(conn)
@@ -52,7 +80,7 @@ class MainDBController(BaseObject):
 
             raise
         finally:
-            conn.close()
+            pool.release(conn)
 
     def create_dossier_table(self) -> None:
         self._execute_with_conn(
@@ -78,6 +106,66 @@ class MainDBController(BaseObject):
             )
         )
 
+    def create_edepot_sip_index_tables(self) -> None:
+        def _create(conn: sql.Connection) -> None:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {DBTableName.EDEPOT_SIP_INDEX} (
+                    {DBColumnName.ENVIRONMENT_NAME} text,
+                    {DBColumnName.ORIGINAL_FILENAME} text,
+                    {DBColumnName.EDEPOT_ID} text,
+                    {DBColumnName.ARCHIVE_DATE} text,
+                    PRIMARY KEY ({DBColumnName.ENVIRONMENT_NAME}, {DBColumnName.ORIGINAL_FILENAME})
+                )
+            """
+            )
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {DBTableName.EDEPOT_SIP_INDEX_STATE} (
+                    {DBColumnName.ENVIRONMENT_NAME} text PRIMARY KEY,
+                    {DBColumnName.HIGH_WATER_MARK} text
+                )
+            """
+            )
+
+        self._execute_with_conn(_create)
+
+    def create_sip_catalog_table(self) -> None:
+        self._execute_with_conn(
+            lambda conn: conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {DBTableName.SIP_CATALOG} (
+                    {DBColumnName.DB_TYPE} text,
+                    {DBColumnName.DB_PATH} text,
+                    {DBColumnName.MTIME_NS} integer,
+                    {DBColumnName.SIZE} integer,
+                    {DBColumnName.VERSION} text,
+                    {", ".join(f"{column} {data_type}" for column, data_type in SIP_CATALOG_COLUMNS.items())},
+                    {DBColumnName.DETAILS} text,
+                    PRIMARY KEY ({DBColumnName.DB_TYPE}, {DBColumnName.DB_PATH})
+                )
+            """
+            )
+        )
+
+    def create_series_catalog_table(self) -> None:
+        self._execute_with_conn(
+            lambda conn: conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {DBTableName.SERIES_CATALOG} (
+                    {DBColumnName.ENVIRONMENT_NAME} text,
+                    {DBColumnName.SERIES_ID} text,
+                    {DBColumnName.POSITION} integer,
+                    {DBColumnName.NAME} text,
+                    {DBColumnName.STATUS} text,
+                    {DBColumnName.VALID_FROM} text,
+                    {DBColumnName.VALID_TO} text,
+                    PRIMARY KEY ({DBColumnName.ENVIRONMENT_NAME}, {DBColumnName.SERIES_ID})
+                )
+            """
+            )
+        )
+
     def initialize_version_info(self) -> None:
         def _initialize(conn: sql.Connection) -> None:
             row = conn.execute(
@@ -148,3 +236,188 @@ class MainDBController(BaseObject):
                 [(os.path.normpath(p),) for p in paths],
             )
         )
+
+    # e-depot SIP index: OriginalFilename -> e-depot id, per environment
+    def read_edepot_id(self, environment_name: str, file_name: str) -> str | None:
+        def _read(conn: sql.Connection) -> str | None:
+            row = conn.execute(
+                f"SELECT {DBColumnName.EDEPOT_ID} FROM {DBTableName.EDEPOT_SIP_INDEX} "
+                f"WHERE {DBColumnName.ENVIRONMENT_NAME} = ? AND {DBColumnName.ORIGINAL_FILENAME} = ?",
+                (environment_name, file_name),
+            ).fetchone()
+
+            return row[0] if row is not None else None
+
+        return self._execute_with_conn(_read)
+
+    def read_edepot_index_high_water_mark(self, environment_name: str) -> str | None:
+        def _read(conn: sql.Connection) -> str | None:
+            row = conn.execute(
+                f"SELECT {DBColumnName.HIGH_WATER_MARK} FROM {DBTableName.EDEPOT_SIP_INDEX_STATE} "
+                f"WHERE {DBColumnName.ENVIRONMENT_NAME} = ?",
+                (environment_name,),
+            ).fetchone()
+
+            return row[0] if row is not None else None
+
+        return self._execute_with_conn(_read)
+
+    def write_edepot_index(
+        self, environment_name: str, entries: list[tuple[str, str, str | None]], high_water_mark: str | None
+    ) -> None:
+        """Store (original filename, e-depot id, archive date) entries and the new high-water mark together.
+
+        The newest record wins per filename: one without an archive date (not archived yet) always
+        replaces the stored one, an archived record only replaces an older one or its own pending entry.
+        """
+
+        def _write(conn: sql.Connection) -> None:
+            conn.executemany(
+                f"""
+                INSERT INTO {DBTableName.EDEPOT_SIP_INDEX}
+                ({DBColumnName.ENVIRONMENT_NAME}, {DBColumnName.ORIGINAL_FILENAME},
+                 {DBColumnName.EDEPOT_ID}, {DBColumnName.ARCHIVE_DATE})
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT ({DBColumnName.ENVIRONMENT_NAME}, {DBColumnName.ORIGINAL_FILENAME}) DO UPDATE SET
+                    {DBColumnName.EDEPOT_ID} = excluded.{DBColumnName.EDEPOT_ID},
+                    {DBColumnName.ARCHIVE_DATE} = excluded.{DBColumnName.ARCHIVE_DATE}
+                WHERE excluded.{DBColumnName.ARCHIVE_DATE} IS NULL
+                    OR excluded.{DBColumnName.EDEPOT_ID} = {DBColumnName.EDEPOT_ID}
+                    OR excluded.{DBColumnName.ARCHIVE_DATE} >= {DBColumnName.ARCHIVE_DATE}
+            """,
+                [(environment_name, *entry) for entry in entries],
+            )
+
+            if high_water_mark is not None:
+                conn.execute(
+                    f"""
+                    INSERT INTO {DBTableName.EDEPOT_SIP_INDEX_STATE}
+                    ({DBColumnName.ENVIRONMENT_NAME}, {DBColumnName.HIGH_WATER_MARK})
+                    VALUES (?, ?)
+                    ON CONFLICT ({DBColumnName.ENVIRONMENT_NAME}) DO UPDATE SET
+                        {DBColumnName.HIGH_WATER_MARK} = excluded.{DBColumnName.HIGH_WATER_MARK}
+                """,
+                    (environment_name, high_water_mark),
+                )
+
+        self._execute_with_conn(_write)
+
+    def delete_edepot_index_entry(self, environment_name: str, file_name: str) -> None:
+        self._execute_with_conn(
+            lambda conn: conn.execute(
+                f"DELETE FROM {DBTableName.EDEPOT_SIP_INDEX} "
+                f"WHERE {DBColumnName.ENVIRONMENT_NAME} = ? AND {DBColumnName.ORIGINAL_FILENAME} = ?",
+                (environment_name, file_name),
+            )
+        )
+
+    # SIP catalog: what was read from every SIP DB, so the DBs that did not change since don't have to be opened
+    def read_sip_catalog(self, db_type: SIPType) -> dict[str, SIPCatalogEntry]:
+        def _read(conn: sql.Connection) -> dict[str, SIPCatalogEntry]:
+            rows = conn.execute(
+                f"SELECT {DBColumnName.DB_PATH}, {DBColumnName.MTIME_NS}, {DBColumnName.SIZE}, "
+                f"{DBColumnName.VERSION}, {', '.join(SIP_CATALOG_COLUMNS)}, {DBColumnName.DETAILS} "
+                f"FROM {DBTableName.SIP_CATALOG} WHERE {DBColumnName.DB_TYPE} = ?",
+                (db_type,),
+            )
+
+            return {
+                db_path: SIPCatalogEntry(
+                    mtime_ns=mtime_ns,
+                    size=size,
+                    version=version,
+                    record=dict(zip(SIP_CATALOG_COLUMNS, values[:-1])) | json.loads(values[-1]),
+                )
+                for db_path, mtime_ns, size, version, *values in rows
+            }
+
+        return self._execute_with_conn(_read)
+
+    def write_sip_catalog_entry(self, db_type: SIPType, db_path: str, entry: SIPCatalogEntry) -> None:
+        details = {key: value for key, value in entry.record.items() if key not in SIP_CATALOG_COLUMNS}
+
+        self._execute_with_conn(
+            lambda conn: conn.execute(
+                f"INSERT OR REPLACE INTO {DBTableName.SIP_CATALOG} "
+                f"VALUES ({', '.join('?' * (len(SIP_CATALOG_COLUMNS) + 6))})",
+                (
+                    db_type,
+                    db_path,
+                    entry.mtime_ns,
+                    entry.size,
+                    entry.version,
+                    *(entry.record.get(column) for column in SIP_CATALOG_COLUMNS),
+                    json.dumps(details),
+                ),
+            )
+        )
+
+    def delete_sip_catalog_entries(self, db_type: SIPType, db_paths: list[str]) -> None:
+        if not db_paths:
+            return
+
+        self._execute_with_conn(
+            lambda conn: conn.executemany(
+                f"DELETE FROM {DBTableName.SIP_CATALOG} "
+                f"WHERE {DBColumnName.DB_TYPE} = ? AND {DBColumnName.DB_PATH} = ?",
+                [(db_type, db_path) for db_path in db_paths],
+            )
+        )
+
+    # Series catalog: the last downloaded series of every environment, served at startup until they are refreshed
+    def read_series_catalog(self, environment_name: str) -> list[Series]:
+        def _read(conn: sql.Connection) -> list[Series]:
+            rows = conn.execute(
+                f"SELECT {DBColumnName.SERIES_ID}, {DBColumnName.NAME}, {DBColumnName.STATUS}, "
+                f"{DBColumnName.VALID_FROM}, {DBColumnName.VALID_TO} "
+                f"FROM {DBTableName.SERIES_CATALOG} WHERE {DBColumnName.ENVIRONMENT_NAME} = ? "
+                f"ORDER BY {DBColumnName.POSITION}",
+                (environment_name,),
+            )
+
+            return [
+                Series(
+                    _id=series_id,
+                    name=name,
+                    status=SeriesStatus(status),
+                    valid_from=Series.datetime_from_str(valid_from),
+                    valid_to=Series.datetime_from_str(valid_to),
+                )
+                for series_id, name, status, valid_from, valid_to in rows
+            ]
+
+        return self._execute_with_conn(_read)
+
+    def write_series_catalog(self, environment_name: str, series: list[Series]) -> None:
+        """Replace the stored series of environment_name."""
+
+        def _write(conn: sql.Connection) -> None:
+            conn.execute(
+                f"DELETE FROM {DBTableName.SERIES_CATALOG} WHERE {DBColumnName.ENVIRONMENT_NAME} = ?",
+                (environment_name,),
+            )
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {DBTableName.SERIES_CATALOG} VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        environment_name,
+                        s._id,
+                        position,
+                        s.name,
+                        s.status.value,
+                        Series.str_from_datetime(s.valid_from) if s.valid_from is not None else None,
+                        Series.str_from_datetime(s.valid_to) if s.valid_to is not None else None,
+                    )
+                    for position, s in enumerate(series)
+                ],
+            )
+
+        self._execute_with_conn(_write)
+
+    def delete_series_catalog(self, environment_name: str) -> None:
+        self._execute_with_conn(
+            lambda conn: conn.execute(
+                f"DELETE FROM {DBTableName.SERIES_CATALOG} WHERE {DBColumnName.ENVIRONMENT_NAME} = ?",
+                (environment_name,),
+            )
+        )
@@ -1,12 +1,15 @@
+from __future__ import annotations
+
 import os
 import re
-
-import pandas as pd
-from openpyxl import load_workbook
+from typing import TYPE_CHECKING
 
 from src.utils.base_object import ApplicationMixin
 from src.utils.constants import ColumnName
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 # NOTE: this file is not using constants like other files are
 # But since this is such a specific implementation, we leave it as-is for now
 
@@ -72,6 +75,8 @@ class BestandsControleController(ApplicationMixin):
             )
             return False
 
+        from openpyxl import load_workbook
+
         wb = load_workbook(
             self.controle_list_path,
             read_only=True,
@@ -140,6 +145,9 @@ class BestandsControleController(ApplicationMixin):
 
         self.valid = True
 
+        import pandas as pd
+        from openpyxl import load_workbook
+
         wb = load_workbook(
             self.controle_list_path,
             read_only=True,
@@ -5,8 +5,6 @@ from __future__ import annotations
 import sqlite3 as sql
 from collections.abc import Callable
 
-import pandas as pd
-
 from src.controller.db_versioning_common import run_db_migrations as _run_db_migrations
 
 from src.utils.constants import (
@@ -67,6 +65,8 @@ def migrate_to_3_0(conn: sql.Connection) -> None:
     - ``sip`` and ``sip_creator`` tables are created
     - Location column suffixes are normalized
     """
+    import pandas as pd
+
     # 1. Find and standardize the Overdrachtslijst table
     main_table = _find_overdrachtslijst_table(conn)
 
@@ -187,6 +187,7 @@ def migrate_to_3_0(conn: sql.Connection) -> None:
 
 def _migrate_location_column_suffixes(conn: sql.Connection) -> None:
     """Rename ``_N`` suffixed location columns to trailing-space convention."""
+    import pandas as pd
     from src.utils.constants import LOCATION_COLUMNS
 
     all_tables = [name for name, *_ in conn.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()]
@@ -1,7 +1,8 @@
+from __future__ import annotations
+
 import os
 import sqlite3 as sql
-
-import pandas as pd
+from typing import TYPE_CHECKING
 
 from src.controller.base_sip_db_controller import BaseSIPDBController
 from src.controller.migration.db_versioning import run_db_migrations
@@ -10,13 +11,18 @@ from src.utils.constants import (
     UI_TEXT_ELEMENTS,
     DBColumnName,
     DBTableName,
+    SIPType,
 )
 from src.utils.data_objects.migration.sip import MigrationSIP
 from src.utils.data_objects.sip_status import SIPStatus
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class MigrationSIPDBController(BaseSIPDBController):
     SIP_TYPE = MigrationSIP
+    CATALOG_TYPE = SIPType.MIGRATIE
 
     def __init__(self) -> None:
         super().__init__()
@@ -82,31 +88,51 @@ class MigrationSIPDBController(BaseSIPDBController):
 
         return True
 
-    def read_sip_db(self, sip_db_file_name: str) -> MigrationSIP:
-        def _read(conn: sql.Connection) -> MigrationSIP:
-            columns = [col_name for _, col_name, *_ in conn.execute(f"PRAGMA table_info({DBTableName.SIP});").fetchall()]
-            has_grid_valid = DBColumnName.GRID_VALID in columns
+    def _read_sip_record(self, conn: sql.Connection, db_file_name: str) -> dict:
+        columns = self.pool(db_file_name).table_columns(conn, DBTableName.SIP)
+        record_columns = [DBColumnName.NAME, DBColumnName.STATUS, DBColumnName.ENVIRONMENT_NAME]
+
+        if DBColumnName.GRID_VALID in columns:
+            record_columns.append(DBColumnName.GRID_VALID)
+
+        result = conn.execute(f"SELECT {', '.join(record_columns)} FROM {DBTableName.SIP};").fetchone()
 
-            result = conn.execute(
-                f"SELECT {DBColumnName.NAME}, {DBColumnName.STATUS}, {DBColumnName.ENVIRONMENT_NAME}"
-                + (f", {DBColumnName.GRID_VALID}" if has_grid_valid else "")
-                + f" FROM {DBTableName.SIP};"
-            ).fetchone()
+        record = dict(zip(record_columns, result))
+        record[DBTableName.TABLES] = conn.execute(
+            f'SELECT {DBColumnName.TABLE_NAME}, "{DBColumnName.URI_SERIEREGISTER}", '
+            f"{DBColumnName.EDEPOT_ID}, {DBColumnName.STATUS} "
+            f"FROM {DBTableName.TABLES}"
+        ).fetchall()
 
-            name, status, environment_name = result[:3]
-            grid_valid = bool(result[3]) if has_grid_valid else False
+        return record
 
-            sip = MigrationSIP()
-            sip.force_set_name(name)
-            sip.set_status(SIPStatus[status])
-            sip.environment = self.application.configuration.get_environment(environment_name)
-            sip.set_grid_valid(grid_valid)
+    def _sip_from_record(self, record: dict) -> MigrationSIP:
+        sip = MigrationSIP()
+        sip.force_set_name(record[DBColumnName.NAME])
+        sip.set_status(SIPStatus[record[DBColumnName.STATUS]])
+        sip.environment = self.application.configuration.get_environment(record[DBColumnName.ENVIRONMENT_NAME])
+        sip.set_grid_valid(bool(record.get(DBColumnName.GRID_VALID)))
 
-            return sip
+        for table_name, uri_serieregister, edepot_id, status_name in record[DBTableName.TABLES]:
+            try:
+                sip.series_statuses[table_name] = SIPStatus[status_name]
+            except KeyError:
+                sip.series_statuses[table_name] = SIPStatus.IN_PROGRESS
 
-        return self._execute_with_conn(sip_db_file_name, _read)
+            if edepot_id:
+                sip.series_edepot_ids[table_name] = edepot_id
+
+            series_id = uri_serieregister.rsplit("/", 1)[-1] if uri_serieregister else ""
+            if series_id:
+                sip.series_zip_names[table_name] = f"{series_id}-{sip.name}-SIPC.zip"
+
+        sip.derive_overall_status()
+
+        return sip
 
     def read_main_data(self, sip_db_file_name: str) -> pd.DataFrame:
+        import pandas as pd
+
         return self._execute_with_conn(
             sip_db_file_name,
             lambda conn: pd.read_sql(f"SELECT * FROM {DBTableName.OVERDRACHTSLIJST}", conn).fillna("").astype(str),
@@ -123,6 +149,8 @@ class MigrationSIPDBController(BaseSIPDBController):
         )
 
     def read_series_data(self, sip_db_file_name: str, table_name: str) -> pd.DataFrame:
+        import pandas as pd
+
         return self._execute_with_conn(
             sip_db_file_name, lambda conn: pd.read_sql(f"SELECT * FROM [{table_name}]", conn).fillna("").astype(str)
         )
@@ -139,6 +167,7 @@ class MigrationSIPDBController(BaseSIPDBController):
             df.to_sql(table_name, conn, index=False, dtype="text")
 
         self._execute_with_conn(sip.db_name, _create)
+        self.catalog_sip(sip.db_name)
 
     def update_series_status(self, sip: MigrationSIP, table_name: str, status: SIPStatus, edepot_id: str = "") -> None:
         def _update(conn: sql.Connection) -> None:
@@ -149,22 +178,12 @@ class MigrationSIPDBController(BaseSIPDBController):
             )
 
         self._execute_with_conn(sip.db_name, _update)
+        self.catalog_sip(sip.db_name)
 
-    def read_series_statuses(self, sip_db_file_name: str) -> dict[str, tuple[str, str]]:
-        def _read(conn: sql.Connection) -> dict[str, tuple[str, str]]:
-            rows = conn.execute(
-                f"SELECT {DBColumnName.TABLE_NAME}, {DBColumnName.STATUS}, "
-                f"{DBColumnName.EDEPOT_ID} FROM {DBTableName.TABLES}"
-            ).fetchall()
-
-            return {name: (status, edepot_id) for name, status, edepot_id in rows}
-
-        return self._execute_with_conn(sip_db_file_name, _read)
-
-    def save_series_data(self, sip: MigrationSIP, table_name: str, df: pd.DataFrame) -> None:
-        self._execute_with_conn(
-            sip.db_name, lambda conn: df.to_sql(table_name, conn, if_exists="replace", index=False, dtype="text")
-        )
+    def save_series_data(
+        self, sip: MigrationSIP, table_name: str, df: pd.DataFrame, rows: list[int] | None = None
+    ) -> None:
+        self._execute_with_conn(sip.db_name, lambda conn: self._save_grid_data(conn, table_name, df, rows))
 
     def delete_series_table(self, sip: MigrationSIP, table_name: str) -> None:
         def _delete(conn: sql.Connection) -> None:
@@ -175,17 +194,19 @@ class MigrationSIPDBController(BaseSIPDBController):
             )
 
         self._execute_with_conn(sip.db_name, _delete)
+        self.catalog_sip(sip.db_name)
 
-    def save_main_data(self, sip: MigrationSIP, df: pd.DataFrame) -> None:
+    def save_main_data(self, sip: MigrationSIP, df: pd.DataFrame, rows: list[int] | None = None) -> None:
         self._execute_with_conn(
-            sip.db_name,
-            lambda conn: df.to_sql(DBTableName.OVERDRACHTSLIJST, conn, if_exists="replace", index=False, dtype="text"),
+            sip.db_name, lambda conn: self._save_grid_data(conn, DBTableName.OVERDRACHTSLIJST, df, rows)
         )
 
     def add_columns_to_series_table(
         self, sip: MigrationSIP, table_name: str, columns: list[str], after_column: str
     ) -> None:
         def _add_columns(conn: sql.Connection) -> None:
+            import pandas as pd
+
             df = pd.read_sql(f"SELECT * FROM [{table_name}]", conn).fillna("").astype(str)
 
             col_loc = df.columns.get_loc(after_column)
@@ -204,7 +225,7 @@ class MigrationSIPDBController(BaseSIPDBController):
             return
 
         def _persist(conn: sql.Connection) -> None:
-            columns = [col_name for _, col_name, *_ in conn.execute(f"PRAGMA table_info({DBTableName.SIP});").fetchall()]
+            columns = self.pool(sip.db_name).table_columns(conn, DBTableName.SIP)
 
             if DBColumnName.GRID_VALID in columns:
                 conn.execute(
@@ -228,6 +249,7 @@ class MigrationSIPDBController(BaseSIPDBController):
                 )
 
         self._execute_with_conn(sip.db_name, _persist)
+        self.catalog_sip(sip.db_name)
 
     def _validate_db(self, sip_db_file_name: str) -> bool:
         def _validate(conn: sql.Connection) -> bool:
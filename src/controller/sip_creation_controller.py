@@ -1,17 +1,47 @@
 """Shared SIP creation utilities for all application types.
 
 Provides the common operations for building SIP ZIP files:
-- Filling an import template with grid data
+- Filling an import template with grid data (the Details sheet XML is streamed
+  into a copy of the template, instead of going through openpyxl cell by cell)
 - Creating a ZIP with Metadata.xlsx (and optional additional files)
 - Generating the MD5 sidecar XML
+
+Dossier files are deflated on a thread pool and written in their original order,
+so the resulting archive is deterministic. Already-compressed formats are stored.
+When a SIP is rebuilt, members whose source file did not change are copied over
+from the previous ZIP without being decompressed or compressed again.
+
+The ZIP is written through a hashing wrapper, so the sidecar MD5 is known as
+soon as the archive is closed, without reading the (possibly multi-GB) file back.
 """
 
 import hashlib
 import os
+import posixpath
 import re
+import struct
 import zipfile
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from functools import partial
+from itertools import chain
+from typing import Any
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
 
 from openpyxl import load_workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.utils.exceptions import IllegalCharacterError
+
+from src.utils.constants import (
+    ZIP_COMPRESSION_WORKERS,
+    ZIP_PARALLEL_COMPRESSION_MAX_FILE_SIZE,
+    ZIP_STORED_EXTENSIONS,
+)
 
 SIDECAR_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
 <mhs:Sidecar xmlns:mhs="https://zeticon.mediahaven.com/metadata/20.3/mhs/" version="20.3" xmlns:mh="https://zeticon.mediahaven.com/metadata/20.3/mh/">
@@ -22,41 +52,507 @@ SIDECAR_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
 
 COLUMN_NAME_CLEANUP_REGEX = re.compile(r"(.*)(\.\d+| +)$")
 
+_COPY_CHUNK_SIZE = 1024 * 1024
+_LOCAL_HEADER_SIZE = 30
+_DATA_DESCRIPTOR_FLAG = 0x08
+_ZIP64_EXTRA_ID = 0x0001
+
+_SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_RELATIONSHIP_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PACKAGE_RELATIONSHIP_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_OFFICE_DOCUMENT_RELATIONSHIP = f"{_RELATIONSHIP_NS}/officeDocument"
+_SHEET_DATA_REGEX = re.compile(r"<sheetData\b[^>]*?(?:/>|>.*?</sheetData>)", re.DOTALL)
+_SHEET_DATA_OPEN_REGEX = re.compile(r"<sheetData\b([^>]*?)/?>")
+_ROW_REGEX = re.compile(r"<row\b([^>]*?)(?:/>|>(.*?)</row>)", re.DOTALL)
+_CELL_REGEX = re.compile(r"<c\b([^>]*?)(?:/>|>.*?</c>)", re.DOTALL)
+_ATTRIBUTE_REGEX = re.compile(r'\b([\w:]+)="([^"]*)"')
+_DIMENSION_REGEX = re.compile(r"<dimension\b[^>]*/>")
+_SHEET_ROWS_PER_WRITE = 500
+
+
+class _HashingWriter:
+    """Write-only file wrapper that feeds every written byte into an MD5 hash.
+
+    It deliberately has no ``seek``: zipfile then writes a data descriptor after
+    each member instead of going back to patch its local header, so the bytes
+    that were hashed are exactly the bytes that end up on disk.
+    """
 
-def fill_import_template(df, template_path: str, output_path: str) -> None:
-    """Fill an import template Excel file with grid data.
+    def __init__(self, fp) -> None:
+        self._fp = fp
+        self._md5 = hashlib.md5()
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._fp.write(data)
+        self._md5.update(data)
+
+        size = memoryview(data).nbytes
+        self._position += size
+
+        return size
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        self._fp.flush()
 
-    Opens the template, writes cleaned column names and data rows to the
-    'Details' sheet, and saves to output_path.
+    def hexdigest(self) -> str:
+        return self._md5.hexdigest()
+
+
+def _write_sidecar(sidecar_location: str, md5: str) -> None:
+    with open(sidecar_location, "w", encoding="utf-8") as f:
+        f.write(SIDECAR_TEMPLATE.format(md5=md5))
+
+
+def _compress_type_for(archive_name: str) -> int:
+    extension = os.path.splitext(archive_name)[1].lower()
+
+    return zipfile.ZIP_STORED if extension in ZIP_STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+def _compress_member(disk_path: str, archive_name: str, compress_type: int) -> tuple[zipfile.ZipInfo, bytes]:
+    """Compress a file in memory, producing the same stream zipfile itself would write.
+
+    Runs on a worker thread; zlib releases the GIL while compressing.
     """
-    wb = load_workbook(template_path)
+    zinfo = zipfile.ZipInfo.from_file(disk_path, archive_name)
+    zinfo.compress_type = compress_type
+
+    compressor = (
+        zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        if compress_type == zipfile.ZIP_DEFLATED
+        else None
+    )
+    chunks = []
+    crc = 0
+    file_size = 0
+
+    with open(disk_path, "rb") as f:
+        while chunk := f.read(_COPY_CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            chunks.append(compressor.compress(chunk) if compressor else chunk)
+
+    if compressor:
+        chunks.append(compressor.flush())
+
+    data = b"".join(chunks)
+
+    zinfo.CRC = crc
+    zinfo.file_size = file_size
+    zinfo.compress_size = len(data)
+
+    return zinfo, data
+
+
+def _write_raw_member(zfile: zipfile.ZipFile, zinfo: zipfile.ZipInfo, write_body: Callable[[Any], None]) -> None:
+    """Append a member whose compressed bytes are produced by write_body.
+
+    zipfile has no public API for this (ZipFile.open(zinfo, "w") always compresses what it
+    is given), so the local header is written by hand and the member is registered the
+    same way ZipFile.write does it. CRC and sizes are known up front, so no data
+    descriptor is needed.
+
+    NOTE: this relies on ZipFile internals (_writecheck, _didModify, start_dir), the
+    round trip is covered by tests/test_sip_creation_controller.py
+    """
+    zfile._writecheck(zinfo)
+    zfile._didModify = True
+
+    zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+
+    zinfo.header_offset = zfile.fp.tell()
+    zfile.fp.write(zinfo.FileHeader(zip64))
+    write_body(zfile.fp)
+
+    zfile.filelist.append(zinfo)
+    zfile.NameToInfo[zinfo.filename] = zinfo
+    zfile.start_dir = zfile.fp.tell()
+
+
+def _write_compressed_member(zfile: zipfile.ZipFile, zinfo: zipfile.ZipInfo, data: bytes) -> None:
+    _write_raw_member(zfile, zinfo, lambda fp: fp.write(data))
+
+
+def _without_zip64_extra(extra: bytes) -> bytes:
+    """Drop the zip64 record from an extra field, zipfile adds a fresh one when it is needed."""
+    fields = []
+    position = 0
+
+    while position + 4 <= len(extra):
+        header_id, size = struct.unpack("<HH", extra[position : position + 4])
+        end = position + 4 + size
+
+        if header_id != _ZIP64_EXTRA_ID:
+            fields.append(extra[position:end])
+
+        position = end
+
+    return b"".join(fields)
+
+
+def _copy_member(zfile: zipfile.ZipFile, source: zipfile.ZipFile, source_info: zipfile.ZipInfo, zinfo=None) -> None:
+    """Copy a member's compressed bytes from source without decompressing them.
+
+    zinfo optionally overrides the metadata (name, timestamps) written for the copy.
+    The extra field (e.g. extended timestamps, unicode paths) is kept as-is.
+    """
+    source.fp.seek(source_info.header_offset)
+    header = source.fp.read(_LOCAL_HEADER_SIZE)
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    data_offset = source_info.header_offset + _LOCAL_HEADER_SIZE + name_length + extra_length
+
+    target_info = zipfile.ZipInfo(source_info.filename, source_info.date_time)
+    target_info.external_attr = source_info.external_attr
+    target_info.create_system = source_info.create_system
+    target_info.extra = _without_zip64_extra(source_info.extra)
+
+    if zinfo is not None:
+        target_info.date_time = zinfo.date_time
+        target_info.external_attr = zinfo.external_attr
+
+    target_info.compress_type = source_info.compress_type
+    target_info.flag_bits = source_info.flag_bits & ~_DATA_DESCRIPTOR_FLAG
+    target_info.CRC = source_info.CRC
+    target_info.file_size = source_info.file_size
+    target_info.compress_size = source_info.compress_size
+
+    def _copy_body(fp) -> None:
+        source.fp.seek(data_offset)
+        remaining = source_info.compress_size
+
+        while remaining > 0:
+            chunk = source.fp.read(min(_COPY_CHUNK_SIZE, remaining))
+
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated member '{source_info.filename}'")
+
+            fp.write(chunk)
+            remaining -= len(chunk)
+
+    _write_raw_member(zfile, target_info, _copy_body)
+
+
+def _crc32_of(disk_path: str) -> int:
+    crc = 0
+
+    with open(disk_path, "rb") as f:
+        while chunk := f.read(_COPY_CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+
+    return crc
+
+
+def _find_unchanged_member(
+    previous: zipfile.ZipFile | None, archive_name: str, disk_path: str
+) -> tuple[zipfile.ZipInfo, zipfile.ZipInfo] | None:
+    """Return (previous member, fresh ZipInfo) if disk_path did not change since previous was built.
+
+    A file is unchanged when its size and the CRC of its content match the stored member.
+    The mtime is not trusted: the ZIP only keeps it to 2 seconds, and copies (cp -p, restore
+    tools) keep it while the content changes. Hashing is still much cheaper than compressing.
+    """
+    if previous is None:
+        return None
 
     try:
-        ws = wb["Details"]
+        previous_info = previous.getinfo(archive_name)
+        zinfo = zipfile.ZipInfo.from_file(disk_path, archive_name)
+    except (KeyError, OSError):
+        return None
+
+    if zinfo.is_dir() or previous_info.is_dir():
+        return None
+
+    # A policy change (e.g. stored vs deflated) means the member has to be rebuilt
+    if previous_info.compress_type != _compress_type_for(archive_name):
+        return None
+
+    if zinfo.file_size != previous_info.file_size:
+        return None
+
+    if _crc32_of(disk_path) != previous_info.CRC:
+        return None
+
+    return previous_info, zinfo
+
+
+def _open_previous_zip(sip_location: str) -> zipfile.ZipFile | None:
+    if not os.path.exists(sip_location):
+        return None
+
+    try:
+        return zipfile.ZipFile(sip_location, "r")
+    except (zipfile.BadZipFile, OSError):
+        return None
+
+
+def _write_additional_files(
+    zfile: zipfile.ZipFile, additional_files: dict[str, str], previous: zipfile.ZipFile | None = None
+) -> None:
+    """Write dossier files to the ZIP, deflating them in parallel.
+
+    Members are always written in the order of additional_files, whatever order the
+    pool finishes them in. Only a bounded number of compressed members is held in
+    memory at a time. Files that are unchanged compared to the previous ZIP are copied
+    over as-is, without being read or compressed again.
+    """
+    max_pending = ZIP_COMPRESSION_WORKERS * 2
+
+    def _write(entry: Future | Callable[[], None]) -> None:
+        if isinstance(entry, Future):
+            _write_compressed_member(zfile, *entry.result())
+            return
+
+        entry()
+
+    with ThreadPoolExecutor(max_workers=ZIP_COMPRESSION_WORKERS) as executor:
+        pending: deque[Future | Callable[[], None]] = deque()
+
+        for archive_name, disk_path in additional_files.items():
+            compress_type = _compress_type_for(archive_name)
+            unchanged = _find_unchanged_member(previous, archive_name, disk_path)
+
+            if unchanged is not None:
+                pending.append(partial(_copy_member, zfile, previous, *unchanged))
+            elif os.path.isfile(disk_path) and os.path.getsize(disk_path) <= ZIP_PARALLEL_COMPRESSION_MAX_FILE_SIZE:
+                pending.append(executor.submit(_compress_member, disk_path, archive_name, compress_type))
+            else:
+                # Directories and very large files are streamed by zipfile itself
+                pending.append(partial(zfile.write, disk_path, archive_name, compress_type=compress_type))
+
+            while len(pending) > max_pending:
+                _write(pending.popleft())
+
+        while pending:
+            _write(pending.popleft())
 
-        for col_index, col_name in enumerate(df.columns):
-            clean_name = col_name.strip()
-            match = COLUMN_NAME_CLEANUP_REGEX.match(clean_name)
 
-            if match:
-                clean_name = match.group(1)
+def _find_sheet_part(template: zipfile.ZipFile, sheet_name: str) -> str | None:
+    """Return the package path of the worksheet called sheet_name, e.g. 'xl/worksheets/sheet1.xml'."""
+    try:
+        package_rels = ElementTree.fromstring(template.read("_rels/.rels"))
+        workbook_part = next(
+            rel.get("Target").lstrip("/")
+            for rel in package_rels.iter(f"{{{_PACKAGE_RELATIONSHIP_NS}}}Relationship")
+            if rel.get("Type") == _OFFICE_DOCUMENT_RELATIONSHIP
+        )
+
+        workbook_dir, workbook_file = posixpath.split(workbook_part)
+        workbook = ElementTree.fromstring(template.read(workbook_part))
+        workbook_rels = ElementTree.fromstring(
+            template.read(posixpath.join(workbook_dir, "_rels", f"{workbook_file}.rels"))
+        )
+    except (KeyError, StopIteration, ElementTree.ParseError):
+        return None
+
+    relationship_id = next(
+        (
+            sheet.get(f"{{{_RELATIONSHIP_NS}}}id")
+            for sheet in workbook.iter(f"{{{_SPREADSHEET_NS}}}sheet")
+            if sheet.get("name") == sheet_name
+        ),
+        None,
+    )
+
+    for rel in workbook_rels.iter(f"{{{_PACKAGE_RELATIONSHIP_NS}}}Relationship"):
+        if rel.get("Id") == relationship_id:
+            target = rel.get("Target")
+
+            if target.startswith("/"):
+                return target.lstrip("/")
+
+            return posixpath.normpath(posixpath.join(workbook_dir, target))
+
+    return None
+
+
+def _parse_template_rows(
+    sheet_data: str,
+) -> dict[int, tuple[str, dict[str, str], dict[int, tuple[str, str | None]]]] | None:
+    """Index the rows already present in the template's sheetData.
+
+    Returns {row number: (row xml, row attributes, {column: (cell xml, style)})}, or None
+    when the sheet uses a layout we do not rewrite ourselves (e.g. cells without a reference).
+    """
+    rows = {}
+
+    for row_match in _ROW_REGEX.finditer(sheet_data):
+        attributes = dict(_ATTRIBUTE_REGEX.findall(row_match.group(1)))
+
+        if "r" not in attributes:
+            return None
+
+        cells = {}
+
+        for cell_match in _CELL_REGEX.finditer(row_match.group(2) or ""):
+            cell_attributes = dict(_ATTRIBUTE_REGEX.findall(cell_match.group(1)))
+            reference = cell_attributes.get("r")
+
+            if reference is None:
+                return None
+
+            cells[column_index_from_string(reference.rstrip("0123456789"))] = (
+                cell_match.group(0),
+                cell_attributes.get("s"),
+            )
+
+        rows[int(attributes["r"])] = (row_match.group(0), attributes, cells)
+
+    return rows
+
+
+def _render_rows(rows, template_rows, column_count: int) -> Iterator[str]:
+    """Yield the sheetData rows: the grid data merged over the template's own rows.
+
+    Cells written by us keep the template's style, template cells to the right of the
+    data are kept as they are, and template rows below the data are copied verbatim.
+    """
+    letters = [get_column_letter(i + 1) for i in range(column_count)]
+    row_number = 0
+
+    for row_number, values in enumerate(rows, start=1):
+        _, attributes, template_cells = template_rows.pop(row_number, ("", {}, {}))
+        row_attributes = "".join(f' {k}="{v}"' for k, v in attributes.items() if k not in ("r", "spans"))
+        cells = []
+
+        for col_index, value in enumerate(values, start=1):
+            if ILLEGAL_CHARACTERS_RE.search(value):
+                raise IllegalCharacterError(f"{value} cannot be used in worksheets.")
+
+            style = template_cells.get(col_index, (None, None))[1]
+            style_attribute = f' s="{style}"' if style is not None else ""
+            cells.append(
+                f'<c r="{letters[col_index - 1]}{row_number}" t="inlineStr"{style_attribute}>'
+                f'<is><t xml:space="preserve">{escape(value)}</t></is></c>'
+            )
+
+        cells.extend(xml for col_index, (xml, _) in sorted(template_cells.items()) if col_index > column_count)
+
+        yield f'<row r="{row_number}"{row_attributes}>{"".join(cells)}</row>'
+
+    for template_row_number in sorted(template_rows):
+        if template_row_number > row_number:
+            yield template_rows[template_row_number][0]
+
+
+def _fill_details_sheet_xml(
+    template: zipfile.ZipFile, sheet_part: str, header: list[str], df, output_path: str
+) -> bool:
+    """Write output_path as a copy of the template with the grid data streamed into sheet_part.
+
+    Returns False, without writing anything, if the sheet's XML is not laid out the way we expect.
+    """
+    sheet_xml = template.read(sheet_part).decode("utf-8")
+    sheet_data_match = _SHEET_DATA_REGEX.search(sheet_xml)
+
+    if sheet_data_match is None:
+        return False
+
+    template_rows = _parse_template_rows(sheet_data_match.group(0))
+
+    if template_rows is None:
+        return False
+
+    last_row = max([len(df) + 1, *template_rows])
+    last_column = max([len(header), 1, *(col for _, _, cells in template_rows.values() for col in cells)])
+    dimension = f'<dimension ref="A1:{get_column_letter(last_column)}{last_row}"/>'
+
+    before = _DIMENSION_REGEX.sub(dimension, sheet_xml[: sheet_data_match.start()], count=1)
+    after = sheet_xml[sheet_data_match.end() :]
+    sheet_data_tag = _SHEET_DATA_OPEN_REGEX.match(sheet_data_match.group(0)).group(1)
+
+    # NOTE: the values are converted the same way the per-cell write used to do it (str(value))
+    rows = chain([header], ([str(v) for v in row] for row in df.itertuples(index=False, name=None)))
+
+    with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zout:
+        for item in template.infolist():
+            if item.filename != sheet_part:
+                _copy_member(zout, template, item)
+                continue
+
+            sheet_info = zipfile.ZipInfo(item.filename, item.date_time)
+            sheet_info.compress_type = zipfile.ZIP_DEFLATED
 
-            ws.cell(row=1, column=col_index + 1, value=clean_name)
+            with zout.open(sheet_info, "w") as f:
+                f.write(f"{before}<sheetData{sheet_data_tag}>".encode("utf-8"))
 
-        for row_index in range(len(df)):
-            for col_index in range(len(df.columns)):
-                ws.cell(row=row_index + 2, column=col_index + 1, value=str(df.iat[row_index, col_index]))
+                batch = []
+
+                for row in _render_rows(rows, template_rows, len(header)):
+                    batch.append(row)
+
+                    if len(batch) >= _SHEET_ROWS_PER_WRITE:
+                        f.write("".join(batch).encode("utf-8"))
+                        batch.clear()
+
+                f.write(f"{''.join(batch)}</sheetData>{after}".encode("utf-8"))
+
+    return True
+
+
+def _fill_details_sheet_openpyxl(template_path: str, header: list[str], df, output_path: str) -> None:
+    wb = load_workbook(template_path)
+
+    try:
+        ws = wb["Details"]
+
+        for col_index, col_name in enumerate(header, start=1):
+            ws.cell(row=1, column=col_index, value=col_name)
+
+        for row_index, row in enumerate(df.itertuples(index=False, name=None), start=2):
+            for col_index, value in enumerate(row, start=1):
+                ws.cell(row=row_index, column=col_index, value=str(value))
 
         wb.save(output_path)
     finally:
         wb.close()
 
 
+def fill_import_template(df, template_path: str, output_path: str) -> None:
+    """Fill an import template Excel file with grid data.
+
+    Writes cleaned column names and data rows to the 'Details' sheet and saves to
+    output_path. The Details sheet is streamed straight into a copy of the template
+    package; all other parts (sheets, styles, validations) are copied over untouched.
+    Templates whose sheet XML we do not recognise go through openpyxl instead.
+    """
+    header = []
+
+    for col_name in df.columns:
+        clean_name = col_name.strip()
+        match = COLUMN_NAME_CLEANUP_REGEX.match(clean_name)
+
+        if match:
+            clean_name = match.group(1)
+
+        header.append(clean_name)
+
+    with zipfile.ZipFile(template_path, "r") as template:
+        sheet_part = _find_sheet_part(template, "Details")
+
+        if sheet_part is not None:
+            try:
+                if _fill_details_sheet_xml(template, sheet_part, header, df, output_path):
+                    return
+            except Exception:
+                with suppress(OSError):
+                    os.remove(output_path)
+
+                raise
+
+    _fill_details_sheet_openpyxl(template_path, header, df, output_path)
+
+
 def create_sip_zip(
     metadata_path: str,
     sip_location: str,
     sidecar_location: str,
     additional_files: dict[str, str] | None = None,
+    reuse_existing: bool = False,
 ) -> None:
     """Create a SIP ZIP file with Metadata.xlsx and optional additional files.
 
@@ -67,19 +563,34 @@ def create_sip_zip(
         additional_files: Optional dict mapping {archive_name: disk_path} for
             extra files to include in the ZIP (used by digital SIPs for
             dossier files).
+        reuse_existing: If a ZIP already exists at sip_location, copy the
+            compressed bytes of additional files that did not change instead
+            of compressing them again.
     """
-    with zipfile.ZipFile(sip_location, "w", compression=zipfile.ZIP_DEFLATED) as zfile:
-        zfile.write(metadata_path, "Metadata.xlsx")
+    previous = _open_previous_zip(sip_location) if reuse_existing and additional_files else None
+    temp_location = sip_location + ".tmp"
 
-        if additional_files:
-            for archive_name, disk_path in additional_files.items():
-                zfile.write(disk_path, archive_name)
+    try:
+        with open(temp_location, "wb") as f:
+            writer = _HashingWriter(f)
 
-    with open(sip_location, "rb") as f:
-        md5 = hashlib.md5(f.read()).hexdigest()
+            with zipfile.ZipFile(writer, "w", compression=zipfile.ZIP_DEFLATED) as zfile:
+                zfile.write(metadata_path, "Metadata.xlsx")
 
-    with open(sidecar_location, "w", encoding="utf-8") as f:
-        f.write(SIDECAR_TEMPLATE.format(md5=md5))
+                if additional_files:
+                    _write_additional_files(zfile, additional_files, previous)
+    except BaseException:
+        with suppress(OSError):
+            os.remove(temp_location)
+
+        raise
+    finally:
+        if previous is not None:
+            previous.close()
+
+    os.replace(temp_location, sip_location)
+
+    _write_sidecar(sidecar_location, writer.hexdigest())
 
 
 def create_simple_sip(sip, configuration, df=None) -> bool:
@@ -136,12 +647,14 @@ def create_migration_series_sips(sip, configuration, series_data: list) -> bool:
     configuration.create_locations()
     ol_name = sip.name[: BusinessRules.SIP_TITLE_MAX_LENGTH]
 
+    import_template_locations = APIController.warm_import_templates(
+        configuration=configuration,
+        environment=sip.environment,
+        series_ids=[series_id for _, series_id, _ in series_data],
+    )
+
     for _, series_id, df in series_data:
-        import_template_loc = APIController.get_import_template(
-            configuration=configuration,
-            environment=sip.environment,
-            series_id=series_id,
-        )
+        import_template_loc = import_template_locations[series_id]
 
         temp_loc = os.path.join(configuration.grid_location, f"temp_{series_id}.xlsx")
 
@@ -175,19 +688,20 @@ def update_metadata_in_zip(metadata_path: str, sip_location: str, sidecar_locati
 
     with (
         zipfile.ZipFile(sip_location, "r") as zin,
-        zipfile.ZipFile(temp_zip, "w", compression=zipfile.ZIP_DEFLATED) as zout,
+        open(temp_zip, "wb") as f,
     ):
-        for item in zin.infolist():
-            if item.filename == "Metadata.xlsx":
-                continue
-            zout.writestr(item, zin.read(item.filename))
+        writer = _HashingWriter(f)
 
-        zout.write(metadata_path, "Metadata.xlsx")
+        with zipfile.ZipFile(writer, "w", compression=zipfile.ZIP_DEFLATED) as zout:
+            for item in zin.infolist():
+                if item.filename == "Metadata.xlsx":
+                    continue
 
-    os.replace(temp_zip, sip_location)
+                # Move the compressed bytes across as-is, no decompress/recompress round trip
+                _copy_member(zout, zin, item)
 
-    with open(sip_location, "rb") as f:
-        md5 = hashlib.md5(f.read()).hexdigest()
+            zout.write(metadata_path, "Metadata.xlsx")
 
-    with open(sidecar_location, "w", encoding="utf-8") as f:
-        f.write(SIDECAR_TEMPLATE.format(md5=md5))
+    os.replace(temp_zip, sip_location)
+
+    _write_sidecar(sidecar_location, writer.hexdigest())
@@ -1,25 +1,172 @@
 import ftplib
 import os
 import socket
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6 import QtCore
 
 from src.utils.base_object import BaseObject
-from src.utils.constants import UI_TEXT_ELEMENTS
+from src.utils.constants import (
+    FTPS_BLOCK_SIZE,
+    FTPS_MAX_PARALLEL_UPLOADS,
+    FTPS_PROGRESS_INTERVAL_SECONDS,
+    FTPS_UPLOAD_RETRIES,
+    FTPS_UPLOAD_RETRY_DELAY_SECONDS,
+    UI_TEXT_ELEMENTS,
+)
+from src.utils.data_objects.configuration import Environment
 from src.utils.data_objects.sip import SIP
 from src.utils.data_objects.sip_status import SIPStatus
+from src.utils.temp_diagnostic_log import log as temp_log
 
 UI_TEXT = UI_TEXT_ELEMENTS["errors"]["upload"]
 
 
+def _connect(environment: Environment) -> ftplib.FTP_TLS:
+    session = ftplib.FTP_TLS(
+        environment.ftps_url,
+        environment.ftps_username,
+        environment.ftps_password,
+    )
+
+    try:
+        session.prot_p()
+    except Exception:
+        session.close()
+        raise
+
+    return session
+
+
+class _FTPSSessionPool:
+    """A small pool of logged-in FTP_TLS sessions for one environment.
+
+    Idle sessions are checked with a NOOP before they are handed out again, so a
+    session the server dropped in the meantime is silently replaced.
+    """
+
+    def __init__(self, environment: Environment) -> None:
+        self.environment = environment
+
+        self._idle: list[ftplib.FTP_TLS] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> ftplib.FTP_TLS:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+
+                session = self._idle.pop()
+
+            try:
+                session.voidcmd("NOOP")
+                return session
+            except (*ftplib.all_errors, AttributeError):
+                session.close()
+
+        return _connect(self.environment)
+
+    def release(self, session: ftplib.FTP_TLS) -> None:
+        with self._lock:
+            if len(self._idle) < FTPS_MAX_PARALLEL_UPLOADS:
+                self._idle.append(session)
+                return
+
+        session.close()
+
+    def discard(self, session: ftplib.FTP_TLS) -> None:
+        session.close()
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._idle = self._idle, []
+
+        for session in sessions:
+            try:
+                session.quit()
+            except ftplib.all_errors:
+                session.close()
+
+
+class _TransferProgress:
+    """Tracks the position of an upload and reports it, with bytes/sec and ETA, at most every interval.
+
+    The rate only counts bytes actually sent, so skipping over an already uploaded part on resume
+    does not inflate it.
+    """
+
+    def __init__(self, total: int, report: Callable[[int, float, float], None]) -> None:
+        self.total = total
+        self.position = 0
+
+        self._report = report
+        self._start = time.monotonic()
+        self._transferred = 0
+        self._last_report = 0.0
+
+        self._emit()
+
+    def set_position(self, position: int) -> None:
+        self.position = position
+
+    def advance(self, size: int) -> None:
+        self.position += size
+        self._transferred += size
+
+        now = time.monotonic()
+
+        if now - self._last_report >= FTPS_PROGRESS_INTERVAL_SECONDS or self.position >= self.total:
+            self._last_report = now
+            self._emit()
+
+    def _emit(self) -> None:
+        elapsed = time.monotonic() - self._start
+        rate = self._transferred / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - self.position) / rate if rate > 0 else -1.0
+
+        self._report(self.position, rate, eta)
+
+
 class UploadController(BaseObject):
-    # NOTE: we take the locations in here, since the exact location will depend on the application-type as well
-    def _validate_upload(self, sip: SIP, sip_location: str, sidecar_location: str) -> bool:
-        if not sip.environment.has_ftps_credentials():
-            self.application.notify_user_signal.emit(
-                UI_TEXT["missing_ftps_credentials_error"]["title"],
-                UI_TEXT["missing_ftps_credentials_error"]["text"].format(environment_name=sip.environment.name),
-            )
-            return False
+    # (upload name, bytes sent, total bytes, bytes per second, ETA in seconds or -1 if unknown)
+    # Emitted from the upload threads, throttled
+    upload_progress_signal = QtCore.Signal(str, int, int, float, float)
+    # (remote file name, bytes, bytes per second)
+    file_uploaded_signal = QtCore.Signal(str, int, float)
+
+    def __init__(self):
+        super().__init__()
+
+        self._pools: dict[str, _FTPSSessionPool] = {}
+        self._pools_lock = threading.Lock()
+
+    def _pool_for(self, environment: Environment) -> _FTPSSessionPool:
+        with self._pools_lock:
+            pool = self._pools.get(environment.name)
+
+            if pool is not None and pool.environment is environment:
+                return pool
+
+            # NOTE: a new Environment object means the configuration was reloaded, its credentials may differ
+            if pool is not None:
+                pool.close()
+
+            pool = self._pools[environment.name] = _FTPSSessionPool(environment)
 
+            return pool
+
+    def close(self) -> None:
+        with self._pools_lock:
+            pools, self._pools = list(self._pools.values()), {}
+
+        for pool in pools:
+            pool.close()
+
+    def _validate_files(self, sip_location: str, sidecar_location: str) -> bool:
         if not os.path.exists(sip_location) or not os.path.exists(sidecar_location):
             self.application.notify_user_signal.emit(
                 UI_TEXT["missing_files_error"]["title"],
@@ -27,49 +174,171 @@ class UploadController(BaseObject):
             )
             return False
 
+        return True
+
+    def _validate_connection(self, environment: Environment) -> bool:
+        """Log in once for the environment; the session is kept in the pool for the upload itself."""
+        if not environment.has_ftps_credentials():
+            self.application.notify_user_signal.emit(
+                UI_TEXT["missing_ftps_credentials_error"]["title"],
+                UI_TEXT["missing_ftps_credentials_error"]["text"].format(environment_name=environment.name),
+            )
+            return False
+
+        pool = self._pool_for(environment)
+
         try:
-            with ftplib.FTP_TLS(
-                sip.environment.ftps_url,
-                sip.environment.ftps_username,
-                sip.environment.ftps_password,
-            ):
-                pass
+            session = pool.acquire()
         except ftplib.error_perm:
             self.application.notify_user_signal.emit(
                 UI_TEXT["ftps_login_error"]["title"],
-                UI_TEXT["ftps_login_error"]["text"].format(environment_name=sip.environment.name),
+                UI_TEXT["ftps_login_error"]["text"].format(environment_name=environment.name),
             )
             return False
         except socket.gaierror:
             self.application.notify_user_signal.emit(
                 UI_TEXT["ftps_url_error"]["title"],
-                UI_TEXT["ftps_url_error"]["text"].format(environment_name=sip.environment.name),
+                UI_TEXT["ftps_url_error"]["text"].format(environment_name=environment.name),
             )
             return False
         except Exception as e:
             self.application.notify_user_signal.emit(
                 UI_TEXT["ftps_connection_error"]["title"],
-                UI_TEXT["ftps_connection_error"]["text"].format(environment_name=sip.environment.name, error=e),
+                UI_TEXT["ftps_connection_error"]["text"].format(environment_name=environment.name, error=e),
             )
             return False
 
+        pool.release(session)
+
         return True
 
+    # NOTE: we take the locations in here, since the exact location will depend on the application-type as well
+    def _validate_upload(self, sip: SIP, sip_location: str, sidecar_location: str) -> bool:
+        return self._validate_connection(sip.environment) and self._validate_files(sip_location, sidecar_location)
+
+    @staticmethod
+    def _remote_offset(session: ftplib.FTP_TLS, remote_name: str, size: int) -> int:
+        """Return how much of remote_name the server already has, or 0 if that cannot be trusted."""
+        try:
+            session.voidcmd("TYPE I")
+            remote_size = session.size(remote_name)
+        except ftplib.all_errors:
+            return 0
+
+        if remote_size is None or remote_size > size:
+            return 0
+
+        return remote_size
+
+    def _store_file(
+        self, pool: _FTPSSessionPool, session: ftplib.FTP_TLS, location: str, progress: _TransferProgress
+    ) -> ftplib.FTP_TLS:
+        """Upload a file, resuming from the server-side offset (SIZE + REST) when the connection drops.
+
+        A failed transfer, or a failed reconnect, is retried up to FTPS_UPLOAD_RETRIES times over a
+        fresh session. Returns the session in use at the end, which may differ from the one passed in.
+        When the upload fails, the session in use is discarded.
+        """
+        remote_name = os.path.basename(location)
+        size = os.path.getsize(location)
+        base_position = progress.position
+        start = time.monotonic()
+
+        offset = 0
+        attempt = 0
+
+        while True:
+            try:
+                if session is None:
+                    session = pool.acquire()
+                    offset = self._remote_offset(session, remote_name, size)
+
+                    temp_log(f"[upload] {remote_name}: retry {attempt} resuming at {offset}/{size}")
+
+                progress.set_position(base_position + offset)
+
+                with open(location, "rb") as f:
+                    f.seek(offset)
+                    session.storbinary(
+                        f"STOR {remote_name}",
+                        f,
+                        blocksize=FTPS_BLOCK_SIZE,
+                        callback=lambda block: progress.advance(len(block)),
+                        rest=offset or None,
+                    )
+                break
+            except ftplib.error_perm:
+                # The server refused the REST, fall back to a complete upload
+                if offset:
+                    temp_log(f"[upload] {remote_name}: resume from {offset} refused, restarting")
+                    offset = 0
+                    continue
+
+                if session is not None:
+                    pool.discard(session)
+
+                raise
+            except ftplib.all_errors as e:
+                # The session state is unknown after a failed transfer, a failed reconnect leaves none
+                if session is not None:
+                    pool.discard(session)
+                    session = None
+
+                if attempt >= FTPS_UPLOAD_RETRIES:
+                    raise
+
+                attempt += 1
+
+                temp_log(f"[upload] {remote_name}: {e!r}, retrying ({attempt}/{FTPS_UPLOAD_RETRIES})")
+
+                time.sleep(FTPS_UPLOAD_RETRY_DELAY_SECONDS * attempt)
+
+        elapsed = time.monotonic() - start
+        throughput = size / elapsed if elapsed > 0 else 0.0
+
+        temp_log(f"[upload] {remote_name}: {size} bytes in {elapsed:.1f}s ({throughput / 1024 / 1024:.2f} MiB/s)")
+        self.file_uploaded_signal.emit(remote_name, size, throughput)
+
+        return session
+
+    def _upload_pair(self, environment: Environment, name: str, sip_location: str, sidecar_location: str) -> None:
+        """Upload a ZIP and its sidecar over one pooled session, reporting progress under name."""
+        total = os.path.getsize(sip_location) + os.path.getsize(sidecar_location)
+        progress = _TransferProgress(
+            total, lambda sent, rate, eta: self.upload_progress_signal.emit(name, sent, total, rate, eta)
+        )
+
+        pool = self._pool_for(environment)
+        session = pool.acquire()
+
+        session = self._store_file(pool, session, sip_location, progress)
+        session = self._store_file(pool, session, sidecar_location, progress)
+
+        pool.release(session)
+
     def _perform_upload(self, sip: SIP, sip_location: str, sidecar_location: str) -> None:
-        sip_remote_name = os.path.basename(sip_location)
-        sidecar_remote_name = os.path.basename(sidecar_location)
+        self._upload_pair(sip.environment, sip.name, sip_location, sidecar_location)
+
+    def upload_many(
+        self, environment: Environment, uploads: list[tuple[str, str, str]]
+    ) -> list[tuple[str, bool, str]]:
+        """Upload (name, ZIP location, sidecar location) entries, FTPS_MAX_PARALLEL_UPLOADS at a time.
+
+        Returns (name, success, error message) per entry, in the order of uploads.
+        """
+
+        def _upload(upload: tuple[str, str, str]) -> tuple[str, bool, str]:
+            name, sip_location, sidecar_location = upload
 
-        with ftplib.FTP_TLS(
-            sip.environment.ftps_url,
-            sip.environment.ftps_username,
-            sip.environment.ftps_password,
-        ) as session:
-            session.prot_p()
+            try:
+                self._upload_pair(environment, name, sip_location, sidecar_location)
+                return name, True, ""
+            except Exception as e:
+                temp_log(f"[upload] {name}: failed with {e!r}")
+                return name, False, str(e)
 
-            with open(sip_location, "rb") as f:
-                session.storbinary(f"STOR {sip_remote_name}", f)
-            with open(sidecar_location, "rb") as f:
-                session.storbinary(f"STOR {sidecar_remote_name}", f)
+        with ThreadPoolExecutor(max_workers=FTPS_MAX_PARALLEL_UPLOADS) as executor:
+            return list(executor.map(_upload, uploads))
 
     def upload_sip(self, sip: SIP) -> None:
         configuration = self.application.configuration
@@ -87,5 +356,7 @@ class UploadController(BaseObject):
         except Exception:
             sip.set_status(SIPStatus.SIP_CREATED)
             raise
+        finally:
+            self.close()
 
         sip.set_status(SIPStatus.UPLOADED)
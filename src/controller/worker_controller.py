@@ -5,6 +5,7 @@ Controller of background workers
 from collections.abc import Callable
 
 from src.utils.base_object import BaseObject
+from src.utils.workers.executor import TaskExecutor, WorkerTask, get_executor
 from src.utils.workers.worker import Worker
 
 
@@ -12,17 +13,16 @@ class WorkerController(BaseObject):
     def __init__(self) -> None:
         super().__init__()
 
-        self.active_pairs: list[tuple[Worker, ...]] = []
+        # NOTE: all workers share this executor, it is shut down together with the controller
+        self.executor: TaskExecutor = get_executor()
+
+        self.active_pairs: list[tuple[Worker, WorkerTask]] = []
 
     def close_controller(self) -> None:
         for worker, _ in self.active_pairs[:]:
             worker.force_stop = True
 
-        for _, thread in self.active_pairs[:]:
-            thread.quit()
-
-        for _, thread in self.active_pairs[:]:
-            thread.wait()
+        self.executor.shutdown()
 
     def run_thread(self, thread_function: Callable, thread_is_generator: bool) -> Worker:
         return Worker.start(
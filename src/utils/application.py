@@ -6,11 +6,11 @@ import sys
 import traceback
 from collections.abc import Callable
 
-import requests
 from PySide6 import QtCore, QtWidgets
 
 from src.controller.analog.sip_db_controller import AnalogSIPDBController
 from src.controller.config_controller import ConfigController
+from src.controller.db_connections import get_connection_manager
 from src.controller.digital.sip_db_controller import DigitalSIPDBController
 from src.controller.main_db_controller import MainDBController
 from src.controller.migration.bestandscontrole_controller import BestandsControleController
@@ -18,13 +18,20 @@ from src.controller.migration.sip_db_controller import MigrationSIPDBController
 from src.controller.window_controller import WindowController
 from src.controller.worker_controller import WorkerController
 
-from src.utils.constants import PROD_ENVIRONMENT_NAME, TI_ENVIRONMENT_NAME, UI_TEXT_ELEMENTS, determine_root_path
+from src.utils.constants import (
+    PROD_ENVIRONMENT_NAME,
+    TI_ENVIRONMENT_NAME,
+    UI_TEXT_ELEMENTS,
+    WARM_UP_DELAY_MS,
+    determine_root_path,
+)
 from src.utils.data_objects.configuration import Configuration
-from src.utils.data_objects.series import Series
+from src.utils.data_objects.series import Series, SeriesDiff
 from src.utils.data_objects.sip import SIP
 from src.utils.pyside_helper import Helper
 from src.utils.temp_diagnostic_log import init as init_temp_log
 from src.utils.temp_diagnostic_log import log as temp_log
+from src.utils.warm_up import start_warm_up
 from src.utils.worker_user.analog.analog_retriever import AnalogRetriever
 from src.utils.worker_user.digital.digital_retriever import DigitalRetriever
 from src.utils.worker_user.migration.migration_retriever import MigrationRetriever
@@ -114,6 +121,8 @@ class Application(QtWidgets.QApplication):
         self.load_sips()
 
         QtCore.QTimer.singleShot(0, self.reset_bestandscontrole_location)
+        # NOTE: the timers only fire once the event loop runs, i.e. after the main window is shown
+        QtCore.QTimer.singleShot(WARM_UP_DELAY_MS, start_warm_up)
 
         if self.configuration.had_parse_error:
             QtCore.QTimer.singleShot(
@@ -145,11 +154,29 @@ class Application(QtWidgets.QApplication):
 
     def clear_series(self, environment_name: str) -> None:
         self.__series[environment_name] = []
+        self.main_db_controller.delete_series_catalog(environment_name)
 
     def add_series(self, environment_name: str, series: list[Series]) -> None:
         self.__series[environment_name] += series
         self.series_updated_signal.emit()
 
+    def update_series(self, environment_name: str, diff: SeriesDiff) -> None:
+        if not diff:
+            return
+
+        current_series = {s._id: s for s in self.__series[environment_name]}
+
+        # NOTE: changed series are updated in place, SIPs keep a reference to their series
+        for series in diff.changed:
+            current_series[series._id].update_from(series)
+
+        removed_ids = {s._id for s in diff.removed}
+
+        self.__series[environment_name] = [
+            s for s in self.__series[environment_name] if s._id not in removed_ids
+        ] + diff.added
+        self.series_updated_signal.emit()
+
     def setup_signals(self) -> None:
         self.aboutToQuit.connect(self.window_controller.close_controller)
         self.aboutToQuit.connect(lambda: self.configuration.save())
@@ -157,7 +184,10 @@ class Application(QtWidgets.QApplication):
         self.aboutToQuit.connect(self.analog_sip_db_controller.persist_all_sips)
         self.aboutToQuit.connect(self.migration_sip_db_controller.persist_all_sips)
         self.aboutToQuit.connect(self.worker_controller.close_controller)
+        # NOTE: after the workers stopped, some of them write to the DBs
+        self.aboutToQuit.connect(get_connection_manager().close_all)
 
+        self.series_retriever.series_refreshed_signal.connect(self.update_series)
         self.series_retriever.error_occurred_signal.connect(self.error_handler)
 
         self.window_controller.open_digital_grid_signal.connect(
@@ -188,7 +218,7 @@ class Application(QtWidgets.QApplication):
             )
 
     def _get_series_status_text(self) -> str:
-        key = "series_retrieval_in_progress" if self.series_retrieval_busy else "series_retrieval_done"
+        key = "series_retrieval_in_progress" if self.series_retriever.is_running else "series_retrieval_done"
 
         return UI_TEXT_ELEMENTS["toolbar_info"][key]["left_text"].format(
             ti_env_name=TI_ENVIRONMENT_NAME,
@@ -278,6 +308,8 @@ class Application(QtWidgets.QApplication):
         if isinstance(exception, IgnorableException):
             return
 
+        import requests
+
         traceback.print_exception(type(exception), exception, exception.__traceback__)
         temp_log(f"error_handler: {type(exception).__name__}: {exception}", exc=exception)
 
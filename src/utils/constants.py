@@ -57,6 +57,10 @@ class DBTableName(StrEnum):
     TABLES = "tables"
     SIP_CREATOR = "sip_creator"
     DOSSIER = "dossier"
+    EDEPOT_SIP_INDEX = "edepot_sip_index"
+    EDEPOT_SIP_INDEX_STATE = "edepot_sip_index_state"
+    SIP_CATALOG = "sip_catalog"
+    SERIES_CATALOG = "series_catalog"
 
 
 class DBColumnName(StrEnum):
@@ -77,6 +81,17 @@ class DBColumnName(StrEnum):
     SERIES_NAME = "series_name"
     DOSSIERS_LIST = "dossiers_list"
     GRID_VALID = "grid_valid"
+    ORIGINAL_FILENAME = "original_filename"
+    ARCHIVE_DATE = "archive_date"
+    HIGH_WATER_MARK = "high_water_mark"
+    MTIME_NS = "mtime_ns"
+    POSITION = "position"
+    SIZE = "size"
+    DB_TYPE = "db_type"
+    DB_PATH = "db_path"
+    DETAILS = "details"
+    VALID_FROM = "valid_from"
+    VALID_TO = "valid_to"
 
 
 class ConfigKey(StrEnum):
@@ -223,11 +238,80 @@ FILE_REGEXES_TO_IGNORE = [
     r"^\.Trashes$",
     r"^\.fseventsd$",
 ]
+# All of the above in one precompiled pattern
+FILE_IGNORE_REGEX = re.compile("|".join(f"(?:{p})" for p in FILE_REGEXES_TO_IGNORE))
+# Dossiers are scanned this many at a time, scanning is mostly waiting on the (network) filesystem
+DOSSIER_SCAN_WORKERS = 8
+# Folder structure errors list at most this many paths per kind, the rest is only counted
+FOLDER_STRUCTURE_REPORT_MAX_PATHS = 20
+
+# Formats that are already compressed: deflating them again costs CPU for no size gain,
+# so they are stored as-is in the SIP ZIP.
+ZIP_STORED_EXTENSIONS = frozenset(
+    {
+        ".pdf",
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".gif",
+        ".mp3",
+        ".mp4",
+        ".m4a",
+        ".mov",
+        ".docx",
+        ".xlsx",
+        ".pptx",
+        ".zip",
+        ".7z",
+        ".gz",
+    }
+)
+
+# Files up to this size are compressed on a thread pool before being written to the ZIP.
+# Larger files are streamed by zipfile itself, so memory use stays bounded.
+ZIP_PARALLEL_COMPRESSION_MAX_FILE_SIZE = 16 * 1024 * 1024
+ZIP_COMPRESSION_WORKERS = min(8, os.cpu_count() or 1)
+
+# Downloaded import templates are reused for this long before they are revalidated
+# against the e-depot. Templates only change when a series' metadata definition changes.
+IMPORT_TEMPLATE_CACHE_TTL_SECONDS = 24 * 60 * 60
+IMPORT_TEMPLATE_WARM_WORKERS = 4
+
+# e-depot API: one pooled HTTP session per environment, retrying rate limits and server errors
+# with exponential backoff (0.5s, 1s, 2s, ...; a Retry-After header takes precedence).
+API_CONNECTION_POOL_SIZE = 10
+API_RETRY_TOTAL = 3
+API_RETRY_BACKOFF_FACTOR = 0.5
+API_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Access tokens are reused until this many seconds before they expire.
+# The lifetime is used when the token response does not state one.
+ACCESS_TOKEN_REFRESH_MARGIN_SECONDS = 30
+ACCESS_TOKEN_DEFAULT_LIFETIME_SECONDS = 300
+
+# FTPS uploads: series ZIPs are uploaded this many at a time, each over its own pooled session,
+# sending blocks of FTPS_BLOCK_SIZE. Progress is reported at most once per interval per upload.
+FTPS_MAX_PARALLEL_UPLOADS = 3
+FTPS_BLOCK_SIZE = 256 * 1024
+FTPS_PROGRESS_INTERVAL_SECONDS = 0.25
+# A dropped transfer is resumed from the size the server already has (SIZE + REST),
+# waiting attempt * delay seconds before reconnecting.
+FTPS_UPLOAD_RETRIES = 5
+FTPS_UPLOAD_RETRY_DELAY_SECONDS = 2
 
 MAIN_DB_NAME = "sip_creator.db"
 OLD_MAIN_DB_NAME = "sqlite.db"
 UNKNOWN_TRANSFORMED = "<3.0"
 
+# SQLite connections are pooled per DB file and stay open between operations (WAL journaling,
+# synchronous=NORMAL). At most DB_POOL_SIZE idle connections are kept per file, each with a page
+# cache of DB_CACHE_SIZE_KIB and room for DB_CACHED_STATEMENTS prepared statements.
+# A connection waits up to DB_BUSY_TIMEOUT_SECONDS for another one to finish writing.
+DB_POOL_SIZE = 4
+DB_CACHE_SIZE_KIB = 8 * 1024
+DB_CACHED_STATEMENTS = 256
+DB_BUSY_TIMEOUT_SECONDS = 10
+
 # Canonical date format used everywhere in the SIP Creator (grid, series, excel I/O).
 DATE_FORMAT = "%Y-%m-%d"
 
@@ -256,7 +340,32 @@ UPLOADED_SIP_STATUSES = (
 )
 POLL_INTERVAL_SECONDS = 10
 
+# Status polling: SIPs are checked concurrently, and the longer a SIP stays in the same status
+# the less often it is polled. The interval starts at POLL_INTERVAL_SECONDS and doubles for
+# every backoff step spent in that status, up to the maximum, with +/- jitter.
+STATUS_POLL_WORKERS = 8
+STATUS_POLL_BACKOFF_STEP_SECONDS = 10 * 60
+STATUS_POLL_MAX_INTERVAL_SECONDS = 15 * 60
+STATUS_POLL_JITTER = 0.2
+STATUS_POLL_MIN_SLEEP_SECONDS = 1
+
+# Background tasks run on two bounded thread pools ("lanes"): interactive work such as grid
+# validation gets its own threads, so it never queues behind SIP builds, uploads or retrievals.
+# NOTE: long-running loops (e.g. the status checker) hold on to a bulk thread for as long as they run
+INTERACTIVE_TASK_WORKERS = 2
+BULK_TASK_WORKERS = 8
+
+# Heavy libraries are imported on first use instead of at startup. Once the main window is shown,
+# WARM_UP_MODULES are imported on a background thread (after WARM_UP_DELAY_MS), so opening a grid
+# or reading an Excel file usually finds them loaded already.
+WARM_UP_DELAY_MS = 500
+WARM_UP_MODULES = ("requests", "pandas", "openpyxl")
+
 # Grid checks constants
+# Edits within this many milliseconds of each other are validated in a single run
+GRID_VALIDATION_DEBOUNCE_MS = 30
+# Key in DataFrame.attrs of a grid snapshot, identifies the grid (and its rows/columns) it was taken from
+GRID_SNAPSHOT_SOURCE = "grid_snapshot_source"
 RRN_LOOSE_PATTERN = re.compile(r"^\d{11}$")
 RRN_STRICT_PATTERN = re.compile(r"^\d{2}\.\d{2}\.\d{2}-\d{3}\.\d{2}$")
 
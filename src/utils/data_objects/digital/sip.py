@@ -10,20 +10,22 @@ is so that we can still easily use them in a lambda format
 eg: lambda: sip.set_name(<new name>)
 """
 
+from __future__ import annotations
+
 import os
-import re
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-import pandas as pd
-
-from src.controller.excel_controller import ExcelController
-
-from src.utils.constants import DATE_FORMAT, FILE_REGEXES_TO_IGNORE, UI_TEXT_ELEMENTS, ColumnName, RowType
+from src.utils.constants import DATE_FORMAT, UI_TEXT_ELEMENTS, ColumnName, RowType
 from src.utils.data_objects.sip import SIP as CommonSIP
+from src.utils.file_scanner import ScannedEntry, scan_dossier, scan_dossiers
 from src.utils.pyside_helper import Helper
 
 from src.widget.components.digital.dossier_widget import DossierWidget
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class SIP(CommonSIP):
     def __init__(self):
@@ -53,12 +55,16 @@ class SIP(CommonSIP):
         if self.import_template_path is None:
             return
 
+        from src.controller.excel_controller import ExcelController
+
         return ExcelController.read_excel(self.import_template_path)
 
     def read_metadata(self) -> pd.DataFrame | None:
         if self.metadata_path is None:
             return
 
+        from src.controller.excel_controller import ExcelController
+
         return ExcelController.read_excel(self.metadata_path)
 
     def _map_file_location_to_sip_location(self, location: str) -> str:
@@ -86,85 +92,57 @@ class SIP(CommonSIP):
             }
         }
 
-    def _get_dossier_folder_structure(self, base_path: str, dossier_path: str) -> dict[str, str]:
-        """
-        Returns a dict mapping file/folder names to their relative paths from base_path.
-
-        {
-            <file_name_1>: <root>/<file_name_1>,
-            <file_name_2>: <root>/<subfolder>/<file_name_2>,
-            ...
-        }
-        """
-        structure = {}
-
-        for dirpath, dirnames, filenames in os.walk(dossier_path):
-            # Include empty directories, but skip '.' and '..' (relative path artifacts)
-            if not filenames and not dirnames:
-                rel_path = os.path.relpath(dirpath, base_path).replace("\\", "/")
-
-                if rel_path in (".", ".."):
-                    continue
-
-                dir_name = os.path.basename(dirpath)
-                structure[dir_name] = rel_path
+    def _get_file_structure(self, dossier: DossierWidget, scanned: list[ScannedEntry] | None = None) -> dict[str, str]:
+        dossier_name = os.path.basename(dossier.path)
 
-            for filename in filenames:
-                file_path = os.path.join(dirpath, filename)
-                structure[filename] = os.path.relpath(file_path, base_path).replace("\\", "/")
+        if scanned is None:
+            scanned = scan_dossier(dossier.path)
 
-        return structure
+        # NOTE: entries are keyed on their name, a later file with the same name replaces an earlier one
+        entries_by_name = {}
 
-    def _get_file_structure(self, dossier: DossierWidget) -> dict[str, str]:
-        dossier_name = os.path.basename(dossier.path)
+        for entry in scanned:
+            entries_by_name[entry.name] = entry
 
         return {
-            (path_in_sip := self._map_file_location_to_sip_location(f"{dossier_name}/{relative_location}")): {
-                "path": (real_path := os.path.join(dossier.path, relative_location)),
+            (path_in_sip := self._map_file_location_to_sip_location(f"{dossier_name}/{entry.relative_path}")): {
+                "path": entry.path,
                 ColumnName.PATH_IN_SIP: path_in_sip,
-                ColumnName.TYPE: (
-                    RowType.GEEN
-                    if not os.path.isfile(real_path)
-                    or os.path.getsize(real_path) == 0
-                    or any(re.match(p, file_name) is not None for p in FILE_REGEXES_TO_IGNORE)
-                    else RowType.STUK
-                ),
+                ColumnName.TYPE: entry.row_type,
                 ColumnName.NAAM: os.path.basename(path_in_sip),
                 ColumnName.DOSSIER_REF: path_in_sip.split("/")[0],
                 # Openingsdatum will be the creation dates of the file
-                # There is no cross-platform way of doing this sadly
-                # nt is Windows
-                ColumnName.OPENINGSDATUM: (
-                    os.path.getctime(real_path) if os.name == "nt" else os.stat(real_path).st_birthtime
-                ),
+                ColumnName.OPENINGSDATUM: entry.created,
                 # Sluitingsdatum will be the last edited time of the file
-                # This works as a cross-platform way of getting modification time
-                ColumnName.SLUITINGSDATUM: os.path.getmtime(real_path),
+                ColumnName.SLUITINGSDATUM: entry.modified,
             }
-            for file_name, relative_location in self._get_dossier_folder_structure(dossier.path, dossier.path).items()
+            for entry in entries_by_name.values()
         }
 
     def _get_folder_structure(self) -> dict[str, str]:
         folder_structure = dict()
 
-        for dossier in self.dossiers:
+        # NOTE: all dossiers are scanned up front, several at a time
+        scanned_dossiers = scan_dossiers(dossier.path for dossier in self.dossiers)
+
+        for dossier, scanned in zip(self.dossiers, scanned_dossiers):
             dossier_structure = self._get_dossier_structure(dossier=dossier)
-            file_structure = self._get_file_structure(dossier=dossier)
+            file_structure = self._get_file_structure(dossier=dossier, scanned=scanned)
 
             dossier_key = next(iter(dossier_structure))
 
             if not file_structure or all(f[ColumnName.TYPE] == RowType.GEEN for f in file_structure.values()):
                 dossier_structure[dossier_key][ColumnName.TYPE] = RowType.GEEN
 
-            folder_structure = {
-                **folder_structure,
-                **dossier_structure,
-                **file_structure,
-            }
+            # NOTE: updated in place, a later key replaces the value but keeps its first position
+            folder_structure.update(dossier_structure)
+            folder_structure.update(file_structure)
 
         return folder_structure
 
     def set_data_from_dossiers(self) -> None:
+        import pandas as pd
+
         import_template = self.read_import_template()
         if import_template is None:
             self.application.notify_user_signal.emit(
@@ -173,53 +151,70 @@ class SIP(CommonSIP):
             )
             return
 
-        df = pd.DataFrame(columns=import_template.columns)
+        columns = self._get_grid_columns(self._get_folder_structure())
+        row_count = len(columns[ColumnName.PATH_IN_SIP])
 
-        folder_structure = self._get_folder_structure()
+        # Template columns we don't fill stay empty, main columns missing from the template go at the end
+        column_order = list(import_template.columns) + [c for c in columns if c not in import_template.columns]
 
-        main_columns = (
-            ColumnName.PATH_IN_SIP,
-            ColumnName.TYPE,
-            ColumnName.DOSSIER_REF,
-            ColumnName.NAAM,
-            ColumnName.OPENINGSDATUM,
-            ColumnName.SLUITINGSDATUM,
+        self.grid_data.data_as_df = pd.DataFrame(
+            {column: columns[column] if column in columns else [""] * row_count for column in column_order},
+            columns=column_order,
         )
 
-        for column in main_columns:
-            df[column] = [s[column] for s in folder_structure.values()]
-
-        type_col = ColumnName.TYPE
-        dossier_ref_col = ColumnName.DOSSIER_REF
-        opening_col = ColumnName.OPENINGSDATUM
-        closing_col = ColumnName.SLUITINGSDATUM
-
-        open_dates_df = df.loc[df[type_col] == RowType.DOSSIER][[dossier_ref_col]].join(
-            df.loc[df[type_col] == RowType.STUK]
-            .groupby(by=dossier_ref_col)[opening_col]
-            .min()
-            .apply(lambda t: datetime.fromtimestamp(t).strftime(DATE_FORMAT)),
-            on=dossier_ref_col,
-            rsuffix="_r",
-        )
-        close_dates_df = df.loc[df[type_col] == RowType.DOSSIER][[dossier_ref_col]].join(
-            df.loc[df[type_col] == RowType.STUK]
-            .groupby(by=dossier_ref_col)[closing_col]
-            .max()
-            .apply(lambda t: datetime.fromtimestamp(t).strftime(DATE_FORMAT)),
-            on=dossier_ref_col,
-            rsuffix="_r",
-        )
+    @staticmethod
+    def _get_grid_columns(folder_structure: dict[str, dict]) -> dict[str, list]:
+        """Build the main grid columns from the folder structure in a single pass.
+
+        Dossier rows get the earliest creation and the latest modification date of the files
+        under the same dossier ref, the dates of the files themselves are left empty.
+        """
+        path_in_sip = []
+        types = []
+        dossier_refs = []
+        names = []
+
+        opening_dates: dict[str, float] = {}
+        closing_dates: dict[str, float] = {}
+
+        for row in folder_structure.values():
+            row_type = row[ColumnName.TYPE]
+            dossier_ref = row[ColumnName.DOSSIER_REF]
+
+            path_in_sip.append(row[ColumnName.PATH_IN_SIP])
+            types.append(row_type)
+            dossier_refs.append(dossier_ref)
+            names.append(row[ColumnName.NAAM])
+
+            if row_type != RowType.STUK:
+                continue
+
+            opened = row[ColumnName.OPENINGSDATUM]
+            closed = row[ColumnName.SLUITINGSDATUM]
+
+            if dossier_ref not in opening_dates or opened < opening_dates[dossier_ref]:
+                opening_dates[dossier_ref] = opened
+            if dossier_ref not in closing_dates or closed > closing_dates[dossier_ref]:
+                closing_dates[dossier_ref] = closed
 
         # NOTE: we don't care about the lost values from files here
         # Windows tends to just do random things with it anyway, so it's likely no good
-        df[opening_col] = None
-        df[closing_col] = None
+        def _dossier_dates(dates: dict[str, float]) -> list[str]:
+            formatted = {ref: datetime.fromtimestamp(t).strftime(DATE_FORMAT) for ref, t in dates.items()}
 
-        df.loc[df[type_col] == RowType.DOSSIER, opening_col] = open_dates_df[opening_col]
-        df.loc[df[type_col] == RowType.DOSSIER, closing_col] = close_dates_df[closing_col]
+            return [
+                formatted.get(ref, "") if row_type == RowType.DOSSIER else ""
+                for row_type, ref in zip(types, dossier_refs)
+            ]
 
-        self.grid_data.data_as_df = df.fillna("")
+        return {
+            ColumnName.PATH_IN_SIP: path_in_sip,
+            ColumnName.TYPE: types,
+            ColumnName.DOSSIER_REF: dossier_refs,
+            ColumnName.NAAM: names,
+            ColumnName.OPENINGSDATUM: _dossier_dates(opening_dates),
+            ColumnName.SLUITINGSDATUM: _dossier_dates(closing_dates),
+        }
 
     def apply_tag_mapping(self) -> None:
         if not self.tag_mapping:
@@ -1,6 +1,10 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from pandas import DataFrame
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 @dataclass
@@ -44,6 +48,8 @@ class GridData:
         if self.__data_as_df is not None:
             return self.__data_as_df
 
+        from pandas import DataFrame
+
         if self.__data_as_dict is not None:
             self.__data_as_df = DataFrame(self.__data_as_dict, dtype=str).fillna("").convert_dtypes()
         elif self.__data_as_records is not None:
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Enum
 
@@ -72,6 +72,10 @@ class Series:
     def from_list(series_list: list) -> list:
         return [Series.from_dict(s) for s in series_list]
 
+    def update_from(self, series: "Series") -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(series, f.name))
+
     def get_full_name(self) -> str:
         def transform_date(date: datetime):
             # Date comes in as YYYY-MM-DD
@@ -127,3 +131,27 @@ class Series:
 
     def __repr__(self) -> str:
         return self.get_full_name()
+
+
+@dataclass
+class SeriesDiff:
+    """What changed between two lists of series of the same environment, matched on their id."""
+
+    added: list[Series] = field(default_factory=list)
+    removed: list[Series] = field(default_factory=list)
+    # NOTE: the new versions of the series
+    changed: list[Series] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    @staticmethod
+    def between(old_series: list[Series], new_series: list[Series]) -> "SeriesDiff":
+        old_by_id = {s._id: s for s in old_series}
+        new_ids = {s._id for s in new_series}
+
+        return SeriesDiff(
+            added=[s for s in new_series if s._id not in old_by_id],
+            removed=[s for s in old_series if s._id not in new_ids],
+            changed=[s for s in new_series if s._id in old_by_id and s != old_by_id[s._id]],
+        )
@@ -21,5 +21,9 @@ BulkResult = tuple[int, int, str | None, str | None, str | None]
 
 
 class BaseCheck:
+    def required_columns(self, columns: list[str]) -> list[str]:
+        """Columns check_bulk reads besides the one it checks, out of the grid columns."""
+        return []
+
     def check_bulk(self, raw_data: DataFrame, col: int, changed_range: CellRange) -> list[BulkResult]:
         return []
@@ -65,6 +65,9 @@ class DateCheck(BaseCheck):
     def __init__(self, series_provider=None):
         self._series_provider = series_provider
 
+    def required_columns(self, columns: list[str]) -> list[str]:
+        return [OPENING_COL, CLOSING_COL, ColumnName.TYPE, ColumnName.DOSSIER_REF]
+
     def _get_series_range(self) -> tuple[datetime | None, datetime | None]:
         if self._series_provider is None:
             return None, None
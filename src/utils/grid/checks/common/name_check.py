@@ -3,37 +3,63 @@ from pandas import DataFrame
 
 from src.utils.constants import UI_TEXT_ELEMENTS, BusinessRules, ColumnName, RowType
 from src.utils.grid.checks.base_check import BaseCheck, BulkResult, CellRange
+from src.utils.grid.checks.uniqueness_index import UniquenessIndex
 
 UI_TEXT = UI_TEXT_ELEMENTS["grid_checks"]["common"]
 
 
 class NameCheck(BaseCheck):
+    def __init__(self) -> None:
+        # Non-empty dossier names (within the length limit) have to be unique
+        self._index = UniquenessIndex()
+
+    def required_columns(self, columns: list[str]) -> list[str]:
+        return [ColumnName.TYPE]
+
     def check_bulk(self, raw_data: DataFrame, col: int, changed_range: CellRange) -> list[BulkResult]:
-        all_values = raw_data.iloc[:, col].astype(str)
-        all_rows = range(len(all_values))
+        type_col = raw_data.columns.get_loc(ColumnName.TYPE) if ColumnName.TYPE in raw_data.columns else None
 
-        cell_tooltips = np.full(len(all_values), None, dtype=object)
-        wide_tooltips = np.full(len(all_values), None, dtype=object)
+        def keys() -> list[str | None]:
+            if type_col is None:
+                return []
 
-        too_long = all_values.str.len() > BusinessRules.NAME_MAX_LENGTH
-        cell_tooltips[too_long.values] = UI_TEXT["name_too_long_error"]
+            all_values = raw_data.iloc[:, col].astype(str)
+            is_dossier = raw_data.iloc[:, type_col].astype(str) == RowType.DOSSIER
+            indexed = is_dossier & (all_values != "") & (all_values.str.len() <= BusinessRules.NAME_MAX_LENGTH)
 
-        has_type = ColumnName.TYPE in raw_data.columns
+            return [value if ok else None for value, ok in zip(all_values, indexed)]
 
-        if has_type:
-            type_col = raw_data.columns.get_loc(ColumnName.TYPE)
-            types = raw_data.iloc[:, type_col].astype(str)
+        def key_for_row(row: int) -> str | None:
+            if type_col is None or str(raw_data.iat[row, type_col]) != RowType.DOSSIER:
+                return None
 
-            is_dossier = types == RowType.DOSSIER
-            ok_length = ~too_long
+            value = str(raw_data.iat[row, col])
 
-            empty_dossier = is_dossier & ok_length & (all_values == "")
-            cell_tooltips[empty_dossier.values] = UI_TEXT["name_empty_dossier_error"]
+            return value if value != "" and len(value) <= BusinessRules.NAME_MAX_LENGTH else None
+
+        with self._index.lock:
+            changed_rows = self._index.sync(raw_data, col, changed_range, keys, key_for_row)
+
+            if changed_rows is None:
+                report_rows = list(range(len(raw_data)))
+            else:
+                edited_rows = range(changed_range.row_start, min(changed_range.row_end + 1, len(raw_data)))
+                report_rows = sorted(changed_rows.union(edited_rows))
 
-            non_empty_dossier = is_dossier & ok_length & (all_values != "")
-            dossier_names = all_values[non_empty_dossier]
-            duplicate_mask = dossier_names.duplicated(keep=False)
-            duplicate_indices = dossier_names.index[duplicate_mask]
-            wide_tooltips[duplicate_indices] = UI_TEXT["name_duplicate_error"]
+            duplicates = [self._index.is_duplicate(row) for row in report_rows]
+
+        values = raw_data.iloc[report_rows, col].astype(str)
+        cell_tooltips = np.full(len(report_rows), None, dtype=object)
+
+        too_long = values.str.len() > BusinessRules.NAME_MAX_LENGTH
+        cell_tooltips[too_long.values] = UI_TEXT["name_too_long_error"]
+
+        if type_col is not None:
+            is_dossier = raw_data.iloc[report_rows, type_col].astype(str) == RowType.DOSSIER
+            empty_dossier = is_dossier & ~too_long & (values == "")
+            cell_tooltips[empty_dossier.values] = UI_TEXT["name_empty_dossier_error"]
 
-        return [(row, col, None, cell_tooltips[row], wide_tooltips[row]) for row in all_rows]
+        return [
+            (row, col, None, cell_tooltip, UI_TEXT["name_duplicate_error"] if duplicate else None)
+            for row, cell_tooltip, duplicate in zip(report_rows, cell_tooltips, duplicates)
+        ]
@@ -1,5 +1,12 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from src.utils.constants import UI_TEXT_ELEMENTS, ColumnName, RowType
-from src.utils.grid.table.common.data_table import DataTable
+
+# NOTE: the grid table package imports this module, only import it for type checking
+if TYPE_CHECKING:
+    from src.utils.grid.table.common.data_table import DataTable
 
 UI_TEXT = UI_TEXT_ELEMENTS["grid_checks"]["digital"]
 
@@ -62,6 +62,9 @@ def validate_location_columns(columns: list[str]) -> str | None:
 
 
 class LocationGroupCheck(BaseCheck):
+    def required_columns(self, columns: list[str]) -> list[str]:
+        return [col for group in _get_location_groups(columns) for col in group]
+
     def check_bulk(self, raw_data: DataFrame, col: int, changed_range: CellRange) -> list[BulkResult]:
         columns = list(raw_data.columns)
         groups = _get_location_groups(columns)
@@ -12,6 +12,9 @@ class PathInSipCheck(BaseCheck):
     def __init__(self, type_provider: Callable[[], str]) -> None:
         self._type_provider = type_provider
 
+    def required_columns(self, columns: list[str]) -> list[str]:
+        return [ColumnName.TYPE, ColumnName.DOSSIER_REF]
+
     def check_bulk(self, raw_data: DataFrame, col: int, changed_range: CellRange) -> list[BulkResult]:
         active_type = self._type_provider()
 
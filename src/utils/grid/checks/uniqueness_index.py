@@ -0,0 +1,168 @@
+import threading
+from collections.abc import Callable, Iterable
+
+from pandas import DataFrame
+
+from src.utils.constants import GRID_SNAPSHOT_SOURCE
+from src.utils.grid.checks.base_check import BaseCheck, BulkResult, CellRange
+
+
+class UniquenessIndex:
+    """Maintained value -> rows index for a column whose values have to be unique.
+
+    The owning check decides the key of every row (None means the row does not take part).
+    The index belongs to one grid (or DataFrame) and column: it is rebuilt when either of those
+    changes or when the whole grid is validated, otherwise only the rows in the changed range are
+    re-keyed, which is O(1) per row. Snapshots of the same grid count as the same grid, as long
+    as no rows or columns were added or removed in between.
+
+    Checks run on worker threads, hold lock while syncing and reading the index.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+
+        self._rows_by_key: dict[str, set[int]] = {}
+        self._key_by_row: dict[int, str] = {}
+
+        self._source: object | None = None
+        self._col: int | None = None
+
+    def sync(
+        self,
+        raw_data: DataFrame,
+        col: int,
+        changed_range: CellRange,
+        keys: Callable[[], Iterable[str | None]],
+        key_for_row: Callable[[int], str | None],
+    ) -> set[int] | None:
+        """Bring the index up to date with raw_data.
+
+        keys gives the key of every row (used on a rebuild), key_for_row the key of a single row.
+        Returns the rows whose duplicate status changed, or None if the index was rebuilt and
+        every row has to be reported.
+        """
+        row_count = len(raw_data)
+        whole_grid = changed_range.row_start <= 0 and changed_range.row_end >= row_count - 1
+
+        if self._source_of(raw_data) is not self._source or col != self._col or whole_grid:
+            self._rebuild(raw_data, col, keys())
+            return None
+
+        changed_rows: set[int] = set()
+
+        for row in range(changed_range.row_start, min(changed_range.row_end + 1, row_count)):
+            changed_rows.update(self._update(row, key_for_row(row)))
+
+        return changed_rows
+
+    def is_duplicate(self, row: int) -> bool:
+        key = self._key_by_row.get(row)
+
+        return key is not None and len(self._rows_by_key[key]) > 1
+
+    @property
+    def indexed_rows(self) -> Iterable[int]:
+        return self._key_by_row.keys()
+
+    @staticmethod
+    def _source_of(raw_data: DataFrame) -> object:
+        return raw_data.attrs.get(GRID_SNAPSHOT_SOURCE, raw_data)
+
+    def _rebuild(self, raw_data: DataFrame, col: int, keys: Iterable[str | None]) -> None:
+        self._rows_by_key = {}
+        self._key_by_row = {}
+        self._source = self._source_of(raw_data)
+        self._col = col
+
+        for row, key in enumerate(keys):
+            if key is not None:
+                self._key_by_row[row] = key
+                self._rows_by_key.setdefault(key, set()).add(row)
+
+    def _update(self, row: int, key: str | None) -> set[int]:
+        old_key = self._key_by_row.get(row)
+
+        if old_key == key:
+            return set()
+
+        changed_rows = set()
+        was_duplicate = False
+        is_duplicate = False
+
+        if old_key is not None:
+            del self._key_by_row[row]
+
+            rows = self._rows_by_key[old_key]
+            rows.discard(row)
+
+            was_duplicate = len(rows) > 0
+
+            # The one row left over is no longer a duplicate
+            if len(rows) == 1:
+                changed_rows.update(rows)
+            elif not rows:
+                del self._rows_by_key[old_key]
+
+        if key is not None:
+            self._key_by_row[row] = key
+
+            rows = self._rows_by_key.setdefault(key, set())
+
+            is_duplicate = len(rows) > 0
+
+            # The row that was unique so far now has a duplicate
+            if len(rows) == 1:
+                changed_rows.update(rows)
+
+            rows.add(row)
+
+        if was_duplicate != is_duplicate:
+            changed_rows.add(row)
+
+        return changed_rows
+
+
+class UniqueValueCheck(BaseCheck):
+    """Non-empty values have to be unique over the whole column, empty values are errors as well.
+
+    Empty-cell errors are only given for the changed range (avoids flagging trailing empty rows).
+    Subclasses provide the error texts.
+    """
+
+    empty_error: str
+    duplicate_error: str
+
+    def __init__(self) -> None:
+        self._index = UniquenessIndex()
+
+    def check_bulk(self, raw_data: DataFrame, col: int, changed_range: CellRange) -> list[BulkResult]:
+        def keys() -> list[str | None]:
+            return [value if value != "" else None for value in raw_data.iloc[:, col].astype(str)]
+
+        def key_for_row(row: int) -> str | None:
+            value = str(raw_data.iat[row, col])
+
+            return value if value != "" else None
+
+        edited_rows = range(changed_range.row_start, min(changed_range.row_end + 1, len(raw_data)))
+
+        with self._index.lock:
+            changed_rows = self._index.sync(raw_data, col, changed_range, keys, key_for_row)
+
+            # After a rebuild all non-empty rows are reported, to clear stale duplicate markings
+            report_rows = set(edited_rows).union(self._index.indexed_rows if changed_rows is None else changed_rows)
+
+            results = []
+
+            for row in sorted(report_rows):
+                if self._index.is_duplicate(row):
+                    cell_tooltip = self.duplicate_error
+                elif row in edited_rows and str(raw_data.iat[row, col]) == "":
+                    cell_tooltip = self.empty_error
+                else:
+                    cell_tooltip = None
+
+                results.append((row, col, None, cell_tooltip, None))
+
+        return results
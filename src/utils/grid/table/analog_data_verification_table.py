@@ -4,9 +4,7 @@ from PySide6 import QtCore
 from src.utils.constants import ANALOOG_DEFAULT_VALUE, ColumnName, RowType
 from src.utils.data_objects.sip import SIP
 from src.utils.grid.checks.analog import AnalogPathInSipCheck, BeschrijvingCheck, VerpakkingCheck
-from src.utils.grid.checks.base_check import CellRange
 from src.utils.grid.table.common import CellColor, CommonDataVerificationTable, MarkingSource
-from src.utils.workers.worker import Worker
 
 DISABLED_COLUMNS = [
     ColumnName.TYPE,
@@ -46,8 +44,12 @@ class AnalogDataVerificationTable(CommonDataVerificationTable):
             if col in self.raw_data.columns:
                 self.disable_column(col)
 
-    def _get_empty_rows(self) -> set[int]:
-        return {row for row in range(self.raw_data.shape[0]) if self._is_row_empty(row)}
+    def _get_empty_rows(self, data: pd.DataFrame) -> set[int]:
+        return {row for row in range(data.shape[0]) if self._background_is_row_empty(data, row)}
+
+    def _validation_columns(self) -> set[str] | None:
+        # NOTE: a row is empty if all of its columns are
+        return None
 
     def _is_row_empty(self, row: int) -> bool:
         return self._background_is_row_empty(self.raw_data, row)
@@ -109,93 +111,31 @@ class AnalogDataVerificationTable(CommonDataVerificationTable):
         if not changes:
             return
 
-        # Mark all active workers as stale and stop them — their results are based on old data
-        for worker, _ in self._active_workers:
-            worker.stale = True
-            worker.forcibly_stop_signal.emit()
-
         max_row_needed = max(index.row() for index, _ in changes)
 
         if max_row_needed >= self.raw_data.shape[0]:
             extra = max_row_needed - self.raw_data.shape[0] + 2
             self._insert_empty_rows(extra)
 
-        raw_changes = [(index.row(), index.column(), self._sanitize_value(value)) for index, value in changes]
-
-        df_copy = self.raw_data.copy()
-        columns = list(df_copy.columns)
-        disabled_col_indices = [df_copy.columns.get_loc(col) for col in DISABLED_COLUMNS if col in df_copy.columns]
-
-        def background_apply():
-            auto_fill_rows: list[tuple[int, str]] = []
-
-            for row, col, value in raw_changes:
-                if columns[col] == ColumnName.PATH_IN_SIP:
-                    auto_fill_rows.append((row, value))
-
-                df_copy.iat[row, col] = value
-
-            if auto_fill_rows:
-                self._background_bulk_auto_fill(df_copy, auto_fill_rows)
-
-            markings = self._background_build_disabled_markings(df_copy, disabled_col_indices)
-            data_row_count = self._background_count_data_rows(df_copy)
-            needs_empty_row = df_copy.shape[0] == 0 or not self._background_is_row_empty(df_copy, df_copy.shape[0] - 1)
-
-            return df_copy, markings, data_row_count, needs_empty_row
-
-        Worker.start(
-            background_apply,
-            on_result=self._on_analog_bulk_data_applied,
-            on_finished=self._check_validation_complete,
-            track_in=self._active_workers,
-        )
-
-    def _on_analog_bulk_data_applied(self, result: tuple) -> None:
-        df_copy, markings, data_row_count, needs_empty_row = result
-
-        self.beginResetModel()
-        self.raw_data = df_copy
-        self.sip.grid_data.data_as_df = self.raw_data
-        self.markings = markings
-        self.endResetModel()
-
-        if needs_empty_row:
-            self._insert_empty_rows(1)
-
-        cell_range = CellRange(
-            row_start=0,
-            row_end=self.raw_data.shape[0] - 1,
-            col_start=0,
-            col_end=self.raw_data.shape[1] - 1,
-        )
+        # Bulk edits (paste / cut / delete) bypass setData, so mirror its auto fill here.
+        # super() writes the changed cells and emits a dataChanged over the changed rows,
+        # which repaints the auto filled cells as well.
+        if ColumnName.PATH_IN_SIP in self.raw_data.columns:
+            path_col = self.raw_data.columns.get_loc(ColumnName.PATH_IN_SIP)
+            auto_fill_rows = [
+                (index.row(), self._sanitize_value(value)) for index, value in changes if index.column() == path_col
+            ]
 
-        self.validate_range(cell_range)
+            if auto_fill_rows and ColumnName.TYPE in self.raw_data.columns:
+                self._background_bulk_auto_fill(self.raw_data, auto_fill_rows)
 
-        self.data_rows_changed_signal.emit(data_row_count)
-
-    @staticmethod
-    def _background_build_disabled_markings(
-        df: "pd.DataFrame",
-        disabled_col_indices: list[int],
-    ) -> dict:
-        markings = {}
-
-        for col in disabled_col_indices:
-            for row in df.index:
-                markings[(row, col, MarkingSource.CELL)] = (CellColor.GREY, "")
-
-        return markings
-
-    @staticmethod
-    def _background_count_data_rows(df: "pd.DataFrame") -> int:
-        count = 0
+                for row, _ in auto_fill_rows:
+                    self._mark_disabled_columns_for_row(row)
 
-        for row in range(df.shape[0]):
-            if not AnalogDataVerificationTable._background_is_row_empty(df, row):
-                count += 1
+        super().set_bulk_data(changes)
 
-        return count
+        self._ensure_empty_bottom_row()
+        self.data_rows_changed_signal.emit(self.count_data_rows())
 
     @staticmethod
     def _background_is_row_empty(df: "pd.DataFrame", row: int) -> bool:
@@ -246,6 +186,10 @@ class AnalogDataVerificationTable(CommonDataVerificationTable):
             self.index(row, analoog_col),
         )
 
+        if ColumnName.NAAM in self.raw_data.columns:
+            naam_index = self.index(row, self.raw_data.columns.get_loc(ColumnName.NAAM))
+            self.dataChanged.emit(naam_index, naam_index)
+
         self._mark_disabled_columns_for_row(row)
 
     def _mark_disabled_columns_for_row(self, row: int) -> None:
@@ -274,6 +218,22 @@ class AnalogDataVerificationTable(CommonDataVerificationTable):
         self.shift_markings_for_insert(insert_pos)
         self.endResetModel()
 
+    @property
+    def dirty_data_rows(self) -> list[int] | None:
+        """dirty_rows as positions in get_non_empty_df, None if all of it has to be saved."""
+        dirty_rows = self.dirty_rows
+
+        if dirty_rows is None:
+            return None
+
+        data_row_count = self.count_data_rows()
+
+        # Positions only line up while all data rows come before the empty ones
+        if any(self._is_row_empty(row) for row in range(data_row_count)):
+            return None
+
+        return [row for row in dirty_rows if row < data_row_count]
+
     def get_non_empty_df(self) -> pd.DataFrame:
         non_empty_mask = [not self._is_row_empty(row) for row in range(self.raw_data.shape[0])]
 
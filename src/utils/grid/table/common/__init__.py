@@ -1,6 +1,7 @@
-from src.utils.grid.table.common.data_table import CellColor, DataTable, MarkingSource
+from src.utils.grid.table.common.data_table import DataTable
 from src.utils.grid.table.common.data_verification_table import CommonDataVerificationTable
 from src.utils.grid.table.common.grid_table_view import GridTableView
+from src.utils.grid.table.common.marking_store import CellColor, MarkingSource, MarkingStore
 from src.utils.grid.table.common.proxy_model import SortFilterProxyModel, TableFilter
 
 __all__ = [
@@ -9,6 +10,7 @@ __all__ = [
     "DataTable",
     "GridTableView",
     "MarkingSource",
+    "MarkingStore",
     "SortFilterProxyModel",
     "TableFilter",
 ]
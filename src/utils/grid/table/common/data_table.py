@@ -1,22 +1,13 @@
-from enum import Enum
+from collections.abc import Iterable
 
+import numpy as np
 from pandas import DataFrame
 from PySide6 import QtCore, QtGui
 
 from src.utils.base_object import ApplicationMixin
-from src.utils.constants import ColumnName
+from src.utils.constants import GRID_SNAPSHOT_SOURCE, ColumnName
 from src.utils.data_objects.sip import SIP
-
-
-class CellColor(Enum):
-    RED = QtGui.QBrush(QtGui.QColor(255, 0, 0))
-    YELLOW = QtGui.QBrush(QtGui.QColor(255, 255, 0))
-    GREY = QtGui.QBrush(QtGui.QColor(230, 230, 230))
-
-
-class MarkingSource(Enum):
-    CELL = "cell"
-    WIDE = "wide"
+from src.utils.grid.table.common.marking_store import CellColor, MarkingSource, MarkingStore
 
 
 class DataTable(QtCore.QAbstractTableModel, ApplicationMixin):
@@ -27,11 +18,173 @@ class DataTable(QtCore.QAbstractTableModel, ApplicationMixin):
         self.raw_data: DataFrame = self.sip.grid_data.data_as_df
         self.editable = editable
 
-        self.markings: dict[tuple[int, int, MarkingSource], tuple[CellColor, str]] = {}
+        self.markings = MarkingStore(*self.raw_data.shape)
         self.should_filter_name_column: bool = False
 
+        # Column store: read-only copies of the columns of raw_data (by position) and their row labels.
+        # Cells are painted from it, and snapshots share it, a column is only copied again after it
+        # was written. Derived display values (e.g. the filtered name column) are cached next to it.
+        self._columns: list[np.ndarray | None] = []
+        self._display_columns: dict[int, np.ndarray] = {}
+        self._row_labels: list | None = None
+        self._columns_frame: DataFrame | None = None
+        self._name_col: int | None = None
+        self._snapshot_source = object()
+
+        self.dataChanged.connect(self._drop_columns)
+
+        for signal in (
+            self.modelReset,
+            self.layoutChanged,
+            self.rowsInserted,
+            self.rowsRemoved,
+            self.columnsInserted,
+            self.columnsRemoved,
+        ):
+            signal.connect(self._reset_columns)
+
+        # Rows (positions) written since the last save, None if unknown, e.g. after rows were
+        # removed or raw_data was replaced: then everything has to be saved
+        self._dirty_rows: set[int] | None = None
+        self._dirty_frame: DataFrame | None = None
+
+        self.dataChanged.connect(self._mark_rows_dirty)
+        self.rowsAboutToBeInserted.connect(self._sync_dirty_frame)
+        self.rowsInserted.connect(self._mark_inserted_rows_dirty)
+
+        for signal in (
+            self.modelReset,
+            self.layoutChanged,
+            self.rowsRemoved,
+            self.columnsInserted,
+            self.columnsRemoved,
+        ):
+            signal.connect(self._mark_all_dirty)
+
     def data_index(self, index) -> tuple[int, int]:
-        return self.raw_data.index[index.row()], index.column()
+        return self._row_label(index.row()), index.column()
+
+    def _row_label(self, row: int) -> int:
+        self._sync_columns()
+
+        if self._row_labels is None:
+            self._row_labels = self.raw_data.index.tolist()
+
+        return self._row_labels[row]
+
+    def snapshot(self, columns: Iterable[str] | None = None) -> DataFrame:
+        """Read-only view of (some of) the columns of raw_data, safe to read from another thread.
+
+        Columns keep their order in the grid. Only the columns written since the last snapshot
+        are copied, the others are shared with earlier snapshots. Writing to it raises an error.
+        """
+        wanted = None if columns is None else set(columns)
+        arrays = {
+            column: self._column(col)
+            for col, column in enumerate(self.raw_data.columns)
+            if wanted is None or column in wanted
+        }
+
+        # NOTE: built without copying, every column stays its own (read-only) block
+        snapshot = DataFrame(arrays, index=self.raw_data.index, columns=list(arrays), copy=False)
+        snapshot.attrs[GRID_SNAPSHOT_SOURCE] = self._snapshot_source
+
+        return snapshot
+
+    def _column(self, col: int) -> np.ndarray:
+        self._sync_columns()
+
+        values = self._columns[col]
+
+        if values is None:
+            values = self._columns[col] = self.raw_data.iloc[:, col].to_numpy(copy=True)
+            values.flags.writeable = False
+
+        return values
+
+    def _display_column(self, col: int) -> np.ndarray:
+        self._sync_columns()
+
+        if not self.should_filter_name_column or col != self._name_col:
+            return self._column(col)
+
+        values = self._display_columns.get(col)
+
+        if values is None:
+            values = self._display_columns[col] = np.array(
+                [value.rsplit(".", 1)[0] if isinstance(value, str) else value for value in self._column(col)],
+                dtype=object,
+            )
+
+        return values
+
+    def _sync_columns(self) -> None:
+        # Catches raw_data being replaced without a reset of the model
+        if self.raw_data is not self._columns_frame:
+            self._reset_columns()
+
+    @property
+    def dirty_rows(self) -> list[int] | None:
+        """Rows changed since mark_saved, None if that is not known and all rows have to be saved."""
+        if self._dirty_rows is None or self.raw_data is not self._dirty_frame:
+            return None
+
+        return sorted(self._dirty_rows)
+
+    def mark_saved(self) -> None:
+        self._dirty_rows = set()
+        self._dirty_frame = self.raw_data
+
+    def _mark_rows_dirty(
+        self, top_left: QtCore.QModelIndex, bottom_right: QtCore.QModelIndex, roles: list[int] | None = None
+    ) -> None:
+        if self._dirty_rows is None or not self._is_value_change(roles):
+            return
+
+        self._dirty_rows.update(range(max(top_left.row(), 0), bottom_right.row() + 1))
+
+    def _sync_dirty_frame(self, *_) -> None:
+        if self.raw_data is not self._dirty_frame:
+            self._dirty_rows = None
+
+    def _mark_inserted_rows_dirty(self, parent: QtCore.QModelIndex, first: int, last: int) -> None:
+        # Rows added at the end leave the positions of the other rows as they are
+        if self._dirty_rows is None or last != self.rowCount() - 1:
+            self._dirty_rows = None
+            return
+
+        self._dirty_rows.update(range(first, last + 1))
+
+        # NOTE: the rows may be added by replacing raw_data with a longer copy
+        self._dirty_frame = self.raw_data
+
+    def _mark_all_dirty(self, *_) -> None:
+        self._dirty_rows = None
+
+    @staticmethod
+    def _is_value_change(roles: list[int] | None) -> bool:
+        # Only changes to the values themselves matter, not to how they are shown (e.g. the markings)
+        return not roles or QtCore.Qt.ItemDataRole.EditRole in roles
+
+    def _drop_columns(
+        self, top_left: QtCore.QModelIndex, bottom_right: QtCore.QModelIndex, roles: list[int] | None = None
+    ) -> None:
+        if not self._is_value_change(roles):
+            return
+
+        for col in range(max(top_left.column(), 0), min(bottom_right.column() + 1, len(self._columns))):
+            self._columns[col] = None
+            self._display_columns.pop(col, None)
+
+    def _reset_columns(self, *_) -> None:
+        columns = self.raw_data.columns
+
+        self._columns = [None] * len(columns)
+        self._display_columns = {}
+        self._row_labels = None
+        self._columns_frame = self.raw_data
+        self._name_col = columns.get_loc(ColumnName.NAAM) if ColumnName.NAAM in columns else None
+        self._snapshot_source = object()
 
     def rowCount(self, parent=None) -> int:
         return self.raw_data.shape[0]
@@ -45,16 +198,7 @@ class DataTable(QtCore.QAbstractTableModel, ApplicationMixin):
             return
 
         if role in (QtCore.Qt.ItemDataRole.DisplayRole, QtCore.Qt.ItemDataRole.EditRole):
-            value = self.raw_data.iloc[index.row(), index.column()]
-
-            if (
-                self.should_filter_name_column
-                and ColumnName.NAAM in self.raw_data.columns
-                and index.column() == self.raw_data.columns.get_loc(ColumnName.NAAM)
-            ):
-                value, *_ = value.rsplit(".", 1)
-
-            return value
+            return self._display_column(index.column())[index.row()]
 
         marking = self._resolve_marking(index)
 
@@ -82,13 +226,7 @@ class DataTable(QtCore.QAbstractTableModel, ApplicationMixin):
                 return str(self.raw_data.index[section])
 
     def _resolve_marking(self, index) -> tuple[CellColor, str] | None:
-        row, col = self.data_index(index)
-        wide = self.markings.get((row, col, MarkingSource.WIDE))
-
-        if wide:
-            return wide
-
-        return self.markings.get((row, col, MarkingSource.CELL))
+        return self.markings.resolve(*self.data_index(index))
 
     def flags(self, index):
         base_flags = QtCore.Qt.ItemFlag.ItemIsSelectable | QtCore.Qt.ItemFlag.ItemIsEnabled
@@ -106,16 +244,14 @@ class DataTable(QtCore.QAbstractTableModel, ApplicationMixin):
     def disable_column(self, column_name: str, tooltip: str = "") -> "DataTable":
         col = self.raw_data.columns.get_loc(column_name)
 
-        self.markings.update({(row, col, MarkingSource.CELL): (CellColor.GREY, tooltip) for row in self.raw_data.index})
+        self.markings.mark_rows(self.raw_data.index, col, MarkingSource.CELL, CellColor.GREY, tooltip)
 
         return self
 
     def unmark_cell(self, index, source: MarkingSource = MarkingSource.CELL) -> None:
         row, col = self.data_index(index)
-        key = (row, col, source)
 
-        if key in self.markings:
-            del self.markings[key]
+        self.markings.pop((row, col, source))
 
     def mark_cell(
         self, index, source: MarkingSource = MarkingSource.CELL, warning: bool = False, tooltip: str = ""
@@ -126,15 +262,7 @@ class DataTable(QtCore.QAbstractTableModel, ApplicationMixin):
         self.markings[(row, col, source)] = (color, tooltip)
 
     def shift_markings_for_insert(self, insert_col: int) -> None:
-        updated: dict[tuple[int, int, MarkingSource], tuple[CellColor, str]] = {}
-
-        for (row, col, source), value in self.markings.items():
-            if col >= insert_col:
-                updated[(row, col + 1, source)] = value
-            else:
-                updated[(row, col, source)] = value
-
-        self.markings = updated
+        self.markings.insert_column(insert_col)
 
     def drop_orphan_markings(self) -> None:
         """Remove markings whose row index no longer exists in raw_data.
@@ -143,11 +271,7 @@ class DataTable(QtCore.QAbstractTableModel, ApplicationMixin):
         the old row index become orphans. They are invisible but still count toward
         has_bad_rows, so they must be cleared.
         """
-        live_indices = set(self.raw_data.index)
-        orphan_keys = [key for key in self.markings if key[0] not in live_indices]
-
-        for key in orphan_keys:
-            del self.markings[key]
+        self.markings.keep_rows(self.raw_data.index)
 
     def filter_name_column(self, active: bool) -> None:
         self.should_filter_name_column = active
@@ -160,12 +284,17 @@ class DataTable(QtCore.QAbstractTableModel, ApplicationMixin):
         self.dataChanged.emit(
             self.index(0, name_column),
             self.index(self.rowCount() - 1, name_column),
+            [QtCore.Qt.ItemDataRole.DisplayRole],
         )
 
     @property
     def has_bad_rows(self) -> bool:
-        return any(marking[0] == CellColor.RED for marking in self.markings.values())
+        return self.markings.has_red
 
     @property
     def bad_rows(self) -> list[int]:
-        return list(set(row for (row, _, __), marking in self.markings.items() if marking[0] == CellColor.RED))
+        return self.markings.red_rows
+
+    def is_bad_row(self, row: int) -> bool:
+        """Whether the row at this position has a red marking."""
+        return self.markings.is_red_row(self._row_label(row))
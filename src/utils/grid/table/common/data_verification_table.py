@@ -1,10 +1,14 @@
+from collections.abc import Callable, Iterable
+
+from pandas import DataFrame
 from PySide6 import QtCore
 
-from src.utils.constants import ColumnName, RowType
+from src.utils.constants import GRID_VALIDATION_DEBOUNCE_MS, ColumnName, RowType
 from src.utils.data_objects.sip import SIP
 from src.utils.grid.checks import BaseCheck, BulkResult, CellRange, DateCheck, NameCheck, RRNCheck
 from src.utils.grid.checks.common.date_check import _check_format, _check_series_range, parse_date
 from src.utils.grid.table.common.data_table import CellColor, DataTable, MarkingSource
+from src.utils.workers.executor import TaskPriority, WorkerTask
 from src.utils.workers.worker import Worker
 
 DATE_COLUMNS = {ColumnName.OPENINGSDATUM, ColumnName.SLUITINGSDATUM}
@@ -17,49 +21,154 @@ class CommonDataVerificationTable(DataTable):
 
     COLUMN_VALIDATORS: dict[ColumnName, BaseCheck] = {
         ColumnName.ID_RIJKSREGISTERNUMMER: RRNCheck(),
-        ColumnName.NAAM: NameCheck(),
     }
 
     def __init__(self, sip: SIP, editable: bool = True) -> None:
         super().__init__(sip, editable)
 
-        self._active_workers: list[tuple[Worker, QtCore.QThread]] = []
+        self._active_workers: list[tuple[Worker, WorkerTask]] = []
+
+        # Validation requests are merged into one set of dirty rows and run after a short pause,
+        # one run at a time. Results of a run are only applied if the data did not change meanwhile.
+        # The rows are positions, they are moved along when rows are inserted or removed.
+        self._pending_rows: set[int] = set()
+        self._pending_date_rows: set[int] = set()
+        self._running_rows: list[int] | None = None
+        self._validation_running = False
+        self._data_version = 0
+        self._layout_version = 0
+
+        self._validation_timer = QtCore.QTimer(self)
+        self._validation_timer.setSingleShot(True)
+        self._validation_timer.setInterval(GRID_VALIDATION_DEBOUNCE_MS)
+        self._validation_timer.timeout.connect(self._start_pending_validation)
+
+        self.dataChanged.connect(self._on_data_changed)
+        self.rowsInserted.connect(self._move_rows_for_insert)
+        self.rowsRemoved.connect(self._move_rows_for_remove)
+        self.modelReset.connect(self._reset_pending_rows)
+        self.layoutChanged.connect(self._reset_pending_rows)
+
+        for signal in (
+            self.modelReset,
+            self.layoutChanged,
+            self.rowsInserted,
+            self.rowsRemoved,
+            self.columnsInserted,
+            self.columnsRemoved,
+        ):
+            signal.connect(self._bump_data_version)
+
+        for signal in (self.modelReset, self.layoutChanged, self.rowsInserted, self.rowsRemoved):
+            signal.connect(self._bump_layout_version)
 
         date_check = DateCheck(series_provider=lambda: self.sip.series)
 
+        # NOTE: NameCheck keeps a uniqueness index of the grid, so every table needs its own
         self.COLUMN_VALIDATORS = {
             **self.COLUMN_VALIDATORS,
+            ColumnName.NAAM: NameCheck(),
             ColumnName.OPENINGSDATUM: date_check,
             ColumnName.SLUITINGSDATUM: date_check,
         }
 
     @property
     def is_validating(self) -> bool:
-        return len(self._active_workers) > 0
+        return len(self._active_workers) > 0 or self._validation_running or len(self._pending_rows) > 0
+
+    def _bump_data_version(self, *_) -> None:
+        self._data_version += 1
+
+    def _bump_layout_version(self, *_) -> None:
+        self._layout_version += 1
+
+    def _on_data_changed(
+        self, top_left: QtCore.QModelIndex, bottom_right: QtCore.QModelIndex, roles: list[int] | None = None
+    ) -> None:
+        # NOTE: applying validation results only changes the markings, that does not make a running validation stale
+        if self._is_value_change(roles):
+            self._bump_data_version()
+
+    def _move_rows_for_insert(self, parent: QtCore.QModelIndex, first: int, last: int) -> None:
+        count = last - first + 1
+        move = lambda rows: [row + count if row >= first else row for row in rows]
+
+        self._move_pending_rows(move)
+
+    def _move_rows_for_remove(self, parent: QtCore.QModelIndex, first: int, last: int) -> None:
+        count = last - first + 1
+        move = lambda rows: [row - count if row > last else row for row in rows if not first <= row <= last]
+
+        self._move_pending_rows(move)
+
+    def _move_pending_rows(self, move: Callable[[Iterable[int]], list[int]]) -> None:
+        self._pending_rows = set(move(self._pending_rows))
+        self._pending_date_rows = set(move(self._pending_date_rows))
+
+        if self._running_rows is not None:
+            self._running_rows = move(self._running_rows)
+
+    def _reset_pending_rows(self, *_) -> None:
+        # The old positions mean nothing anymore, whatever was still to be validated is validated again in full
+        # NOTE: the dossier dates of pending date edits can't be found back, they are not auto-updated
+        self._pending_date_rows.clear()
+
+        if not self._pending_rows and self._running_rows is None:
+            return
+
+        all_rows = range(self.raw_data.shape[0])
+        self._pending_rows = set(all_rows)
+
+        if self._running_rows is not None:
+            self._running_rows = list(all_rows)
 
     def _sanitize_value(self, value: str) -> str:
         return str(value).encode(encoding="utf-8", errors="replace").decode("utf-8")
 
-    def _get_empty_rows(self) -> set[int]:
-        if ColumnName.TYPE not in self.raw_data.columns:
+    def _get_empty_rows(self, data: DataFrame) -> set[int]:
+        if ColumnName.TYPE not in data.columns:
             return set()
 
-        type_col = self.raw_data.columns.get_loc(ColumnName.TYPE)
+        type_col = data.columns.get_loc(ColumnName.TYPE)
 
-        return {row for row in range(self.raw_data.shape[0]) if self.raw_data.iat[row, type_col] == RowType.GEEN}
+        return {row for row in range(data.shape[0]) if data.iat[row, type_col] == RowType.GEEN}
 
-    def _run_bulk_validators(self, cell_range: CellRange) -> tuple[list[BulkResult], set[int]]:
-        results: list[BulkResult] = []
-        empty_rows = self._get_empty_rows()
+    def _validation_columns(self) -> set[str] | None:
+        """Columns the validation reads (None for all of them), the rest is left out of its snapshot."""
+        columns = list(self.raw_data.columns)
+        needed = {ColumnName.TYPE.value}
 
         for column_name, check in self.COLUMN_VALIDATORS.items():
-            if column_name.value not in self.raw_data.columns:
-                continue
+            if column_name.value in columns:
+                needed.add(column_name.value)
+                needed.update(check.required_columns(columns))
+
+        return needed
+
+    def _run_bulk_validators(
+        self, data: DataFrame, grid_cols: list[int], cell_ranges: list[CellRange]
+    ) -> tuple[list[tuple[CellRange, list[BulkResult]]], set[int]]:
+        """Validate a snapshot, grid_cols maps its column positions to the ones in the grid."""
+        runs: list[tuple[CellRange, list[BulkResult]]] = []
+        empty_rows = self._get_empty_rows(data)
+
+        for cell_range in cell_ranges:
+            results: list[BulkResult] = []
+
+            for column_name, check in self.COLUMN_VALIDATORS.items():
+                if column_name.value not in data.columns:
+                    continue
+
+                col = data.columns.get_loc(column_name.value)
+                results.extend(
+                    (row, grid_cols[result_col], value, cell_tooltip, wide_tooltip)
+                    for row, result_col, value, cell_tooltip, wide_tooltip in check.check_bulk(data, col, cell_range)
+                    if row not in empty_rows
+                )
 
-            col = self.raw_data.columns.get_loc(column_name.value)
-            results.extend(r for r in check.check_bulk(self.raw_data, col, cell_range) if r[0] not in empty_rows)
+            runs.append((cell_range, results))
 
-        return results, empty_rows
+        return runs, empty_rows
 
     def _apply_bulk_results(
         self,
@@ -93,10 +202,12 @@ class CommonDataVerificationTable(DataTable):
         max_row = 0
         min_col = float("inf")
         max_col = 0
+        values_written = False
 
         for row, col, value, cell_tooltip, wide_tooltip in results:
             if value is not None:
                 self.raw_data.iat[row, col] = value
+                values_written = True
 
             index = self.index(row, col)
 
@@ -118,9 +229,16 @@ class CommonDataVerificationTable(DataTable):
             max_col = self.raw_data.shape[1] - 1
 
         if min_row <= max_row:
+            # NOTE: without written values only the markings changed, so the column snapshots stay valid
+            roles = []
+
+            if not values_written:
+                roles = [QtCore.Qt.ItemDataRole.BackgroundRole, QtCore.Qt.ItemDataRole.ToolTipRole]
+
             self.dataChanged.emit(
                 self.index(min_row, min_col),
                 self.index(max_row, max_col),
+                roles,
             )
 
     def _clear_validator_markings(self, cell_range: CellRange, empty_rows: set[int]) -> None:
@@ -128,24 +246,14 @@ class CommonDataVerificationTable(DataTable):
         bounded_range = set(range(cell_range.row_start, min(cell_range.row_end + 1, max_row + 1)))
         non_empty_range = bounded_range - empty_rows
         valid_empty_rows = empty_rows & bounded_range
-        non_empty_indices = {self.raw_data.index[row] for row in non_empty_range}
-        empty_indices = {self.raw_data.index[row] for row in valid_empty_rows}
-
-        keys_to_remove = [
-            key
-            for key in self.markings
-            if (
-                key[0] in non_empty_indices
-                and (
-                    (key[2] == MarkingSource.WIDE)
-                    or (key[2] == MarkingSource.CELL and self.markings[key][0] != CellColor.GREY)
-                )
-            )
-            or (key[0] in empty_indices and self.markings[key][0] == CellColor.RED)
-        ]
+        non_empty_indices = [self.raw_data.index[row] for row in non_empty_range]
+        empty_indices = [self.raw_data.index[row] for row in valid_empty_rows]
 
-        for key in keys_to_remove:
-            del self.markings[key]
+        self.markings.clear(non_empty_indices, MarkingSource.WIDE, CellColor)
+        self.markings.clear(non_empty_indices, MarkingSource.CELL, (CellColor.RED, CellColor.YELLOW))
+
+        for source in MarkingSource:
+            self.markings.clear(empty_indices, source, (CellColor.RED,))
 
     def validate_all(self) -> None:
         if not self.raw_data.shape[0]:
@@ -163,15 +271,98 @@ class CommonDataVerificationTable(DataTable):
     def validate_range(self, cell_range: CellRange) -> None:
         self.validation_started_signal.emit()
 
-        Worker.start(
-            lambda: self._run_bulk_validators(cell_range),
-            on_result=lambda result: self._apply_bulk_results(result[0], cell_range, result[1]),
-            on_finished=self._check_validation_complete,
+        self._pending_rows.update(range(cell_range.row_start, cell_range.row_end + 1))
+        self._validation_timer.start()
+
+    def _pending_cell_ranges(self) -> tuple[list[int], list[CellRange]]:
+        rows = sorted(row for row in self._pending_rows if row < self.raw_data.shape[0])
+        self._pending_rows.clear()
+
+        # Consecutive rows are validated as one range
+        cell_ranges: list[CellRange] = []
+        last_col = self.raw_data.shape[1] - 1
+
+        for row in rows:
+            if cell_ranges and cell_ranges[-1].row_end == row - 1:
+                cell_ranges[-1].row_end = row
+            else:
+                cell_ranges.append(CellRange(row_start=row, row_end=row, col_start=0, col_end=last_col))
+
+        return rows, cell_ranges
+
+    def _start_pending_validation(self) -> None:
+        # NOTE: one run at a time, requests that come in meanwhile are picked up when it is done
+        if self._validation_running:
+            return
+
+        rows, cell_ranges = self._pending_cell_ranges()
+
+        if not cell_ranges:
+            self._check_validation_complete()
+            return
+
+        version = (self._data_version, self._layout_version)
+
+        # NOTE: the worker only reads the snapshot, so the grid can be edited while it runs
+        data = self.snapshot(self._validation_columns())
+        grid_cols = [self.raw_data.columns.get_loc(column) for column in data.columns]
+
+        self._validation_running = True
+        self._running_rows = rows
+
+        worker = Worker.start(
+            lambda: self._run_bulk_validators(data, grid_cols, cell_ranges),
+            on_result=lambda result: self._on_validation_result(result, version),
+            on_finished=self._on_validation_run_done,
             track_in=self._active_workers,
+            priority=TaskPriority.INTERACTIVE,
         )
+        worker.stopped_forcibly_signal.connect(self._on_validation_run_done)
+
+    def _on_validation_result(self, result: tuple, version: tuple[int, int]) -> None:
+        runs, empty_rows = result
+        data_version, layout_version = version
+
+        if data_version != self._data_version:
+            # The data changed while validating: validate the rows again, including the rows this
+            # run found to be affected (e.g. a duplicate elsewhere in the grid)
+            self._pending_rows.update(self._running_rows)
+
+            if layout_version == self._layout_version:
+                self._pending_rows.update(r[0] for _, results in runs for r in results)
+            else:
+                # NOTE: the results hold positions from before rows moved, so any row may be affected
+                self._pending_rows.update(range(self.raw_data.shape[0]))
+
+            self._running_rows = None
+            return
+
+        self._running_rows = None
+
+        for cell_range, results in runs:
+            self._apply_bulk_results(results, cell_range, empty_rows)
+
+        if self._pending_date_rows:
+            date_rows, self._pending_date_rows = self._pending_date_rows, set()
+
+            for dossier_row_pos, col, value in self._compute_auto_updates(date_rows):
+                self.setData(self.index(dossier_row_pos, col), value)
+
+    def _on_validation_run_done(self) -> None:
+        # A run that was stopped or gave no result has to be done again
+        if self._running_rows is not None:
+            self._pending_rows.update(self._running_rows)
+            self._running_rows = None
+
+        self._validation_running = False
+
+        if self._pending_rows:
+            self._validation_timer.start()
+        else:
+            self._check_validation_complete()
 
     def _check_validation_complete(self) -> None:
-        if not self._active_workers:
+        if not self.is_validating:
             self.validation_finished_signal.emit()
 
     def _validate_single_row(self, row: int) -> None:
@@ -215,51 +406,33 @@ class CommonDataVerificationTable(DataTable):
             worker.stale = True
             worker.forcibly_stop_signal.emit()
 
-        # Write changes directly to raw_data on the main thread
-        date_rows: set[int] = set()
+        # Write changes directly to raw_data on the main thread, a column at a time
+        values_by_col: dict[int, dict[int, str]] = {}
 
         for index, value in changes:
-            value = self._sanitize_value(value)
-            self.raw_data.iat[index.row(), index.column()] = value
+            values_by_col.setdefault(index.column(), {})[index.row()] = self._sanitize_value(value)
 
-            if self.raw_data.columns[index.column()] in DATE_COLUMNS:
-                date_rows.add(index.row())
-
-        self.dataChanged.emit(
-            self.index(0, 0),
-            self.index(self.raw_data.shape[0] - 1, self.raw_data.shape[1] - 1),
-        )
-        self.data_edited_signal.emit()
+        date_rows: set[int] = set()
 
-        # Run validation in background on the current raw_data
-        cell_range = CellRange(
-            row_start=0,
-            row_end=self.raw_data.shape[0] - 1,
-            col_start=0,
-            col_end=self.raw_data.shape[1] - 1,
-        )
+        for col, values in values_by_col.items():
+            self.raw_data.iloc[list(values), col] = list(values.values())
 
-        self._validate_and_auto_update(cell_range, date_rows)
+            if self.raw_data.columns[col] in DATE_COLUMNS:
+                date_rows.update(values)
 
-    def _validate_and_auto_update(self, cell_range: CellRange, date_rows: set[int]) -> None:
-        self.validation_started_signal.emit()
+        # NOTE: whole rows, subclasses derive values in other columns of the changed rows
+        changed_rows = [index.row() for index, _ in changes]
 
-        Worker.start(
-            lambda: self._run_bulk_validators(cell_range),
-            on_result=lambda result: self._on_validation_applied(result, cell_range, date_rows),
-            on_finished=self._check_validation_complete,
-            track_in=self._active_workers,
+        self.dataChanged.emit(
+            self.index(min(changed_rows), 0),
+            self.index(max(changed_rows), self.raw_data.shape[1] - 1),
         )
+        self.data_edited_signal.emit()
 
-    def _on_validation_applied(self, result: tuple, cell_range: CellRange, date_rows: set[int]) -> None:
-        results, empty_rows = result
-
-        self._apply_bulk_results(results, cell_range, empty_rows)
+        # Validate everything in the background, the dossier dates are updated once that is applied
+        self._pending_date_rows.update(date_rows)
 
-        if date_rows:
-            auto_updates = self._compute_auto_updates(date_rows)
-            for dossier_row_pos, col, value in auto_updates:
-                self.setData(self.index(dossier_row_pos, col), value)
+        self.validate_all()
 
     def _compute_auto_updates(self, date_rows: set[int]) -> list[tuple[int, int, str]]:
         if ColumnName.TYPE not in self.raw_data.columns:
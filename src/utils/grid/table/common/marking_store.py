@@ -0,0 +1,316 @@
+"""
+Storage for the cell markings of a grid.
+
+Markings are kept in (source, row, col) arrays of color codes and interned tooltip ids, with a
+per-row count of red markings next to them. That makes has_red and row lookups O(1), and lets
+whole rows/columns be (un)marked with a single array operation.
+
+Rows are the index labels of the DataFrame, not positions. They index the arrays directly, so
+they have to be non-negative integers (the grids use a RangeIndex, possibly with gaps after rows
+were removed); anything else raises instead of being silently cast or wrapped around.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+from enum import Enum
+
+import numpy as np
+from PySide6 import QtGui
+
+
+class CellColor(Enum):
+    RED = QtGui.QBrush(QtGui.QColor(255, 0, 0))
+    YELLOW = QtGui.QBrush(QtGui.QColor(255, 255, 0))
+    GREY = QtGui.QBrush(QtGui.QColor(230, 230, 230))
+
+
+class MarkingSource(Enum):
+    CELL = "cell"
+    WIDE = "wide"
+
+
+# Code 0 means no marking
+_COLORS = (None, CellColor.RED, CellColor.YELLOW, CellColor.GREY)
+_COLOR_CODES = {color: code for code, color in enumerate(_COLORS) if color is not None}
+_RED = _COLOR_CODES[CellColor.RED]
+
+_SOURCES = (MarkingSource.CELL, MarkingSource.WIDE)
+_SOURCE_CODES = {source: code for code, source in enumerate(_SOURCES)}
+
+MarkingKey = tuple[int, int, MarkingSource]
+Marking = tuple[CellColor, str]
+
+
+def _check_row(row: int) -> None:
+    if not isinstance(row, (int, np.integer)) or isinstance(row, bool):
+        raise TypeError(f"Marking rows are integer index labels, got {row!r}")
+
+    if row < 0:
+        raise ValueError(f"Marking rows can't be negative, got {row}")
+
+
+def _row_array(rows: Iterable[int]) -> np.ndarray:
+    """The row labels as an int64 array, see the module docstring for why they have to be integers."""
+    rows = np.asarray(rows if isinstance(rows, np.ndarray) else list(rows))
+
+    if not len(rows):
+        return np.empty(0, dtype=np.int64)
+
+    if rows.dtype.kind not in "iu":
+        raise TypeError(f"Marking rows are integer index labels, got {rows.dtype} labels")
+
+    if rows.min() < 0:
+        raise ValueError(f"Marking rows can't be negative, got {rows.min()}")
+
+    return rows.astype(np.int64, copy=False)
+
+
+class MarkingStore:
+    """Array-backed replacement for a {(row, col, source): (color, tooltip)} dict, with the same interface."""
+
+    def __init__(self, rows: int = 0, cols: int = 0) -> None:
+        self._colors = np.zeros((len(_SOURCES), rows, cols), dtype=np.int8)
+        self._tooltips = np.zeros((len(_SOURCES), rows, cols), dtype=np.int32)
+        self._red_counts = np.zeros(rows, dtype=np.int32)
+
+        self._tooltip_texts: list[str] = [""]
+        self._tooltip_ids: dict[str, int] = {"": 0}
+
+        self._bad_rows: set[int] = set()
+        self._count = 0
+
+    # Dict interface
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: MarkingKey) -> bool:
+        row, col, source = key
+
+        return self._in_bounds(row, col) and self._colors[_SOURCE_CODES[source], row, col] != 0
+
+    def __getitem__(self, key: MarkingKey) -> Marking:
+        marking = self.get(key)
+
+        if marking is None:
+            raise KeyError(key)
+
+        return marking
+
+    def get(self, key: MarkingKey, default: Marking | None = None) -> Marking | None:
+        row, col, source = key
+
+        if not self._in_bounds(row, col):
+            return default
+
+        s = _SOURCE_CODES[source]
+        code = self._colors[s, row, col]
+
+        if code == 0:
+            return default
+
+        return _COLORS[code], self._tooltip_texts[self._tooltips[s, row, col]]
+
+    def __setitem__(self, key: MarkingKey, marking: Marking) -> None:
+        row, col, source = key
+        color, tooltip = marking
+
+        _check_row(row)
+        self._ensure_capacity(row + 1, col + 1)
+        self._set(_SOURCE_CODES[source], row, col, _COLOR_CODES[color], self._intern(tooltip))
+
+    def __delitem__(self, key: MarkingKey) -> None:
+        if key not in self:
+            raise KeyError(key)
+
+        row, col, source = key
+        self._set(_SOURCE_CODES[source], row, col, 0, 0)
+
+    def pop(self, key: MarkingKey, default: Marking | None = None) -> Marking | None:
+        marking = self.get(key)
+
+        if marking is None:
+            return default
+
+        del self[key]
+
+        return marking
+
+    def update(self, markings: Mapping[MarkingKey, Marking]) -> None:
+        for key, marking in markings.items():
+            self[key] = marking
+
+    def __iter__(self) -> Iterator[MarkingKey]:
+        for s, row, col in zip(*np.nonzero(self._colors)):
+            yield int(row), int(col), _SOURCES[s]
+
+    def keys(self) -> Iterator[MarkingKey]:
+        return iter(self)
+
+    def values(self) -> Iterator[Marking]:
+        for _, marking in self.items():
+            yield marking
+
+    def items(self) -> Iterator[tuple[MarkingKey, Marking]]:
+        for s, row, col in zip(*np.nonzero(self._colors)):
+            yield (
+                (int(row), int(col), _SOURCES[s]),
+                (_COLORS[self._colors[s, row, col]], self._tooltip_texts[self._tooltips[s, row, col]]),
+            )
+
+    # Lookups
+
+    def resolve(self, row: int, col: int) -> Marking | None:
+        """The marking shown for a cell: the wide one if there is one, otherwise the cell one."""
+        if not self._in_bounds(row, col):
+            return None
+
+        # NOTE: called for every painted cell, item() avoids creating numpy scalars
+        for s in (_SOURCE_CODES[MarkingSource.WIDE], _SOURCE_CODES[MarkingSource.CELL]):
+            code = self._colors.item(s, row, col)
+
+            if code != 0:
+                return _COLORS[code], self._tooltip_texts[self._tooltips.item(s, row, col)]
+
+        return None
+
+    @property
+    def has_red(self) -> bool:
+        return bool(self._bad_rows)
+
+    def is_red_row(self, row: int) -> bool:
+        return row in self._bad_rows
+
+    @property
+    def red_rows(self) -> list[int]:
+        return list(self._bad_rows)
+
+    # Bulk operations
+
+    def mark_rows(self, rows: Iterable[int], col: int, source: MarkingSource, color: CellColor, tooltip: str) -> None:
+        rows = np.unique(_row_array(rows))
+
+        if not len(rows):
+            return
+
+        self._ensure_capacity(int(rows[-1]) + 1, col + 1)
+
+        s = _SOURCE_CODES[source]
+        old_codes = self._colors[s, rows, col]
+        new_code = _COLOR_CODES[color]
+
+        self._count += int(np.count_nonzero(old_codes == 0))
+        self._adjust_red_counts(rows, int(new_code == _RED) - (old_codes == _RED).astype(np.int32))
+
+        self._colors[s, rows, col] = new_code
+        self._tooltips[s, rows, col] = self._intern(tooltip)
+
+    def clear(self, rows: Iterable[int], source: MarkingSource, colors: Iterable[CellColor]) -> None:
+        """Remove the markings of the given colors from source in whole rows."""
+        rows = np.unique(_row_array(rows))
+        rows = rows[rows < self._colors.shape[1]]
+
+        if not len(rows):
+            return
+
+        s = _SOURCE_CODES[source]
+        codes = self._colors[s, rows]
+        cleared = np.isin(codes, [_COLOR_CODES[color] for color in colors])
+
+        if not cleared.any():
+            return
+
+        self._count -= int(np.count_nonzero(cleared))
+        self._adjust_red_counts(rows, -np.count_nonzero(cleared & (codes == _RED), axis=1))
+
+        codes[cleared] = 0
+        tooltips = self._tooltips[s, rows]
+        tooltips[cleared] = 0
+
+        self._colors[s, rows] = codes
+        self._tooltips[s, rows] = tooltips
+
+    def insert_column(self, col: int) -> None:
+        """Shift the markings at or right of col one column to the right."""
+        if col > self._colors.shape[2]:
+            return
+
+        self._colors = np.insert(self._colors, col, 0, axis=2)
+        self._tooltips = np.insert(self._tooltips, col, 0, axis=2)
+
+    def keep_rows(self, rows: Iterable[int]) -> None:
+        """Remove the markings of every row not in rows."""
+        live = np.zeros(self._colors.shape[1], dtype=bool)
+        live_rows = _row_array(rows)
+        live[live_rows[live_rows < len(live)]] = True
+
+        orphan_rows = np.flatnonzero(~live & self._colors.any(axis=(0, 2)))
+
+        for source in _SOURCES:
+            self.clear(orphan_rows, source, _COLOR_CODES)
+
+    # Internals
+
+    def _in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self._colors.shape[1] and 0 <= col < self._colors.shape[2]
+
+    def _ensure_capacity(self, rows: int, cols: int) -> None:
+        current_rows, current_cols = self._colors.shape[1:]
+
+        if rows <= current_rows and cols <= current_cols:
+            return
+
+        # Grow by doubling, so marking rows one by one stays amortized O(1)
+        new_rows = max(rows, current_rows * 2) if rows > current_rows else current_rows
+        new_cols = max(cols, current_cols)
+
+        colors = np.zeros((len(_SOURCES), new_rows, new_cols), dtype=np.int8)
+        tooltips = np.zeros((len(_SOURCES), new_rows, new_cols), dtype=np.int32)
+        red_counts = np.zeros(new_rows, dtype=np.int32)
+
+        colors[:, :current_rows, :current_cols] = self._colors
+        tooltips[:, :current_rows, :current_cols] = self._tooltips
+        red_counts[:current_rows] = self._red_counts
+
+        self._colors, self._tooltips, self._red_counts = colors, tooltips, red_counts
+
+    def _intern(self, tooltip: str) -> int:
+        tooltip_id = self._tooltip_ids.get(tooltip)
+
+        if tooltip_id is None:
+            tooltip_id = self._tooltip_ids[tooltip] = len(self._tooltip_texts)
+            self._tooltip_texts.append(tooltip)
+
+        return tooltip_id
+
+    def _set(self, s: int, row: int, col: int, code: int, tooltip_id: int) -> None:
+        old_code = int(self._colors[s, row, col])
+
+        self._count += (code != 0) - (old_code != 0)
+
+        if (old_code == _RED) != (code == _RED):
+            count = self._red_counts[row] = self._red_counts[row] + (1 if code == _RED else -1)
+
+            if count > 0:
+                self._bad_rows.add(int(row))
+            else:
+                self._bad_rows.discard(int(row))
+
+        self._colors[s, row, col] = code
+        self._tooltips[s, row, col] = tooltip_id
+
+    def _adjust_red_counts(self, rows: np.ndarray, deltas: np.ndarray) -> None:
+        deltas = np.broadcast_to(deltas, rows.shape)
+        changed = deltas != 0
+
+        if not changed.any():
+            return
+
+        rows, deltas = rows[changed], deltas[changed]
+
+        self._red_counts[rows] += deltas
+
+        for row, count in zip(rows.tolist(), self._red_counts[rows].tolist()):
+            if count > 0:
+                self._bad_rows.add(row)
+            else:
+                self._bad_rows.discard(row)
@@ -53,7 +53,7 @@ class SortFilterProxyModel(QtCore.QSortFilterProxyModel):
         for table_filter in self.active_filters:
             match table_filter:
                 case TableFilter.BAD_ROWS:
-                    if source_row not in model.bad_rows:
+                    if not model.is_bad_row(source_row):
                         return False
 
                 case TableFilter.DOSSIERS_ONLY:
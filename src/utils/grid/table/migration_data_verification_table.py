@@ -61,16 +61,19 @@ class MigrationDataVerificationTable(CommonDataVerificationTable):
             type_col = self.raw_data.columns.get_loc(ColumnName.TYPE)
             dossier_ref_col = self.raw_data.columns.get_loc(ColumnName.DOSSIER_REF)
 
-            for index, value in changes:
-                if index.column() != path_col:
-                    continue
-
-                new_type, new_ref = self._derive_type_and_dossier_ref(str(value))
-                self.raw_data.iat[index.row(), type_col] = new_type
-                self.raw_data.iat[index.row(), dossier_ref_col] = new_ref
-
-        # super() writes the Path in SIP cells and emits a full-grid dataChanged,
-        # which repaints the Type/DossierRef cells updated above.
+            derived = {
+                index.row(): self._derive_type_and_dossier_ref(str(value))
+                for index, value in changes
+                if index.column() == path_col
+            }
+
+            if derived:
+                rows = list(derived)
+                self.raw_data.iloc[rows, type_col] = [new_type for new_type, _ in derived.values()]
+                self.raw_data.iloc[rows, dossier_ref_col] = [new_ref for _, new_ref in derived.values()]
+
+        # super() writes the Path in SIP cells and emits a dataChanged over the changed
+        # rows, which repaints the Type/DossierRef cells updated above.
         super().set_bulk_data(changes)
 
     def _infer_missing_type_and_dossier_ref(self) -> None:
@@ -2,11 +2,9 @@
 Some basic helper functions that have no place anywhere else
 """
 
-import os
-import re
 from typing import Any
 
-from src.utils.constants import FILE_REGEXES_TO_IGNORE
+from src.utils.file_scanner import scan_dossiers
 
 
 def get_attr_deep(widget: object, attr: str) -> Any:
@@ -22,17 +20,9 @@ def get_attr_deep(widget: object, attr: str) -> Any:
 
 
 def count_files_from_dirs(directories: str) -> int:
-    amount_of_files = 0
-
-    for directory in directories:
-        for root, _, files in os.walk(directory):
-            amount_of_files += len(
-                [
-                    file
-                    for file in files
-                    if os.path.getsize(os.path.join(root, file)) != 0
-                    and not any(re.match(reg, file) is not None for reg in FILE_REGEXES_TO_IGNORE)
-                ]
-            )
-
-    return amount_of_files
+    return sum(
+        1
+        for scanned in scan_dossiers(directories)
+        for entry in scanned
+        if entry.is_file and entry.size != 0 and not entry.is_ignored
+    )
@@ -0,0 +1,28 @@
+"""
+Background import of the heavy libraries
+
+Modules that pull in pandas, openpyxl or requests import them where they are used, so none of
+them slow down startup. Importing them on a daemon thread once the application is idle means the
+first grid, Excel file or API call usually doesn't pay for the import either.
+
+Only third-party libraries are warmed up: the src modules (grid, tab windows, ...) create Qt
+objects and are imported on the main thread, on first use.
+"""
+
+import importlib
+import threading
+
+from src.utils.constants import WARM_UP_MODULES
+
+
+def _import_modules() -> None:
+    for module_name in WARM_UP_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            # NOTE: not fatal, the module is imported again (and fails loudly) where it's used
+            pass
+
+
+def start_warm_up() -> None:
+    threading.Thread(target=_import_modules, name="warm-up", daemon=True).start()
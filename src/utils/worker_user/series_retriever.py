@@ -1,27 +1,37 @@
 """
 This class uses workers to retrieve series in the background.
 It contains handlers and the main call to start the worker.
+
+The series of the last retrieval are stored in the main DB. When there are stored series for an
+environment, they are served right away and the retrieval only refreshes them: once it is done,
+the differences are emitted with series_refreshed_signal.
 """
 
+from collections.abc import Iterator
+
 from PySide6 import QtCore
 
-from src.controller.api_controller import APIController
 from src.controller.worker_controller import WorkerController
 
 from src.utils.constants import PROD_ENVIRONMENT_NAME, TI_ENVIRONMENT_NAME
-from src.utils.data_objects.series import Series
+from src.utils.data_objects.series import Series, SeriesDiff
 from src.utils.worker_user.worker_user import WorkerUser
 from src.utils.workers.worker import Worker
 
 
 class SeriesRetriever(WorkerUser):
     finished_signal = QtCore.Signal()
+    # Every environment has series to work with, stored or retrieved
+    series_available_signal = QtCore.Signal()
+    series_refreshed_signal = QtCore.Signal((str, SeriesDiff), arguments=["environment_name", "diff"])
     error_occurred_signal = QtCore.Signal(Exception)
 
     def __init__(self):
         super().__init__()
 
         self._retrieval_done: dict[str, bool] = {}
+        # Environments without stored series, whose retrieval has to be waited for
+        self._waiting_for: set[str] = set()
 
         self.application.force_stop_series_retrieval_signal.connect(self.force_stop_handler)
 
@@ -33,6 +43,7 @@ class SeriesRetriever(WorkerUser):
             TI_ENVIRONMENT_NAME: False,
             PROD_ENVIRONMENT_NAME: False,
         }
+        self._waiting_for = set()
         self.application.series_retrieval_busy = True
 
         self.ti_worker = self.run_environment_series(worker_controller, TI_ENVIRONMENT_NAME)
@@ -44,6 +55,12 @@ class SeriesRetriever(WorkerUser):
         if self.prod_worker is None:
             self.series_retrieval_done_handler(PROD_ENVIRONMENT_NAME)
 
+        self._check_series_available()
+
+    @property
+    def is_running(self) -> bool:
+        return not all(self._retrieval_done.values())
+
     def run_environment_series(self, worker_controller: WorkerController, environment_name: str) -> Worker:
         # NOTE: only run if we have to
         if self.application.sneaky_series()[environment_name]:
@@ -54,32 +71,82 @@ class SeriesRetriever(WorkerUser):
         if not environment.has_api_credentials():
             return
 
-        worker = worker_controller.run_thread(
-            thread_function=lambda: APIController.get_series(environment=environment), thread_is_generator=True
-        )
+        stored_series = self.application.main_db_controller.read_series_catalog(environment_name)
+
+        if stored_series:
+            self.application.add_series(environment_name=environment_name, series=stored_series)
+        else:
+            self._waiting_for.add(environment_name)
+
+        def get_series() -> Iterator[list[Series]]:
+            # NOTE: imported on the worker, requests is slow to import and not needed before
+            from src.controller.api_controller import APIController
+
+            yield from APIController.get_series(environment=environment)
+
+        worker = worker_controller.run_thread(thread_function=get_series, thread_is_generator=True)
 
         if worker is None:
+            self._waiting_for.discard(environment_name)
             return
 
-        worker.result_ready_signal.connect(
-            lambda series: self.new_series_ready_handler(series=series, environment_name=environment_name)
+        retrieved_series: list[Series] = []
+        errors: list[Exception] = []
+
+        worker.result_ready_signal.connect(retrieved_series.extend)
+
+        # NOTE: stored series are only replaced once the retrieval is complete
+        if not stored_series:
+            worker.result_ready_signal.connect(
+                lambda series: self.new_series_ready_handler(series=series, environment_name=environment_name)
+            )
+
+        worker.finished_signal.connect(
+            lambda: self.series_retrieved_handler(
+                environment_name=environment_name,
+                series=retrieved_series,
+                refresh=bool(stored_series),
+                worker=worker,
+                failed=bool(errors),
+            )
         )
         worker.about_to_finish_signal.connect(
             lambda: self.series_retrieval_done_handler(environment_name=environment_name)
         )
+        worker.error_encountered_signal.connect(errors.append)
         worker.error_encountered_signal.connect(self.error_occurred_signal.emit)
 
         return worker
 
+    def _check_series_available(self) -> None:
+        if self.application.series_retrieval_busy and not self._waiting_for:
+            self.application.series_retrieval_busy = False
+            self.series_available_signal.emit()
+
     # Handlers
     def new_series_ready_handler(self, series: list[Series], environment_name: str) -> None:
         self.application.add_series(environment_name=environment_name, series=series)
 
+    def series_retrieved_handler(
+        self, environment_name: str, series: list[Series], refresh: bool, worker: Worker, failed: bool
+    ) -> None:
+        # NOTE: the retrieval can be stopped (e.g. the credentials changed) after it finished, but before this runs
+        if failed or worker.force_stop:
+            return
+
+        self.application.main_db_controller.write_series_catalog(environment_name, series)
+
+        if refresh:
+            diff = SeriesDiff.between(self.application.sneaky_series()[environment_name], series)
+            self.series_refreshed_signal.emit(environment_name, diff)
+
     def series_retrieval_done_handler(self, environment_name: str) -> None:
         self._retrieval_done[environment_name] = True
+        self._waiting_for.discard(environment_name)
+
+        self._check_series_available()
 
         if all(self._retrieval_done.values()):
-            self.application.series_retrieval_busy = False
             self.finished_signal.emit()
 
     def force_stop_handler(self, environment_name: str) -> None:
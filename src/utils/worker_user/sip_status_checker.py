@@ -1,12 +1,24 @@
+import random
+import threading
 import time
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 
 from PySide6 import QtCore
 
-from src.controller.api_controller import APIController, SIPNotFoundError
 from src.controller.worker_controller import WorkerController
 
-from src.utils.constants import CHECKABLE_SIP_STATUSES, POLL_INTERVAL_SECONDS
+from src.utils.constants import (
+    CHECKABLE_SIP_STATUSES,
+    POLL_INTERVAL_SECONDS,
+    STATUS_POLL_BACKOFF_STEP_SECONDS,
+    STATUS_POLL_JITTER,
+    STATUS_POLL_MAX_INTERVAL_SECONDS,
+    STATUS_POLL_MIN_SLEEP_SECONDS,
+    STATUS_POLL_WORKERS,
+)
+from src.utils.data_objects.configuration import Environment
 from src.utils.data_objects.migration.sip import MigrationSIP
 from src.utils.data_objects.sip import SIP
 from src.utils.data_objects.sip_status import SIPStatus
@@ -31,17 +43,46 @@ def _describe_sip(sip: SIP) -> str:
     return f"{base}, edepot_sip_id={sip.edepot_sip_id}"
 
 
+@dataclass
+class _PollState:
+    status: SIPStatus
+    # time.monotonic() timestamps
+    status_since: float
+    next_check: float
+
+
+def _poll_interval(seconds_in_status: float) -> float:
+    """Double the interval for every backoff step a SIP has spent in the same status, capped, with jitter."""
+    steps = int(seconds_in_status // STATUS_POLL_BACKOFF_STEP_SECONDS)
+    interval = min(POLL_INTERVAL_SECONDS * 2 ** min(steps, 16), STATUS_POLL_MAX_INTERVAL_SECONDS)
+
+    return interval * random.uniform(1 - STATUS_POLL_JITTER, 1 + STATUS_POLL_JITTER)
+
+
 class SIPStatusChecker(WorkerUser):
     edepot_id_resolved_signal = QtCore.Signal(SIP, str)
     status_changed_signal = QtCore.Signal(SIP, SIPStatus)
     sip_rejected_signal = QtCore.Signal(SIP, str)
     error_occurred_signal = QtCore.Signal(Exception)
+    # (SIPs checked, seconds the cycle took)
+    poll_cycle_finished_signal = QtCore.Signal(int, float)
 
     def __init__(self):
         super().__init__()
 
         self.worker: Worker = None
 
+        # Environments whose e-depot SIP index was already brought up to date this poll cycle
+        self._refreshed_environments: set[str] = set()
+        self._index_lock = threading.Lock()
+
+        self._schedule: dict[SIP, _PollState] = {}
+        self._schedule_lock = threading.Lock()
+
+        # Exposed for monitoring: SIPs checked in the last cycle and how long that cycle took
+        self.queue_depth = 0
+        self.last_cycle_latency = 0.0
+
     def run(self, worker_controller: WorkerController) -> None:
         self.worker = worker_controller.run_thread(
             thread_function=self.background_check_all_sips, thread_is_generator=True
@@ -58,76 +99,151 @@ class SIPStatusChecker(WorkerUser):
             self.worker.force_stop = True
 
     def background_check_all_sips(self) -> Iterator[tuple]:
-        while True:
-            sips_to_check = self._collect_checkable_sips()
-            temp_log(
-                f"[status_checker] starting poll cycle: {len(sips_to_check)} checkable SIP(s)"
-            )
+        """Poll the e-depot for every checkable SIP, each on its own schedule.
+
+        Due SIPs are checked concurrently on a bounded pool. After a check, a SIP's next check
+        is pushed back further the longer it has been sitting in the same status, with jitter
+        so that SIPs uploaded together do not stay in lockstep.
+        """
+        with ThreadPoolExecutor(max_workers=STATUS_POLL_WORKERS) as executor:
+            while True:
+                cycle_start = time.monotonic()
+                sips_to_check = self._collect_checkable_sips()
+                due_sips = self._due_sips(sips_to_check, now=cycle_start)
+
+                self._refreshed_environments.clear()
+                self.queue_depth = len(due_sips)
+
+                if due_sips:
+                    temp_log(
+                        f"[status_checker] starting poll cycle: {len(due_sips)} due of "
+                        f"{len(sips_to_check)} checkable SIP(s)"
+                    )
+
+                    futures = {executor.submit(self._run_check, sip): sip for sip in due_sips}
+
+                    for future in as_completed(futures):
+                        self._reschedule(futures[future])
+
+                        yield from future.result()
 
-            for sip in sips_to_check:
-                temp_log(f"[status_checker] checking SIP: {_describe_sip(sip)}")
-                try:
-                    if isinstance(sip, MigrationSIP):
-                        yield from self._check_migration_sip(sip)
+                    self.last_cycle_latency = time.monotonic() - cycle_start
+                    temp_log(
+                        f"[status_checker] poll cycle done: {len(due_sips)} SIP(s) in "
+                        f"{self.last_cycle_latency:.2f}s"
+                    )
 
-                        continue
+                    yield "cycle_finished", len(due_sips), self.last_cycle_latency
 
-                    if not sip.edepot_sip_id:
-                        edepot_id = APIController.get_sip_id(sip)
+                time.sleep(self._seconds_until_next_check())
 
-                        if edepot_id:
-                            sip.edepot_sip_id = edepot_id
+                yield (None,)
+
+    def _run_check(self, sip: SIP) -> list[tuple]:
+        # NOTE: runs on a pool thread, the results are yielded from the worker thread afterwards
+        temp_log(f"[status_checker] checking SIP: {_describe_sip(sip)}")
+
+        try:
+            if isinstance(sip, MigrationSIP):
+                return list(self._check_migration_sip(sip))
+
+            return list(self._check_sip(sip))
+        except Exception as e:
+            return [("error", e)]
+
+    def _due_sips(self, sips: list[SIP], now: float) -> list[SIP]:
+        with self._schedule_lock:
+            checkable = set(sips)
+
+            # Forget SIPs that reached a final status or were removed
+            for sip in [s for s in self._schedule if s not in checkable]:
+                del self._schedule[sip]
+
+            for sip in sips:
+                if sip not in self._schedule or self._schedule[sip].status != sip.status:
+                    self._schedule[sip] = _PollState(status=sip.status, status_since=now, next_check=now)
+
+            return [sip for sip in sips if self._schedule[sip].next_check <= now]
 
-                            yield "edepot_resolved", sip, edepot_id
-                        else:
-                            yield (None,)
+    def _reschedule(self, sip: SIP) -> None:
+        now = time.monotonic()
 
-                        continue
+        with self._schedule_lock:
+            state = self._schedule.get(sip)
 
-                    try:
-                        result = APIController.get_sip_status(sip)
-                    except SIPNotFoundError:
-                        temp_log(
-                            f"[status_checker] stored edepot_id {sip.edepot_sip_id} 404'd for "
-                            f"{sip.name!r}; clearing and attempting re-resolve"
-                        )
-                        sip.edepot_sip_id = ""
-                        resolved_id = APIController.get_sip_id(sip)
+            if state is None:
+                return
 
-                        if resolved_id:
-                            sip.edepot_sip_id = resolved_id
+            if state.status != sip.status:
+                state.status = sip.status
+                state.status_since = now
 
-                        yield "edepot_resolved", sip, sip.edepot_sip_id
-                        continue
+            state.next_check = now + _poll_interval(now - state.status_since)
 
-                    if result is None:
-                        yield (None,)
+    def _seconds_until_next_check(self) -> float:
+        with self._schedule_lock:
+            next_checks = [state.next_check for state in self._schedule.values()]
 
-                        continue
+        if not next_checks:
+            return POLL_INTERVAL_SECONDS
 
-                    new_status, fail_reason = result
+        return min(max(min(next_checks) - time.monotonic(), STATUS_POLL_MIN_SLEEP_SECONDS), POLL_INTERVAL_SECONDS)
 
-                    if new_status is None or new_status == sip.status:
-                        yield (None,)
+    def _check_sip(self, sip: SIP) -> Iterator[tuple]:
+        from src.controller.api_controller import APIController, SIPNotFoundError
 
-                        continue
+        if not sip.edepot_sip_id:
+            edepot_id = self._resolve_edepot_id(sip.environment, sip.file_name)
+
+            if edepot_id:
+                sip.edepot_sip_id = edepot_id
+
+                yield "edepot_resolved", sip, edepot_id
+            else:
+                yield (None,)
+
+            return
+
+        try:
+            result = APIController.get_sip_status(sip)
+        except SIPNotFoundError:
+            temp_log(
+                f"[status_checker] stored edepot_id {sip.edepot_sip_id} 404'd for "
+                f"{sip.name!r}; clearing and attempting re-resolve"
+            )
+            self.application.main_db_controller.delete_edepot_index_entry(sip.environment.name, sip.file_name)
+            sip.edepot_sip_id = ""
+            resolved_id = self._resolve_edepot_id(sip.environment, sip.file_name)
 
-                    sip.set_status(new_status)
+            if resolved_id:
+                sip.edepot_sip_id = resolved_id
 
-                    yield "status_changed", sip, new_status
+            yield "edepot_resolved", sip, sip.edepot_sip_id
+            return
 
-                    if new_status == SIPStatus.REJECTED and fail_reason is not None:
-                        yield "sip_rejected", sip, fail_reason
+        if result is None:
+            yield (None,)
 
-                except Exception as e:
-                    yield "error", e
+            return
 
-            time.sleep(POLL_INTERVAL_SECONDS)
+        new_status, fail_reason = result
 
+        if new_status is None or new_status == sip.status:
             yield (None,)
 
+            return
+
+        sip.set_status(new_status)
+
+        yield "status_changed", sip, new_status
+
+        if new_status == SIPStatus.REJECTED and fail_reason is not None:
+            yield "sip_rejected", sip, fail_reason
+
     def _check_migration_sip(self, sip: MigrationSIP) -> Iterator[tuple]:
         """Resolve edepot IDs and check statuses per series for migration SIPs."""
+        from src.controller.api_controller import APIController, SIPNotFoundError
+
         changed = False
 
         for series_name, status in sip.series_statuses.items():
@@ -149,7 +265,7 @@ class SIPStatusChecker(WorkerUser):
             )
 
             if not edepot_id:
-                resolved_id = APIController.get_sip_id_for_name(sip.environment, zip_name)
+                resolved_id = self._resolve_edepot_id(sip.environment, zip_name)
 
                 if resolved_id:
                     sip.series_edepot_ids[series_name] = resolved_id
@@ -173,7 +289,8 @@ class SIPStatusChecker(WorkerUser):
                 sip.series_edepot_ids[series_name] = ""
                 changed = True
 
-                resolved_id = APIController.get_sip_id_for_name(sip.environment, zip_name)
+                self.application.main_db_controller.delete_edepot_index_entry(sip.environment.name, zip_name)
+                resolved_id = self._resolve_edepot_id(sip.environment, zip_name)
 
                 if resolved_id:
                     sip.series_edepot_ids[series_name] = resolved_id
@@ -205,6 +322,86 @@ class SIPStatusChecker(WorkerUser):
 
             yield "status_changed", sip, sip.status
 
+    def _resolve_edepot_id(self, environment: Environment, file_name: str) -> str | None:
+        """Look up the e-depot id for a SIP's OriginalFilename in the local index.
+
+        The index is brought up to date before the lookup, hit or miss, at most once per
+        environment per poll cycle: a SIP uploaded again under the same name must resolve to
+        its new record, not to the one indexed for the previous upload.
+        """
+        # NOTE: checks run concurrently, the lock makes the others wait for a refresh in progress
+        with self._index_lock:
+            if environment.name not in self._refreshed_environments:
+                self._refresh_edepot_index(environment)
+                self._refreshed_environments.add(environment.name)
+
+        edepot_id = self.application.main_db_controller.read_edepot_id(environment.name, file_name)
+
+        temp_log(f"[status_checker] resolved {file_name!r} on {environment.name} -> {edepot_id!r}")
+        return edepot_id
+
+    def _refresh_edepot_index(self, environment: Environment) -> None:
+        """Index the SIPs archived since the stored high-water mark (everything, the first time).
+
+        Pages come newest first, so fetching stops at the first page reaching back past the
+        mark. Records with the same ArchiveDate as the mark are indexed again, which is harmless.
+        SIPs without an ArchiveDate (not archived yet) sort after all others, so after an early
+        stop they are fetched from the last page backwards, up to the first archived record.
+        """
+        from src.controller.api_controller import APIController
+
+        main_db_controller = self.application.main_db_controller
+        high_water_mark = main_db_controller.read_edepot_index_high_water_mark(environment.name)
+        new_high_water_mark = high_water_mark
+        entries = []
+        pending_entries = []
+        pages = 0
+        reached_known_sips = False
+
+        for page in APIController.iter_sip_pages(environment):
+            pages += 1
+
+            for record in page:
+                archive_date = record.get("ArchiveDate")
+
+                if archive_date is None:
+                    pending_entries.append((record["OriginalFilename"], record["Id"], None))
+                    continue
+
+                entries.append((record["OriginalFilename"], record["Id"], archive_date))
+
+                if new_high_water_mark is None or archive_date > new_high_water_mark:
+                    new_high_water_mark = archive_date
+
+                if high_water_mark is not None and archive_date < high_water_mark:
+                    reached_known_sips = True
+
+            if reached_known_sips:
+                break
+
+        if reached_known_sips:
+            pending_entries = []
+
+            for page in APIController.iter_sip_pages(environment, from_last_page=True):
+                pages += 1
+                pending_entries.extend(
+                    (record["OriginalFilename"], record["Id"], None)
+                    for record in page
+                    if record.get("ArchiveDate") is None
+                )
+
+                if any(record.get("ArchiveDate") is not None for record in page):
+                    break
+
+        # NOTE: the SIPs that are not archived yet go last, they are the newest uploads
+        main_db_controller.write_edepot_index(environment.name, entries + pending_entries, new_high_water_mark)
+
+        temp_log(
+            f"[status_checker] e-depot SIP index for {environment.name}: {len(entries)} archived and "
+            f"{len(pending_entries)} pending record(s) from {pages} page(s), "
+            f"high-water mark {high_water_mark!r} -> {new_high_water_mark!r}"
+        )
+
     def _collect_checkable_sips(self) -> list[SIP]:
         result = []
 
@@ -237,6 +434,11 @@ class SIPStatusChecker(WorkerUser):
 
             self.sip_rejected_signal.emit(sip, fail_reason)
 
+        elif action == "cycle_finished":
+            _, checked, latency = result
+
+            self.poll_cycle_finished_signal.emit(checked, latency)
+
         elif action == "error":
             _, exception = result
 
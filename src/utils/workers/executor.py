@@ -0,0 +1,109 @@
+"""
+Shared executor for background workers
+
+Workers run on bounded thread pools instead of a thread of their own, one pool per lane,
+so a burst of edits or pastes does not spawn a burst of OS threads.
+"""
+
+import threading
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from PySide6 import QtCore
+
+from src.utils.constants import BULK_TASK_WORKERS, INTERACTIVE_TASK_WORKERS
+
+if TYPE_CHECKING:
+    from src.utils.workers.worker import Worker
+
+
+class TaskPriority(Enum):
+    # Short tasks the user is waiting on, e.g. validating an edited cell
+    INTERACTIVE = "interactive"
+    # Everything else: building SIPs, uploads, retrieving series/SIPs, polling
+    BULK = "bulk"
+
+
+class WorkerTask(QtCore.QRunnable):
+    def __init__(self, executor: "TaskExecutor", worker: "Worker") -> None:
+        super().__init__()
+
+        # NOTE: the Python side keeps the task alive, Qt must not delete it
+        self.setAutoDelete(False)
+
+        self.executor = executor
+        self.worker = worker
+
+    def run(self) -> None:
+        try:
+            self.worker.run()
+        finally:
+            self.executor._discard(self)
+
+
+class TaskExecutor:
+    def __init__(self) -> None:
+        self._pools: dict[TaskPriority, QtCore.QThreadPool] = {}
+
+        for priority, max_workers in (
+            (TaskPriority.INTERACTIVE, INTERACTIVE_TASK_WORKERS),
+            (TaskPriority.BULK, BULK_TASK_WORKERS),
+        ):
+            pool = QtCore.QThreadPool()
+            pool.setMaxThreadCount(max_workers)
+            self._pools[priority] = pool
+
+        # Queued and running tasks, so they (and their workers) stay alive until done
+        self._tasks: dict[WorkerTask, TaskPriority] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, task: WorkerTask, priority: TaskPriority = TaskPriority.BULK) -> None:
+        with self._lock:
+            self._tasks[task] = priority
+
+        self._pools[priority].start(task)
+
+    def take(self, task: WorkerTask) -> bool:
+        """Remove a task that has not started yet from its queue; returns False if it already started."""
+        with self._lock:
+            priority = self._tasks.get(task)
+
+        if priority is None or not self._pools[priority].tryTake(task):
+            return False
+
+        self._discard(task)
+
+        return True
+
+    def pending_count(self, priority: TaskPriority | None = None) -> int:
+        with self._lock:
+            return sum(1 for p in self._tasks.values() if priority is None or p == priority)
+
+    def shutdown(self) -> None:
+        """Cancel everything that is queued or running, and wait for the running tasks to stop."""
+        with self._lock:
+            tasks = list(self._tasks)
+
+        for task in tasks:
+            task.worker.set_force_stop()
+
+        for pool in self._pools.values():
+            pool.waitForDone()
+
+    def _discard(self, task: WorkerTask) -> None:
+        with self._lock:
+            self._tasks.pop(task, None)
+
+
+_executor: TaskExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> TaskExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = TaskExecutor()
+
+        return _executor
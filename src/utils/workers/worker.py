@@ -6,6 +6,8 @@ from collections.abc import Callable
 
 from PySide6 import QtCore
 
+from src.utils.workers.executor import TaskPriority, WorkerTask, get_executor
+
 
 class Worker(QtCore.QObject):
     # NOTE: in the case of a generator, this will be triggered often
@@ -29,6 +31,8 @@ class Worker(QtCore.QObject):
         self.force_stop = False
         self.stale = False
 
+        self._task: WorkerTask | None = None
+
         self.forcibly_stop_signal.connect(self.set_force_stop)
 
     @staticmethod
@@ -40,13 +44,9 @@ class Worker(QtCore.QObject):
         on_error: Callable | None = None,
         on_finished: Callable | None = None,
         track_in: list | None = None,
+        priority: TaskPriority = TaskPriority.BULK,
     ) -> "Worker":
         worker = Worker(function=function, is_generator=is_generator)
-        thread = QtCore.QThread()
-
-        worker.moveToThread(thread)
-
-        thread.started.connect(worker.run)
 
         if on_result is not None:
             worker.result_ready_signal.connect(on_result)
@@ -54,16 +54,15 @@ class Worker(QtCore.QObject):
         if on_error is not None:
             worker.error_encountered_signal.connect(on_error)
 
-        worker.finished_signal.connect(thread.quit)
-        worker.stopped_forcibly_signal.connect(thread.quit)
-        thread.finished.connect(thread.deleteLater)
+        executor = get_executor()
+        task = worker._task = WorkerTask(executor, worker)
 
         if track_in is not None:
-            track_in.append((worker, thread))
+            track_in.append((worker, task))
 
             def _remove():
-                if (worker, thread) in track_in:
-                    track_in.remove((worker, thread))
+                if (worker, task) in track_in:
+                    track_in.remove((worker, task))
 
             worker.finished_signal.connect(_remove)
             worker.stopped_forcibly_signal.connect(_remove)
@@ -71,16 +70,28 @@ class Worker(QtCore.QObject):
         if on_finished is not None:
             worker.finished_signal.connect(on_finished)
 
-        worker._thread = thread
-
-        thread.start()
+        executor.submit(task, priority)
 
         return worker
 
     def set_force_stop(self):
         self.force_stop = True
 
+        # NOTE: a worker that is still queued never starts, it is stopped right away (once control
+        # returns to the event loop, so callers can stop workers while iterating over their track_in)
+        if self._task is not None and self._task.executor.take(self._task):
+            QtCore.QTimer.singleShot(0, self._stopped_before_start)
+
+    def _stopped_before_start(self) -> None:
+        self.about_to_finish_signal.emit()
+        self.stopped_forcibly_signal.emit()
+
     def run(self) -> None:
+        if self.force_stop:
+            self.about_to_finish_signal.emit()
+            self.stopped_forcibly_signal.emit()
+            return
+
         try:
             if self.is_generator:
                 for result in self.function():
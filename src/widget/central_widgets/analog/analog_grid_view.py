@@ -97,7 +97,10 @@ class AnalogGridView(BaseGridView):
         self.table_model.insert_column(column)
 
     def _save_button_clicked(self, silent: bool = False) -> None:
-        self.application.analog_sip_db_controller.save_data(self.sip, self.table_model.get_non_empty_df())
+        self.application.analog_sip_db_controller.save_data(
+            self.sip, self.table_model.get_non_empty_df(), rows=self.table_model.dirty_data_rows
+        )
+        self.table_model.mark_saved()
         self.has_unsaved_changes = False
 
         if not silent:
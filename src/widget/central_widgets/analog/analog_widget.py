@@ -1,13 +1,9 @@
 import os
 from collections.abc import Iterable
 
-import pandas as pd
 from natsort import natsort_keygen
 from PySide6 import QtWidgets
 
-from src.controller.api_controller import APIController
-from src.controller.excel_controller import ExcelController
-
 from src.utils.constants import UI_TEXT_ELEMENTS
 from src.utils.data_objects.analog.sip import AnalogSIP
 from src.utils.data_objects.grid_data import GridData
@@ -20,7 +16,6 @@ from src.widget.central_widgets.central_widget import CentralWidget
 from src.widget.components.analog.analog_listitem_widget import AnalogSipListitemWidget
 from src.widget.components.searchable_list_widget import SearchableListWidgetWithDropdown
 
-from src.window.analog.analog_grid_window import AnalogGridWindow
 from src.window.base_window import Window
 
 UI_TEXT = UI_TEXT_ELEMENTS["analog"]["main"]
@@ -98,6 +93,8 @@ class AnalogWidget(CentralWidget):
             self.sip_list_widget.add_widgets([listitem])
 
     def _open_grid_handler(self, sip: AnalogSIP) -> None:
+        from src.window.analog.analog_grid_window import AnalogGridWindow
+
         db_controller = self.application.analog_sip_db_controller
 
         if not db_controller.db_exists(sip.db_name):
@@ -128,6 +125,9 @@ class AnalogWidget(CentralWidget):
         self.start_sip_button.setEnabled(False)
 
         def background_create():
+            from src.controller.api_controller import APIController
+            from src.controller.excel_controller import ExcelController
+
             import_template_loc = APIController.get_import_template(
                 configuration=self.application.configuration,
                 environment=self.application.configuration.active_environment,
@@ -150,6 +150,8 @@ class AnalogWidget(CentralWidget):
         )
 
     def _on_template_downloaded(self, sip_name: str, series_id: str, columns: list[str]) -> None:
+        import pandas as pd
+
         env_name = self.application.configuration.active_environment_name
 
         series = self.application.get_series_by_id_or_name(
@@ -90,7 +90,8 @@ class DigitalGridView(BaseGridView):
         self.proxy_model.toggle_filter(TableFilter.DOSSIERS_ONLY)
 
     def _save_button_clicked(self) -> None:
-        self.application.digital_sip_db_controller.save_data(self.sip)
+        self.application.digital_sip_db_controller.save_data(self.sip, rows=self.table_model.dirty_rows)
+        self.table_model.mark_saved()
         self.has_unsaved_changes = False
 
         self.application.notify_user_signal.emit(
@@ -24,8 +24,6 @@ from src.widget.components.searchable_list_widget import (
 )
 
 from src.window.base_window import Window
-from src.window.digital.sip_detail_window import SipDetailWindow
-from src.window.grid_window import GridWindow
 
 
 class DigitalWidget(CentralWidget):
@@ -161,6 +159,8 @@ class DigitalWidget(CentralWidget):
 
         This means we can now start the process of creating a SIP using these dossiers
         """
+        from src.window.digital.sip_detail_window import SipDetailWindow
+
         sip = SIP()
         sip.set_dossiers(self.dossier_list_widget.get_selected_items())
 
@@ -173,6 +173,8 @@ class DigitalWidget(CentralWidget):
         self.digital_sip_loaded_handler(sip)
 
     def open_grid_handler(self, sip: SIP) -> None:
+        from src.window.grid_window import GridWindow
+
         if not self.application.digital_sip_db_controller.db_exists(sip.db_name):
             try:
                 sip.set_data_from_dossiers()
@@ -286,7 +286,9 @@ class MigrationGridView(BaseGridView):
             self.sip,
             self.series_name,
             self.table_model.raw_data,
+            rows=self.table_model.dirty_rows,
         )
+        self.table_model.mark_saved()
         self.has_unsaved_changes = False
 
         if not silent:
@@ -205,7 +205,10 @@ class MigrationMainTabView(BaseWidget):
         self.create_sip_button.setHidden(is_klant)
 
     def _save_button_clicked(self) -> None:
-        self.application.migration_sip_db_controller.save_main_data(self.sip, self.table_model.raw_data)
+        self.application.migration_sip_db_controller.save_main_data(
+            self.sip, self.table_model.raw_data, rows=self.table_model.dirty_rows
+        )
+        self.table_model.mark_saved()
 
         self.application.notify_user_signal.emit(
             UI_TEXT["save_success"]["title"],
@@ -5,13 +5,10 @@ from collections.abc import Iterable
 from natsort import natsort_keygen
 from PySide6 import QtWidgets
 
-from src.controller.excel_controller import ExcelController
-
 from src.utils.constants import KLANT_ROLE, MIGRATION_ID_COLUMN, UI_TEXT_ELEMENTS
 from src.utils.data_objects.grid_data import GridData
 from src.utils.data_objects.migration.sip import MigrationSIP
 from src.utils.data_objects.sip_status import SIPStatus
-from src.utils.grid.checks.migration.location_group_check import validate_location_columns
 from src.utils.helper import get_attr_deep
 
 from src.widget.central_widgets.central_widget import CentralWidget
@@ -19,7 +16,6 @@ from src.widget.components.migration.migration_listitem_widget import MigrationS
 from src.widget.components.searchable_list_widget import SearchableListWidgetWithDropdown
 
 from src.window.base_window import Window
-from src.window.migration.migration_tab_window import MigrationTabWindow
 
 
 class MigrationWidget(CentralWidget):
@@ -99,6 +95,8 @@ class MigrationWidget(CentralWidget):
             self.sip_list_widget.add_widgets([listitem])
 
     def open_overdrachtslijst_handler(self, sip: MigrationSIP) -> None:
+        from src.window.migration.migration_tab_window import MigrationTabWindow
+
         db_controller = self.application.migration_sip_db_controller
 
         if not db_controller.db_exists(sip.db_name):
@@ -125,6 +123,9 @@ class MigrationWidget(CentralWidget):
         self.import_overdrachtslijst_button.setHidden(is_klant)
 
     def _import_overdrachtslijst_clicked(self) -> None:
+        from src.controller.excel_controller import ExcelController
+        from src.utils.grid.checks.migration.location_group_check import validate_location_columns
+
         file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
             caption=self.UI_TEXT["controls"]["import_overdrachtslijst_button"]["dialog_message"],
             filter="Excel bestanden (*.xlsx *.xlsm *.xltx *.xltm)",
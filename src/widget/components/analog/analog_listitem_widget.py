@@ -135,6 +135,7 @@ class AnalogControlsWidget(BaseSipControlsWidget):
             return
 
         self.application.window_controller.close_windows_for_sip(self.sip)
+        self.application.analog_sip_db_controller.close_db(self.sip.db_name)
 
         with suppress(FileNotFoundError, PermissionError):
             os.remove(self.sip.db_path)
@@ -7,8 +7,6 @@ from contextlib import suppress
 
 from PySide6 import QtCore, QtWidgets
 
-from src.controller.upload_controller import UploadController
-
 from src.utils.constants import UI_TEXT_ELEMENTS
 from src.utils.data_objects.digital.sip import SIP
 from src.utils.data_objects.sip_status import SIPStatus
@@ -22,7 +20,6 @@ from src.widget.components.base_sip_controls_widget import BaseSipControlsWidget
 from src.widget.dialog.yes_no_dialog import YesNoDialog
 
 from src.window.base_window import Window
-from src.window.digital.sip_detail_window import SipDetailWindow
 
 UI_TEXT = UI_TEXT_ELEMENTS["digital"]["main"]["sip_list"]
 
@@ -152,6 +149,8 @@ class ControlsWidget(BaseSipControlsWidget):
             clear_widget_warning_style(self.upload_button)
 
     def open_button_clicked_handler(self) -> None:
+        from src.window.digital.sip_detail_window import SipDetailWindow
+
         if (
             self.application.digital_sip_db_controller.is_valid_db(self.sip.db_name)
             and self.application.digital_sip_db_controller.read_sip_data(self.sip.db_name) is not None
@@ -175,6 +174,8 @@ class ControlsWidget(BaseSipControlsWidget):
 
                 self.sip.set_status(SIPStatus.SIP_CREATED)
 
+            from src.controller.upload_controller import UploadController
+
             UploadController().upload_sip(sip=self.sip)
 
         self.application.start_task(
@@ -201,6 +202,7 @@ class ControlsWidget(BaseSipControlsWidget):
         self.application.window_controller.close_windows_for_sip(self.sip)
 
         db_location = os.path.join(self.application.configuration.sip_db_location, self.sip.db_name)
+        self.application.digital_sip_db_controller.close_db(self.sip.db_name)
 
         with suppress(FileNotFoundError, PermissionError):
             os.remove(db_location)
@@ -40,6 +40,7 @@ class MigrationSipListitemWidget(QtWidgets.QFrame):
         self.controls_widget = MigrationControlsWidget(sip=self.sip)
 
         self.controls_widget.open_overdrachtslijst_signal.connect(self.open_overdrachtslijst_signal.emit)
+        self.controls_widget.upload_progress_signal.connect(self.name_and_status_widget.show_upload_progress)
 
         self.horizontal_layout.addWidget(self.name_and_status_widget)
         self.horizontal_layout.addWidget(self.controls_widget)
@@ -97,6 +98,19 @@ class MigrationNameAndStatusWidget(QtWidgets.QFrame):
 
         self._update_status_visibility()
 
+    def show_upload_progress(self, percentage: int, rate: float, eta: float) -> None:
+        if self.sip.status != SIPStatus.UPLOADING:
+            return
+
+        self.status_label.setText(
+            UI_MIGRATION_TEXT["upload_progress"].format(
+                status=self.sip.status.status_label,
+                percentage=percentage,
+                speed=f"{rate / 1024 / 1024:.1f}",
+                minutes=f"{eta / 60:.0f}" if eta >= 0 else "?",
+            )
+        )
+
     def _update_status_visibility(self) -> None:
         is_partially = self.sip.status == SIPStatus.PARTIALLY_UPLOADED
 
@@ -110,6 +124,8 @@ class MigrationNameAndStatusWidget(QtWidgets.QFrame):
 
 class MigrationControlsWidget(BaseSipControlsWidget):
     open_overdrachtslijst_signal = QtCore.Signal(MigrationSIP)
+    # Overall upload progress of the series being uploaded: percent, bytes per second, ETA in seconds (-1 if unknown)
+    upload_progress_signal = QtCore.Signal(int, float, float)
 
     def __init__(self, sip: MigrationSIP):
         super().__init__(sip)
@@ -214,6 +230,9 @@ class MigrationControlsWidget(BaseSipControlsWidget):
         from src.controller.upload_controller import UploadController
 
         upload_controller = UploadController()
+        upload_controller.upload_progress_signal.connect(self._on_upload_progress)
+        self._upload_progress: dict[str, tuple[int, int, float]] = {}
+
         configuration = self.application.configuration
         tables = self.application.migration_sip_db_controller.read_tables(self.sip.db_name)
 
@@ -223,6 +242,8 @@ class MigrationControlsWidget(BaseSipControlsWidget):
             if table_name in series_names:
                 series_id_map[table_name] = uri_serieregister.rsplit("/", 1)[-1] if uri_serieregister else ""
 
+        # NOTE: the connection is validated once for all series, the files per series
+        connection_valid = upload_controller._validate_connection(self.sip.environment)
         upload_infos: list[tuple[str, str, str]] = []
 
         for series_name in series_names:
@@ -233,7 +254,7 @@ class MigrationControlsWidget(BaseSipControlsWidget):
             sip_location = os.path.join(configuration.sips_location, sip_file_name)
             sidecar_location = os.path.join(configuration.sips_location, sidecar_file_name)
 
-            if not upload_controller._validate_upload(self.sip, sip_location, sidecar_location):
+            if not connection_valid or not upload_controller._validate_files(sip_location, sidecar_location):
                 self.sip.series_statuses[series_name] = SIPStatus.SIP_CREATED
 
                 self.application.migration_sip_db_controller.update_series_status(
@@ -245,21 +266,16 @@ class MigrationControlsWidget(BaseSipControlsWidget):
             upload_infos.append((series_name, sip_location, sidecar_location))
 
         if not upload_infos:
+            upload_controller.close()
             self.sip.derive_overall_status()
 
             return
 
         def background_upload():
-            results = []
-
-            for series_name, sip_loc, sidecar_loc in upload_infos:
-                try:
-                    upload_controller._perform_upload(self.sip, sip_loc, sidecar_loc)
-                    results.append((series_name, True, ""))
-                except Exception as e:
-                    results.append((series_name, False, str(e)))
-
-            return results
+            try:
+                return upload_controller.upload_many(self.sip.environment, upload_infos)
+            finally:
+                upload_controller.close()
 
         Worker.start(
             background_upload,
@@ -268,6 +284,18 @@ class MigrationControlsWidget(BaseSipControlsWidget):
             track_in=self._active_workers,
         )
 
+    def _on_upload_progress(self, series_name: str, sent: int, total: int, rate: float, _eta: float) -> None:
+        self._upload_progress[series_name] = (sent, total, rate if sent < total else 0.0)
+
+        total_sent = sum(s for s, _, _ in self._upload_progress.values())
+        total_size = sum(t for _, t, _ in self._upload_progress.values())
+        total_rate = sum(r for _, _, r in self._upload_progress.values())
+
+        # NOTE: the series upload in parallel, so the ETA is based on their combined rate
+        eta = (total_size - total_sent) / total_rate if total_rate > 0 else -1.0
+
+        self.upload_progress_signal.emit(total_sent * 100 // total_size if total_size else 0, total_rate, eta)
+
     def _on_upload_complete(self, results: list[tuple[str, bool, str]]) -> None:
         failed_series = []
 
@@ -305,6 +333,8 @@ class MigrationControlsWidget(BaseSipControlsWidget):
         if not dialog.result():
             return
 
+        self.application.migration_sip_db_controller.close_db(self.sip.db_name)
+
         with suppress(FileNotFoundError, PermissionError):
             os.remove(self.sip.db_path)
 
@@ -1,7 +1,7 @@
 import re
 
 import pandas as pd
-from PySide6 import QtCore, QtGui, QtWidgets
+from PySide6 import QtGui, QtWidgets
 
 from src.controller.api_controller import APIController
 from src.controller.excel_controller import ExcelController
@@ -23,6 +23,7 @@ from src.utils.data_objects.grid_data import GridData
 from src.utils.data_objects.migration.sip import MigrationSIP
 from src.utils.data_objects.sip_status import SIPStatus
 from src.utils.pyside_helper import clear_widget_warning_style, set_widget_warning_style
+from src.utils.workers.executor import WorkerTask
 from src.utils.workers.worker import Worker
 
 from src.widget.central_widgets.migration.migration_grid_view import MigrationGridView
@@ -275,7 +276,7 @@ class MigrationTabWindow(Window):
 
         self.sip = sip
         self.series_tabs: dict[str, MigrationGridView] = {}
-        self._active_workers: list[tuple[Worker, QtCore.QThread]] = []
+        self._active_workers: list[tuple[Worker, WorkerTask]] = []
         self._tabs_loading: bool = False
         self._main_has_unsaved_changes: bool = False
         self._deleted_series: set[str] = set()
@@ -0,0 +1,9 @@
+import os
+import sys
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# NOTE: resources (ui_text_elements.json, ...) are found relative to the working directory, like in new_main.py
+os.chdir(ROOT_PATH)
+sys.path.insert(0, ROOT_PATH)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
@@ -0,0 +1,82 @@
+import itertools
+import json
+
+import pytest
+from requests.models import Response
+
+from src.controller import api_controller
+from src.controller.api_controller import APIController
+from src.utils.data_objects.configuration import Environment
+
+PAGE_SIZE = 100
+TOTAL = 3 * PAGE_SIZE
+
+
+class FakeSession:
+    """Answers the token and SIP list endpoints, revoking the first token after the first page."""
+
+    def __init__(self) -> None:
+        self.tokens = (f"token-{i}" for i in itertools.count(1))
+        self.valid_tokens = set()
+        self.sent_tokens = []
+
+    def request(self, method, url, headers=None, data=None, params=None, timeout=None) -> Response:
+        if url.endswith("auth/ropc.php"):
+            token = next(self.tokens)
+            self.valid_tokens.add(token)
+
+            return _response(200, {"access_token": token, "expires_in": 3600})
+
+        token = headers["Authorization"].removeprefix("Bearer ")
+        self.sent_tokens.append((params["page"], token))
+
+        if token not in self.valid_tokens:
+            return _response(401, {})
+
+        if params["page"] == 0:
+            self.valid_tokens.discard(token)
+
+        return _response(200, {"Content": [{"Id": params["page"]}], "Page": params["page"], "Total": TOTAL})
+
+
+def _response(status_code: int, body: dict) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode("utf-8")
+
+    return response
+
+
+@pytest.fixture
+def environment(monkeypatch):
+    environment = Environment(
+        name="test",
+        api_url="https://api.test",
+        api_username="user",
+        api_password="password",
+        api_client_id="client",
+        api_client_secret="secret",
+        ftps_url="",
+        ftps_username="",
+        ftps_password="",
+        ftps_port="",
+    )
+
+    monkeypatch.setattr(api_controller, "_environment_clients", {})
+    api_controller._client_for(environment).session = FakeSession()
+
+    return environment
+
+
+def test_refreshed_token_is_used_for_the_next_pages(environment):
+    pages = list(APIController.iter_sip_pages(environment))
+
+    assert pages == [[{"Id": 0}], [{"Id": 1}], [{"Id": 2}]]
+
+    # Only the request that hit the revoked token is sent twice
+    assert api_controller._client_for(environment).session.sent_tokens == [
+        (0, "token-1"),
+        (1, "token-1"),
+        (1, "token-2"),
+        (2, "token-2"),
+    ]
@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from PySide6 import QtCore
+
+from src.utils.grid.checks import CellRange
+from src.utils.grid.table.common.data_verification_table import CommonDataVerificationTable
+
+
+@pytest.fixture
+def table(qapp):
+    df = pd.DataFrame({"Naam": [f"naam {i}" for i in range(6)], "Type": ["stuk"] * 6})
+    table = CommonDataVerificationTable(SimpleNamespace(grid_data=SimpleNamespace(data_as_df=df), series=None))
+
+    # NOTE: only the bookkeeping is tested, the validation itself is never started
+    table._validation_timer.timeout.disconnect()
+
+    return table
+
+
+def _request(table: CommonDataVerificationTable, *rows: int) -> None:
+    for row in rows:
+        table.validate_range(CellRange(row_start=row, row_end=row, col_start=0, col_end=1))
+
+
+def _insert_rows(table: CommonDataVerificationTable, first: int, count: int) -> None:
+    new_rows = pd.DataFrame({"Naam": ["nieuw"] * count, "Type": ["stuk"] * count})
+
+    table.beginInsertRows(QtCore.QModelIndex(), first, first + count - 1)
+    table.raw_data = pd.concat([table.raw_data.iloc[:first], new_rows, table.raw_data.iloc[first:]], ignore_index=True)
+    table.endInsertRows()
+
+
+def _remove_rows(table: CommonDataVerificationTable, first: int, last: int) -> None:
+    table.beginRemoveRows(QtCore.QModelIndex(), first, last)
+    table.raw_data = table.raw_data.drop(table.raw_data.index[first : last + 1]).reset_index(drop=True)
+    table.endRemoveRows()
+
+
+def test_pending_rows_follow_inserted_rows(table):
+    _request(table, 1, 4)
+    table._pending_date_rows.add(4)
+    table._running_rows = [2]
+
+    _insert_rows(table, 2, 3)
+
+    assert table._pending_rows == {1, 7}
+    assert table._pending_date_rows == {7}
+    assert table._running_rows == [5]
+
+
+def test_pending_rows_follow_removed_rows(table):
+    _request(table, 0, 2, 5)
+    table._pending_date_rows.add(5)
+
+    _remove_rows(table, 1, 2)
+
+    assert table._pending_rows == {0, 3}
+    assert table._pending_date_rows == {3}
+
+
+def test_reset_validates_everything_that_was_pending(table):
+    _request(table, 5)
+    table._pending_date_rows.add(5)
+
+    table.beginResetModel()
+    table.raw_data = table.raw_data.iloc[::-1].reset_index(drop=True)
+    table.endResetModel()
+
+    assert table._pending_rows == set(range(6))
+    assert table._pending_date_rows == set()
+
+
+def test_reset_without_pending_rows_validates_nothing(table):
+    table.beginResetModel()
+    table.endResetModel()
+
+    assert table._pending_rows == set()
+
+
+def test_only_value_changes_make_a_validation_stale(table):
+    version = table._data_version
+    index = table.index(0, 0)
+
+    table.dataChanged.emit(index, index, [QtCore.Qt.ItemDataRole.BackgroundRole, QtCore.Qt.ItemDataRole.ToolTipRole])
+
+    assert table._data_version == version
+
+    table.setData(index, "andere naam")
+
+    assert table._data_version > version
@@ -0,0 +1,44 @@
+"""
+Dossier scans, compared with os.walk.
+"""
+
+import os
+
+from src.utils.constants import RowType
+from src.utils.file_scanner import scan_dossier
+
+
+def write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_scan_matches_os_walk(tmp_path):
+    dossier = os.path.join(tmp_path, "dossier")
+
+    write(os.path.join(dossier, "a.txt"), b"a")
+    write(os.path.join(dossier, "sub", "empty.txt"), b"")
+    write(os.path.join(dossier, "sub", "Thumbs.db"), b"thumbs")
+    os.makedirs(os.path.join(dossier, "sub", "leeg"))
+
+    expected = []
+
+    for dirpath, dirnames, filenames in os.walk(dossier):
+        relative_folder = os.path.relpath(dirpath, dossier).replace("\\", "/")
+
+        if not dirnames and not filenames:
+            expected.append(relative_folder)
+
+        expected.extend(f"{relative_folder}/{name}".removeprefix("./") for name in filenames)
+
+    entries = scan_dossier(dossier)
+
+    assert [e.relative_path for e in entries] == expected
+    assert {e.relative_path: e.row_type for e in entries} == {
+        "a.txt": RowType.STUK,
+        "sub/empty.txt": RowType.GEEN,
+        "sub/Thumbs.db": RowType.GEEN,
+        "sub/leeg": RowType.GEEN,
+    }
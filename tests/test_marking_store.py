@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from src.utils.grid.table.common.marking_store import CellColor, MarkingSource, MarkingStore
+
+
+def test_rows_are_index_labels():
+    markings = MarkingStore(3, 2)
+
+    # NOTE: a RangeIndex with a gap, like after a row was removed
+    markings.mark_rows(pd.Index([0, 2, 5]), 1, MarkingSource.CELL, CellColor.RED, "required")
+
+    assert sorted(markings.red_rows) == [0, 2, 5]
+    assert markings[(5, 1, MarkingSource.CELL)] == (CellColor.RED, "required")
+
+    markings.keep_rows(pd.Index([0, 5]))
+
+    assert sorted(markings.red_rows) == [0, 5]
+
+    markings.clear(pd.Index([5]), MarkingSource.CELL, (CellColor.RED,))
+
+    assert markings.red_rows == [0]
+    assert len(markings) == 1
+
+
+@pytest.mark.parametrize(
+    ("rows", "error"),
+    [
+        (pd.Index(["a", "b"]), TypeError),
+        (pd.Index([0.0, 1.5]), TypeError),
+        ([-1], ValueError),
+    ],
+)
+def test_rows_that_are_not_labels_are_refused(rows, error):
+    markings = MarkingStore(2, 1)
+
+    with pytest.raises(error):
+        markings.mark_rows(rows, 0, MarkingSource.CELL, CellColor.RED, "")
+
+    with pytest.raises(error):
+        markings.clear(rows, MarkingSource.CELL, (CellColor.RED,))
+
+    with pytest.raises(error):
+        markings[(rows[0], 0, MarkingSource.CELL)] = (CellColor.RED, "")
+
+    assert len(markings) == 0
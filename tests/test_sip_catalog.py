@@ -0,0 +1,111 @@
+"""
+The SIP catalog in the main DB, and when a SIP DB is read from it instead of opened.
+"""
+
+import os
+import sqlite3
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from src.controller.db_connections import get_connection_manager
+from src.controller.main_db_controller import MainDBController
+from src.controller.migration.sip_db_controller import MigrationSIPDBController
+from src.utils.constants import DB_FILE_EXTENSION
+from src.utils.data_objects.migration.sip import MigrationSIP
+from src.utils.data_objects.sip_status import SIPStatus
+
+
+@pytest.fixture
+def controller(qapp, tmp_path):
+    db_location = tmp_path / "overdrachtslijsten"
+    db_location.mkdir()
+
+    qapp.configuration = SimpleNamespace(
+        root_path=str(tmp_path),
+        overdrachtslijsten_location=str(db_location),
+        active_environment=SimpleNamespace(name="test"),
+        get_environment=lambda name: SimpleNamespace(name=name),
+    )
+    qapp.main_db_controller = MainDBController()
+
+    yield MigrationSIPDBController()
+
+    get_connection_manager().close_all()
+
+
+@pytest.fixture
+def sip(controller):
+    sip = MigrationSIP()
+    sip.force_set_name("overdrachtslijst")
+    sip.main_grid_data.data_as_df = pd.DataFrame({"Naam": ["a", "b"]})
+
+    assert controller.create_sip_db(sip)
+
+    controller.catalog_sip(sip.db_name)
+    controller.create_series_table(sip, "https://serie/1", "serie_1", pd.DataFrame({"Naam": ["a"]}))
+
+    return sip
+
+
+def _read_all(controller: MigrationSIPDBController) -> tuple[dict[str, MigrationSIP], list[str]]:
+    opened = []
+    is_valid_db = controller.is_valid_db
+
+    def _is_valid_db(db_file_name: str) -> bool:
+        # NOTE: the -wal and -shm files next to a DB are listed too, they are never opened
+        if db_file_name.endswith(DB_FILE_EXTENSION):
+            opened.append(db_file_name)
+
+        return is_valid_db(db_file_name)
+
+    controller.is_valid_db = _is_valid_db
+
+    try:
+        return {sip.name: sip for sip in controller.g_read_all_sip_dbs()}, opened
+    finally:
+        del controller.is_valid_db
+
+
+def test_series_writes_update_the_catalog(controller, sip):
+    controller.update_series_status(sip, "serie_1", SIPStatus.UPLOADED, edepot_id="edepot-1")
+    get_connection_manager().close_all()
+
+    sips, opened = _read_all(controller)
+
+    assert opened == []
+    assert sips[sip.name].series_statuses == {"serie_1": SIPStatus.UPLOADED}
+
+    controller.delete_series_table(sip, "serie_1")
+    get_connection_manager().close_all()
+
+    sips, opened = _read_all(controller)
+
+    assert opened == []
+    assert sips[sip.name].series_statuses == {}
+
+
+def test_writes_left_in_the_wal_are_a_catalog_miss(controller, sip):
+    get_connection_manager().close_all()
+    db_path = controller.db_path(sip.db_name)
+
+    assert _read_all(controller)[1] == []
+
+    # NOTE: like an app that was killed: the write stays in the WAL, the DB file itself does not change
+    stat = os.stat(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA wal_autocheckpoint=0;")
+    conn.execute("UPDATE tables SET status = ? WHERE table_name = ?", (SIPStatus.REJECTED.name, "serie_1"))
+    conn.commit()
+
+    try:
+        assert (os.stat(db_path).st_mtime_ns, os.stat(db_path).st_size) == (stat.st_mtime_ns, stat.st_size)
+
+        sips, opened = _read_all(controller)
+    finally:
+        conn.close()
+
+    assert opened == [sip.db_name]
+    assert sips[sip.name].series_statuses == {"serie_1": SIPStatus.REJECTED}
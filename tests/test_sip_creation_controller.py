@@ -0,0 +1,190 @@
+import hashlib
+import os
+import struct
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+from src.controller import sip_creation_controller
+from src.controller.sip_creation_controller import (
+    _compress_member,
+    _copy_member,
+    _find_unchanged_member,
+    _HashingWriter,
+    _write_compressed_member,
+    create_sip_zip,
+    update_metadata_in_zip,
+)
+
+# Extended timestamp (0x5455) with only the modification time set
+TIMESTAMP_EXTRA = struct.pack("<HHBI", 0x5455, 5, 1, 1_700_000_000)
+ZIP64_EXTRA = struct.pack("<HHQQ", 0x0001, 16, 10, 10)
+
+
+def _build_source(path, members: dict[str, tuple[bytes, int]]) -> None:
+    with zipfile.ZipFile(path, "w") as zfile:
+        for name, (data, compress_type) in members.items():
+            zinfo = zipfile.ZipInfo(name, (2024, 1, 2, 3, 4, 6))
+            zinfo.compress_type = compress_type
+            zinfo.extra = TIMESTAMP_EXTRA
+            zfile.writestr(zinfo, data)
+
+
+def _read_all(path) -> dict[str, bytes]:
+    with zipfile.ZipFile(path) as zfile:
+        assert zfile.testzip() is None
+
+        return {name: zfile.read(name) for name in zfile.namelist()}
+
+
+def test_raw_members_round_trip(tmp_path):
+    members = {
+        "deflated.txt": (b"deflated " * 10_000, zipfile.ZIP_DEFLATED),
+        "stored.pdf": (bytes(range(256)) * 40, zipfile.ZIP_STORED),
+        "empty.txt": (b"", zipfile.ZIP_DEFLATED),
+    }
+    source_path = tmp_path / "source.zip"
+    _build_source(source_path, members)
+
+    disk_path = tmp_path / "new.txt"
+    disk_path.write_bytes(b"new file " * 5_000)
+
+    target_path = tmp_path / "target.zip"
+
+    # NOTE: written through the hashing wrapper, like the SIPs, so the ZIP can't seek back
+    with zipfile.ZipFile(source_path) as source, open(target_path, "wb") as f:
+        writer = _HashingWriter(f)
+
+        with zipfile.ZipFile(writer, "w") as target:
+            for source_info in source.infolist():
+                _copy_member(target, source, source_info)
+
+            _write_compressed_member(target, *_compress_member(str(disk_path), "new.txt", zipfile.ZIP_DEFLATED))
+
+    assert writer.hexdigest() == hashlib.md5(target_path.read_bytes()).hexdigest()
+    assert _read_all(target_path) == {
+        **{name: data for name, (data, _) in members.items()},
+        "new.txt": disk_path.read_bytes(),
+    }
+
+    with zipfile.ZipFile(source_path) as source, zipfile.ZipFile(target_path) as target:
+        for source_info in source.infolist():
+            target_info = target.getinfo(source_info.filename)
+
+            assert target_info.compress_type == source_info.compress_type
+            assert target_info.compress_size == source_info.compress_size
+            assert target_info.date_time == source_info.date_time
+            assert target_info.extra == TIMESTAMP_EXTRA
+
+
+def test_copy_member_drops_the_zip64_record(tmp_path):
+    source_path = tmp_path / "source.zip"
+    _build_source(source_path, {"a.txt": (b"0123456789", zipfile.ZIP_STORED)})
+
+    with zipfile.ZipFile(source_path) as source, zipfile.ZipFile(tmp_path / "target.zip", "w") as target:
+        source_info = source.getinfo("a.txt")
+        source_info.extra = ZIP64_EXTRA + TIMESTAMP_EXTRA
+
+        _copy_member(target, source, source_info)
+
+    with zipfile.ZipFile(tmp_path / "target.zip") as target:
+        assert target.testzip() is None
+        assert target.getinfo("a.txt").extra == TIMESTAMP_EXTRA
+
+
+def test_update_metadata_in_zip(tmp_path):
+    sip_path = tmp_path / "sip.zip"
+    sidecar_path = tmp_path / "sip.xml"
+    _build_source(
+        sip_path,
+        {
+            "Metadata.xlsx": (b"old metadata", zipfile.ZIP_DEFLATED),
+            "dossier/file.txt": (b"content " * 1_000, zipfile.ZIP_DEFLATED),
+        },
+    )
+
+    metadata_path = tmp_path / "Metadata.xlsx"
+    metadata_path.write_bytes(b"new metadata")
+
+    update_metadata_in_zip(str(metadata_path), str(sip_path), str(sidecar_path))
+
+    assert _read_all(sip_path) == {
+        "dossier/file.txt": b"content " * 1_000,
+        "Metadata.xlsx": b"new metadata",
+    }
+    assert sidecar_path.read_text(encoding="utf-8") == sip_creation_controller.SIDECAR_TEMPLATE.format(
+        md5=hashlib.md5(sip_path.read_bytes()).hexdigest()
+    )
+
+
+def _edit_keeping_mtime(path, data: bytes) -> None:
+    st = os.stat(path)
+    path.write_bytes(data)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def _touch(path) -> None:
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 * 10**9))
+
+
+@pytest.fixture
+def built_sip(tmp_path, monkeypatch):
+    """A SIP with one dossier file, and the archive names compressed when it is built again."""
+    metadata_path = tmp_path / "Metadata.xlsx"
+    metadata_path.write_bytes(b"metadata")
+
+    disk_path = tmp_path / "stuk.txt"
+    disk_path.write_bytes(b"original content " * 1_000)
+
+    sip_path = tmp_path / "sip.zip"
+    additional_files = {"dossier/stuk.txt": str(disk_path)}
+
+    create_sip_zip(str(metadata_path), str(sip_path), str(tmp_path / "sip.xml"), additional_files)
+
+    compressed = []
+    compress_member = sip_creation_controller._compress_member
+
+    def _counting_compress_member(disk_path: str, archive_name: str, compress_type: int):
+        compressed.append(archive_name)
+
+        return compress_member(disk_path, archive_name, compress_type)
+
+    monkeypatch.setattr(sip_creation_controller, "_compress_member", _counting_compress_member)
+
+    def _rebuild() -> dict[str, bytes]:
+        create_sip_zip(
+            str(metadata_path), str(sip_path), str(tmp_path / "sip.xml"), additional_files, reuse_existing=True
+        )
+
+        return _read_all(sip_path)
+
+    return SimpleNamespace(disk_path=disk_path, sip_path=sip_path, compressed=compressed, rebuild=_rebuild)
+
+
+def _is_unchanged(built_sip) -> bool:
+    with zipfile.ZipFile(built_sip.sip_path) as previous:
+        return _find_unchanged_member(previous, "dossier/stuk.txt", str(built_sip.disk_path)) is not None
+
+
+def test_unchanged_file_is_copied(built_sip):
+    assert _is_unchanged(built_sip)
+    assert built_sip.rebuild()["dossier/stuk.txt"] == built_sip.disk_path.read_bytes()
+    assert built_sip.compressed == []
+
+
+def test_same_size_edit_with_the_same_mtime_is_compressed_again(built_sip):
+    _edit_keeping_mtime(built_sip.disk_path, b"changed content " * 1_000 + b"-" * 1_000)
+
+    assert not _is_unchanged(built_sip)
+    assert built_sip.rebuild()["dossier/stuk.txt"] == built_sip.disk_path.read_bytes()
+    assert built_sip.compressed == ["dossier/stuk.txt"]
+
+
+def test_mtime_only_change_is_copied(built_sip):
+    _touch(built_sip.disk_path)
+
+    assert _is_unchanged(built_sip)
+    assert built_sip.rebuild()["dossier/stuk.txt"] == built_sip.disk_path.read_bytes()
+    assert built_sip.compressed == []
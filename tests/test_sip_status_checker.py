@@ -0,0 +1,114 @@
+"""
+Resolving e-depot ids through the local e-depot SIP index.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.controller.api_controller import APIController
+from src.controller.db_connections import get_connection_manager
+from src.controller.main_db_controller import MainDBController
+from src.utils.worker_user.sip_status_checker import SIPStatusChecker
+
+PAGE_SIZE = 2
+
+
+class FakeEdepot:
+    """The SIP list of the e-depot: newest ArchiveDate first, the ones without an ArchiveDate last."""
+
+    def __init__(self) -> None:
+        self.records = []
+        self.fetched_pages = []
+
+    def add(self, file_name: str, edepot_id: str, archive_date: str | None = None) -> None:
+        self.records.append({"OriginalFilename": file_name, "Id": edepot_id, "ArchiveDate": archive_date})
+
+    def archive(self, edepot_id: str, archive_date: str) -> None:
+        next(r for r in self.records if r["Id"] == edepot_id)["ArchiveDate"] = archive_date
+
+    def iter_sip_pages(self, environment, from_last_page: bool = False):
+        records = sorted((r for r in self.records if r["ArchiveDate"]), key=lambda r: r["ArchiveDate"], reverse=True)
+        records += [r for r in self.records if not r["ArchiveDate"]]
+        pages = [records[i : i + PAGE_SIZE] for i in range(0, len(records), PAGE_SIZE)] or [[]]
+        numbered = list(enumerate(pages))
+
+        for number, page in reversed(numbered) if from_last_page else numbered:
+            self.fetched_pages.append(number)
+
+            yield [dict(record) for record in page]
+
+
+@pytest.fixture
+def edepot(monkeypatch):
+    edepot = FakeEdepot()
+    monkeypatch.setattr(APIController, "iter_sip_pages", edepot.iter_sip_pages)
+
+    return edepot
+
+
+@pytest.fixture
+def checker(qapp, tmp_path, edepot):
+    qapp.configuration = SimpleNamespace(root_path=str(tmp_path))
+    qapp.main_db_controller = MainDBController()
+
+    checker = SIPStatusChecker()
+
+    def _resolve(file_name: str) -> str | None:
+        # NOTE: a new poll cycle, the index may be refreshed again
+        checker._refreshed_environments.clear()
+
+        return checker._resolve_edepot_id(SimpleNamespace(name="test"), file_name)
+
+    checker.resolve = _resolve
+
+    yield checker
+
+    get_connection_manager().close_all()
+
+
+def _fill(edepot: FakeEdepot, count: int) -> None:
+    for i in range(count):
+        edepot.add(f"oud_{i}.zip", f"oud-{i}", f"2024-01-{i + 1:02}T00:00:00")
+
+
+def test_sip_uploaded_again_resolves_to_the_new_record(checker, edepot):
+    _fill(edepot, 6)
+    edepot.add("sip.zip", "eerste", "2024-02-01T00:00:00")
+
+    assert checker.resolve("sip.zip") == "eerste"
+
+    edepot.add("sip.zip", "tweede")
+
+    assert checker.resolve("sip.zip") == "tweede"
+
+    # Archiving the new upload keeps it, re-indexing the old record does not bring that back
+    edepot.archive("tweede", "2024-03-01T00:00:00")
+    edepot.add("ander.zip", "ander", "2024-03-02T00:00:00")
+
+    assert checker.resolve("sip.zip") == "tweede"
+    assert checker.resolve("ander.zip") == "ander"
+
+
+def test_pending_sips_past_the_high_water_mark_are_indexed(checker, edepot):
+    _fill(edepot, 6)
+    checker.resolve("oud_0.zip")
+
+    edepot.add("nieuw.zip", "nieuw")
+    edepot.fetched_pages.clear()
+
+    assert checker.resolve("nieuw.zip") == "nieuw"
+
+    # Only the newest page and, from the end, the page with the pending SIP are fetched
+    assert edepot.fetched_pages == [0, 3, 2]
+
+
+def test_index_is_refreshed_once_per_poll_cycle(checker, edepot):
+    _fill(edepot, 2)
+    checker.resolve("oud_0.zip")
+    edepot.fetched_pages.clear()
+
+    checker._resolve_edepot_id(SimpleNamespace(name="test"), "oud_1.zip")
+    checker._resolve_edepot_id(SimpleNamespace(name="test"), "onbekend.zip")
+
+    assert edepot.fetched_pages == []
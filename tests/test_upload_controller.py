@@ -0,0 +1,188 @@
+"""
+Resuming FTPS uploads, against an in-memory stand-in for the ingest server.
+"""
+
+import ftplib
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from src.controller import upload_controller
+from src.controller.upload_controller import UploadController, _FTPSSessionPool, _TransferProgress
+
+BLOCK_SIZE = 1024
+
+
+class FakeServer:
+    """What the server stored, and how the next sessions misbehave."""
+
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+        self.rest_supported = True
+        # Bytes after which the data connection of each following STOR drops
+        self.drops: list[int] = []
+        # Number of following connection attempts that fail
+        self.refused_connections = 0
+
+        self.stor_offsets: list[int] = []
+        self.connections = 0
+
+    def connect(self, environment) -> "FakeFTPS":
+        self.connections += 1
+
+        if self.refused_connections:
+            self.refused_connections -= 1
+            raise ConnectionRefusedError("link still down")
+
+        return FakeFTPS(self)
+
+
+class FakeFTPS:
+    def __init__(self, server: FakeServer) -> None:
+        self.server = server
+        self.closed = False
+
+    def voidcmd(self, cmd: str) -> str:
+        self._check_open()
+        return "200 OK"
+
+    def size(self, name: str) -> int | None:
+        self._check_open()
+
+        if name not in self.server.files:
+            raise ftplib.error_perm("550 No such file")
+
+        return len(self.server.files[name])
+
+    def storbinary(self, cmd, fp, blocksize=8192, callback=None, rest=None) -> str:
+        self._check_open()
+
+        if rest is not None and not self.server.rest_supported:
+            raise ftplib.error_perm("502 REST not implemented")
+
+        name = cmd.removeprefix("STOR ")
+        offset = rest or 0
+        drop_after = self.server.drops.pop(0) if self.server.drops else None
+
+        self.server.stor_offsets.append(offset)
+        self.server.files[name] = self.server.files.get(name, b"")[:offset]
+
+        sent = 0
+
+        while block := fp.read(blocksize):
+            if drop_after is not None and sent + len(block) > drop_after:
+                self.server.files[name] += block[: drop_after - sent]
+                self.closed = True
+                raise ConnectionResetError("data connection dropped")
+
+            self.server.files[name] += block
+            sent += len(block)
+
+            if callback is not None:
+                callback(block)
+
+        return "226 Transfer complete"
+
+    def close(self) -> None:
+        self.closed = True
+
+    def quit(self) -> None:
+        self.closed = True
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise EOFError("session closed")
+
+
+@pytest.fixture
+def server(monkeypatch) -> FakeServer:
+    server = FakeServer()
+
+    monkeypatch.setattr(upload_controller, "_connect", server.connect)
+    monkeypatch.setattr(upload_controller, "FTPS_BLOCK_SIZE", BLOCK_SIZE)
+    monkeypatch.setattr(upload_controller, "FTPS_UPLOAD_RETRY_DELAY_SECONDS", 0)
+
+    return server
+
+
+@pytest.fixture
+def source(tmp_path) -> str:
+    location = os.path.join(tmp_path, "SIP.zip")
+
+    with open(location, "wb") as f:
+        f.write(os.urandom(20 * BLOCK_SIZE + 123))
+
+    return location
+
+
+def store(qapp, server: FakeServer, location: str) -> None:
+    controller = UploadController()
+    pool = _FTPSSessionPool(SimpleNamespace(name="TI"))
+    progress = _TransferProgress(os.path.getsize(location), lambda *_: None)
+
+    session = controller._store_file(pool, pool.acquire(), location, progress)
+
+    assert progress.position == os.path.getsize(location)
+    pool.release(session)
+
+
+def read(location: str) -> bytes:
+    with open(location, "rb") as f:
+        return f.read()
+
+
+def test_resumes_from_server_side_offset(qapp, server, source):
+    server.drops = [5 * BLOCK_SIZE + 100, 3 * BLOCK_SIZE]
+
+    store(qapp, server, source)
+
+    # The first retry continues after what reached the server, the second after both parts
+    assert server.stor_offsets == [0, 5 * BLOCK_SIZE + 100, 8 * BLOCK_SIZE + 100]
+    assert server.files["SIP.zip"] == read(source)
+
+
+def test_refused_rest_restarts_from_zero(qapp, server, source):
+    server.drops = [5 * BLOCK_SIZE]
+    server.rest_supported = False
+
+    store(qapp, server, source)
+
+    assert server.stor_offsets == [0, 0]
+    assert server.files["SIP.zip"] == read(source)
+
+
+def test_failed_reconnect_uses_a_retry(qapp, server, source):
+    server.drops = [5 * BLOCK_SIZE]
+
+    controller = UploadController()
+    pool = _FTPSSessionPool(SimpleNamespace(name="TI"))
+    progress = _TransferProgress(os.path.getsize(source), lambda *_: None)
+    session = pool.acquire()
+
+    # NOTE: the link is still down for the first two reconnects
+    server.refused_connections = 2
+
+    controller._store_file(pool, session, source, progress)
+
+    assert server.connections == 4
+    assert server.stor_offsets == [0, 5 * BLOCK_SIZE]
+    assert server.files["SIP.zip"] == read(source)
+
+
+def test_gives_up_after_the_retries(qapp, server, source, monkeypatch):
+    monkeypatch.setattr(upload_controller, "FTPS_UPLOAD_RETRIES", 2)
+
+    controller = UploadController()
+    pool = _FTPSSessionPool(SimpleNamespace(name="TI"))
+    progress = _TransferProgress(os.path.getsize(source), lambda *_: None)
+    session = pool.acquire()
+
+    server.refused_connections = 10
+    server.drops = [BLOCK_SIZE]
+
+    with pytest.raises(ConnectionRefusedError):
+        controller._store_file(pool, session, source, progress)
+
+    # The first connection, and a reconnect per retry
+    assert server.connections == 3